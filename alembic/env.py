@@ -1,4 +1,5 @@
 import os
+import sys
 from logging.config import fileConfig
 
 from sqlalchemy import engine_from_config
@@ -19,6 +20,9 @@ if database_url:
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
+# Make the app package importable when alembic runs from the project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 # add your model's MetaData object here
 # for 'autogenerate' support
 from app.db.session import Base  # noqa: E402
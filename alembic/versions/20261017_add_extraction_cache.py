@@ -0,0 +1,40 @@
+"""add extraction_cache table
+
+Revision ID: add_extraction_cache
+Revises: add_analysis_json_to_resumes
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_extraction_cache'
+down_revision = 'add_analysis_json_to_resumes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'extraction_cache',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('extractor', sa.String(length=32), nullable=False),
+        sa.Column('file_type', sa.String(length=50), nullable=True),
+        sa.Column('file_size', sa.Integer(), nullable=True),
+        sa.Column('extracted_text', sa.Text(), nullable=False),
+        sa.Column('hit_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('last_used_at', sa.DateTime(), nullable=False),
+        sa.UniqueConstraint('content_hash', 'extractor', name='uq_extraction_cache_hash_extractor'),
+    )
+    op.create_index('ix_extraction_cache_id', 'extraction_cache', ['id'])
+    op.create_index('ix_extraction_cache_content_hash', 'extraction_cache', ['content_hash'])
+
+
+def downgrade():
+    op.drop_index('ix_extraction_cache_content_hash', table_name='extraction_cache')
+    op.drop_index('ix_extraction_cache_id', table_name='extraction_cache')
+    op.drop_table('extraction_cache')
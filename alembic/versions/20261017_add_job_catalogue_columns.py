@@ -0,0 +1,50 @@
+"""add job catalogue columns to jobs
+
+Revision ID: add_job_catalogue_columns
+Revises: add_ocr_page_cache
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_job_catalogue_columns'
+down_revision = 'add_ocr_page_cache'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('jobs') as batch_op:
+        batch_op.alter_column('user_id', existing_type=sa.Integer(), nullable=True)
+        batch_op.add_column(sa.Column('external_id', sa.String(length=255), nullable=True))
+        batch_op.add_column(sa.Column('requirements_json', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('benefits_json', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('salary_range', sa.String(length=255), nullable=True))
+        batch_op.add_column(sa.Column('job_type', sa.String(length=50), nullable=True))
+        batch_op.add_column(sa.Column('experience_level', sa.String(length=50), nullable=True))
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+        batch_op.create_index('ix_jobs_external_id', ['external_id'], unique=True)
+        batch_op.create_index('ix_jobs_job_type', ['job_type'])
+        batch_op.create_index('ix_jobs_experience_level', ['experience_level'])
+        batch_op.create_index('ix_jobs_updated_at', ['updated_at'])
+
+
+def downgrade():
+    # Imported postings have no owner and can't satisfy NOT NULL user_id
+    op.execute('DELETE FROM jobs WHERE user_id IS NULL')
+    with op.batch_alter_table('jobs') as batch_op:
+        batch_op.drop_index('ix_jobs_updated_at')
+        batch_op.drop_index('ix_jobs_experience_level')
+        batch_op.drop_index('ix_jobs_job_type')
+        batch_op.drop_index('ix_jobs_external_id')
+        batch_op.drop_column('updated_at')
+        batch_op.drop_column('experience_level')
+        batch_op.drop_column('job_type')
+        batch_op.drop_column('salary_range')
+        batch_op.drop_column('benefits_json')
+        batch_op.drop_column('requirements_json')
+        batch_op.drop_column('external_id')
+        batch_op.alter_column('user_id', existing_type=sa.Integer(), nullable=False)
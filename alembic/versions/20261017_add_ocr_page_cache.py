@@ -0,0 +1,37 @@
+"""add ocr_page_cache table
+
+Revision ID: add_ocr_page_cache
+Revises: add_extraction_cache
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_ocr_page_cache'
+down_revision = 'add_extraction_cache'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'ocr_page_cache',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('page_hash', sa.String(length=64), nullable=False),
+        sa.Column('dpi', sa.Integer(), nullable=True),
+        sa.Column('text', sa.Text(), nullable=False),
+        sa.Column('hit_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('last_used_at', sa.DateTime(), nullable=False),
+    )
+    op.create_index('ix_ocr_page_cache_id', 'ocr_page_cache', ['id'])
+    op.create_index('ix_ocr_page_cache_page_hash', 'ocr_page_cache', ['page_hash'], unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_ocr_page_cache_page_hash', table_name='ocr_page_cache')
+    op.drop_index('ix_ocr_page_cache_id', table_name='ocr_page_cache')
+    op.drop_table('ocr_page_cache')
@@ -1,6 +1,9 @@
-from typing import Optional, List
+from datetime import datetime
+from typing import Any, Optional, Iterator, List, Dict, Tuple
 import json
 
+from sqlalchemy import and_, func, or_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from . import models
@@ -46,10 +49,48 @@ def create_resume(
     return resume
 
 
+def bulk_create_resumes(
+    db: Session,
+    *,
+    user_id: int,
+    texts: List[str],
+    files: Optional[List[Tuple[Optional[str], Optional[str], Optional[int]]]] = None,
+) -> List[int]:
+    """Insert many resumes in a single transaction and return their IDs in order.
+
+    ``files`` optionally gives (file_name, file_type, file_size) for each text; without it
+    the resumes are stored as text-only.
+    """
+    files = files if files is not None else [(None, None, None)] * len(texts)
+    resumes = [
+        models.Resume(
+            user_id=user_id,
+            file_name=file_name,
+            file_type=file_type,
+            file_size=file_size,
+            extracted_text=text,
+        )
+        for text, (file_name, file_type, file_size) in zip(texts, files)
+    ]
+    db.add_all(resumes)
+    # Read IDs after flush; after commit they'd be expired and cost a refresh each
+    db.flush()
+    ids = [resume.id for resume in resumes]
+    db.commit()
+    return ids
+
+
 def get_resume(db: Session, resume_id: int) -> Optional[models.Resume]:
     return db.query(models.Resume).filter(models.Resume.id == resume_id).first()
 
 
+def get_resumes_by_ids(db: Session, resume_ids: List[int]) -> Dict[int, models.Resume]:
+    if not resume_ids:
+        return {}
+    resumes = db.query(models.Resume).filter(models.Resume.id.in_(resume_ids)).all()
+    return {resume.id: resume for resume in resumes}
+
+
 def list_resumes_for_user(db: Session, user_id: int) -> List[models.Resume]:
     return db.query(models.Resume).filter(models.Resume.user_id == user_id).order_by(models.Resume.created_at.desc()).all()
 
@@ -77,22 +118,119 @@ def save_resume_analysis(db: Session, resume_id: int, analysis_dict: dict) -> Op
     return resume
 
 
+def bulk_save_resume_analyses(db: Session, analyses: Dict[int, dict]) -> None:
+    """Persist analysis JSON for many resumes with one executemany UPDATE."""
+    if not analyses:
+        return
+    db.bulk_update_mappings(
+        models.Resume,
+        [{"id": resume_id, "analysis_json": json.dumps(analysis)} for resume_id, analysis in analyses.items()],
+    )
+    db.commit()
+
+
+# Extraction cache
+def get_cached_extraction(db: Session, content_hash: str, extractor: str) -> Optional[models.ExtractionCache]:
+    """Look up a previous extraction of identical file bytes and count the hit."""
+    entry = (
+        db.query(models.ExtractionCache)
+        .filter(models.ExtractionCache.content_hash == content_hash, models.ExtractionCache.extractor == extractor)
+        .first()
+    )
+    if entry is not None:
+        entry.hit_count = (entry.hit_count or 0) + 1
+        entry.last_used_at = datetime.utcnow()
+        db.commit()
+    return entry
+
+
+def save_cached_extraction(
+    db: Session,
+    *,
+    content_hash: str,
+    extractor: str,
+    file_type: Optional[str],
+    file_size: Optional[int],
+    extracted_text: str,
+) -> None:
+    entry = models.ExtractionCache(
+        content_hash=content_hash,
+        extractor=extractor,
+        file_type=file_type,
+        file_size=file_size,
+        extracted_text=extracted_text,
+    )
+    db.add(entry)
+    try:
+        db.commit()
+    except IntegrityError:
+        # A concurrent upload of the same file stored it first
+        db.rollback()
+
+
+def get_cached_ocr_pages(db: Session, page_hashes: List[str]) -> Dict[str, str]:
+    """Return OCR text for the page hashes seen before and count the hits."""
+    if not page_hashes:
+        return {}
+    entries = db.query(models.OCRPageCache).filter(models.OCRPageCache.page_hash.in_(set(page_hashes))).all()
+    if entries:
+        now = datetime.utcnow()
+        for entry in entries:
+            entry.hit_count = (entry.hit_count or 0) + 1
+            entry.last_used_at = now
+        db.commit()
+    return {entry.page_hash: entry.text for entry in entries}
+
+
+def save_cached_ocr_pages(db: Session, pages: Dict[str, Tuple[str, int]]) -> None:
+    """Store OCR text per page hash; ``pages`` maps page_hash -> (text, dpi)."""
+    if not pages:
+        return
+    db.add_all([
+        models.OCRPageCache(page_hash=page_hash, text=text, dpi=dpi)
+        for page_hash, (text, dpi) in pages.items()
+    ])
+    try:
+        db.commit()
+    except IntegrityError:
+        # A concurrent upload stored some of these pages first; fall back to one at a time
+        db.rollback()
+        for page_hash, (text, dpi) in pages.items():
+            db.add(models.OCRPageCache(page_hash=page_hash, text=text, dpi=dpi))
+            try:
+                db.commit()
+            except IntegrityError:
+                db.rollback()
+
+
 # Job CRUD
 def create_job(
     db: Session,
     *,
-    user_id: int,
+    user_id: Optional[int],
     title: str,
     company: Optional[str] = None,
     location: Optional[str] = None,
     description: Optional[str] = None,
+    requirements: Optional[List[str]] = None,
+    benefits: Optional[List[str]] = None,
+    salary_range: Optional[str] = None,
+    job_type: Optional[str] = None,
+    experience_level: Optional[str] = None,
+    external_id: Optional[str] = None,
 ) -> models.Job:
     job = models.Job(
         user_id=user_id,
+        external_id=external_id,
         title=title,
         company=company,
         location=location,
         description=description,
+        requirements_json=json.dumps(requirements) if requirements is not None else None,
+        benefits_json=json.dumps(benefits) if benefits is not None else None,
+        salary_range=salary_range,
+        job_type=job_type,
+        experience_level=experience_level,
     )
     db.add(job)
     db.commit()
@@ -104,6 +242,121 @@ def get_job(db: Session, job_id: int) -> Optional[models.Job]:
     return db.query(models.Job).filter(models.Job.id == job_id).first()
 
 
+def upsert_catalogue_jobs(db: Session, postings: List[Dict[str, Any]]) -> Tuple[int, int]:
+    """Insert or update catalogue postings in one transaction; returns (inserted, updated).
+
+    Postings are dicts shaped like JobDescription plus an optional ``external_id``. One
+    with an external_id replaces the stored posting with that ID (the last one wins within
+    a batch); one without is always inserted. Uses executemany INSERT/UPDATE, no ORM objects.
+    """
+    now = datetime.utcnow()
+    keyed: Dict[str, Dict[str, Any]] = {}
+    unkeyed: List[Dict[str, Any]] = []
+    for posting in postings:
+        row = _catalogue_job_row(posting, now)
+        if row["external_id"]:
+            keyed[row["external_id"]] = row
+        else:
+            unkeyed.append(row)
+
+    for attempt in range(2):
+        existing = dict(
+            db.query(models.Job.external_id, models.Job.id).filter(models.Job.external_id.in_(list(keyed))).all()
+        ) if keyed else {}
+        inserts = list(unkeyed)
+        updates = []
+        for external_id, row in keyed.items():
+            if external_id in existing:
+                update = dict(row, id=existing[external_id])
+                del update["created_at"]
+                updates.append(update)
+            else:
+                inserts.append(row)
+        if inserts:
+            db.bulk_insert_mappings(models.Job, inserts)
+        if updates:
+            db.bulk_update_mappings(models.Job, updates)
+        try:
+            db.commit()
+            return len(inserts), len(updates)
+        except IntegrityError:
+            # A concurrent import inserted some of these external IDs first; look them up again
+            db.rollback()
+            if attempt:
+                raise
+    return 0, 0
+
+
+def iter_catalogue_jobs(
+    db: Session,
+    *,
+    after: Optional[Tuple[datetime, int]] = None,
+    batch_size: int = 1000,
+) -> Iterator[models.Job]:
+    """Stream catalogue postings (no owner), fetching ``batch_size`` rows at a time.
+
+    Without ``after``, all postings in ID order. With ``after=(updated_at, id)``, only
+    postings changed strictly after that point, in (updated_at, id) order, so the last
+    row seen is the next watermark.
+    """
+    query = db.query(models.Job).filter(models.Job.user_id.is_(None))
+    if after is None:
+        query = query.order_by(models.Job.id)
+    else:
+        query = _changed_after(query, after).order_by(models.Job.updated_at, models.Job.id)
+    return query.yield_per(batch_size)
+
+
+def count_catalogue_jobs(db: Session, *, after: Optional[Tuple[datetime, int]] = None) -> int:
+    """Number of catalogue postings, or of those changed strictly after ``(updated_at, id)``"""
+    query = db.query(func.count(models.Job.id)).filter(models.Job.user_id.is_(None))
+    if after is not None:
+        query = _changed_after(query, after)
+    return query.scalar() or 0
+
+
+def catalogue_cutoff(db: Session, keep: int) -> Optional[Tuple[datetime, int]]:
+    """(updated_at, id) just before the ``keep`` most recently changed postings, or None if there are no older ones"""
+    row = (
+        db.query(models.Job.updated_at, models.Job.id)
+        .filter(models.Job.user_id.is_(None), models.Job.updated_at.isnot(None))
+        .order_by(models.Job.updated_at.desc(), models.Job.id.desc())
+        .offset(keep)
+        .first()
+    )
+    return (row[0], row[1]) if row is not None else None
+
+
+def _changed_after(query, after: Tuple[datetime, int]):
+    updated_at, job_id = after
+    return query.filter(
+        or_(
+            models.Job.updated_at > updated_at,
+            and_(models.Job.updated_at == updated_at, models.Job.id > job_id),
+        )
+    )
+
+
+def _catalogue_job_row(posting: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+    requirements = posting.get("requirements")
+    benefits = posting.get("benefits")
+    return {
+        "user_id": None,
+        "external_id": posting.get("external_id") or None,
+        "title": posting["title"],
+        "company": posting.get("company"),
+        "location": posting.get("location"),
+        "description": posting.get("description"),
+        "requirements_json": json.dumps(requirements) if requirements is not None else None,
+        "benefits_json": json.dumps(benefits) if benefits is not None else None,
+        "salary_range": posting.get("salary_range"),
+        "job_type": posting.get("job_type"),
+        "experience_level": posting.get("experience_level"),
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
 # ChatMessage CRUD
 def create_chat_message(
     db: Session,
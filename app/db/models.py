@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from .session import Base
@@ -37,16 +37,61 @@ class Resume(Base):
     user = relationship("User", back_populates="resumes")
 
 
+class ExtractionCache(Base):
+    """Extracted text keyed by the SHA-256 of the uploaded file, so identical uploads skip parsing"""
+
+    __tablename__ = "extraction_cache"
+    __table_args__ = (UniqueConstraint("content_hash", "extractor", name="uq_extraction_cache_hash_extractor"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    content_hash = Column(String(64), nullable=False, index=True)
+    # Pipeline that produced the text (results differ between pipelines)
+    extractor = Column(String(32), nullable=False)
+    file_type = Column(String(50), nullable=True)
+    file_size = Column(Integer, nullable=True)
+    extracted_text = Column(Text, nullable=False)
+    hit_count = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_used_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class OCRPageCache(Base):
+    """Tesseract output keyed by a hash of one page's content, shared across documents"""
+
+    __tablename__ = "ocr_page_cache"
+
+    id = Column(Integer, primary_key=True, index=True)
+    page_hash = Column(String(64), nullable=False, unique=True, index=True)
+    # Resolution the page was rendered at
+    dpi = Column(Integer, nullable=True)
+    text = Column(Text, nullable=False)
+    hit_count = Column(Integer, default=0, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    last_used_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
 class Job(Base):
+    """A job posting: saved by a user, or imported into the catalogue that match/search serve"""
+
     __tablename__ = "jobs"
 
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    # Null for imported catalogue postings
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    # ID in the source feed; imports upsert on it
+    external_id = Column(String(255), nullable=True, unique=True, index=True)
     title = Column(String(255), nullable=False)
     company = Column(String(255), nullable=True)
     location = Column(String(255), nullable=True)
     description = Column(Text, nullable=True)
+    # JSON lists of strings
+    requirements_json = Column(Text, nullable=True)
+    benefits_json = Column(Text, nullable=True)
+    salary_range = Column(String(255), nullable=True)
+    job_type = Column(String(50), nullable=True, index=True)
+    experience_level = Column(String(50), nullable=True, index=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=True, index=True)
 
     user = relationship("User", back_populates="jobs")
 
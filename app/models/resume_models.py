@@ -42,6 +42,8 @@ class ResumeUploadResponse(BaseModel):
     extraction_timestamp: str = Field(..., description="Timestamp of the extraction")
     word_count: int = Field(..., description="Number of words in extracted text")
     character_count: int = Field(..., description="Number of characters in extracted text")
+    cache_hit: bool = Field(False, description="True if an identical file was extracted before and parsing was skipped")
+    extraction_report: Optional[Dict[str, Any]] = Field(None, description="Extraction tier per page and seconds per tier (absent on cache hits)")
 
 
 class ResumeRecord(BaseModel):
@@ -60,3 +62,15 @@ class ResumeListResponse(BaseModel):
 class ResumeStoredAnalysisResponse(BaseModel):
     resume_id: int = Field(..., description="Resume ID")
     analysis: Optional[Dict[str, Any]] = Field(None, description="Stored analysis fields if available")
+
+
+class BatchResumeItem(BaseModel):
+    resume_text: Optional[str] = Field(None, description="Resume text to store and analyze", min_length=10)
+    resume_id: Optional[int] = Field(None, description="ID of a stored resume to analyze instead of resume_text")
+    job_title: Optional[str] = Field(None, description="Target job title for analysis")
+    industry: Optional[str] = Field(None, description="Target industry")
+
+
+class BatchResumeAnalysisRequest(BaseModel):
+    items: List[BatchResumeItem] = Field(..., description="Resumes to analyze", min_items=1, max_items=1000)
+    concurrency: Optional[int] = Field(None, description="Maximum concurrent analyses (defaults to server setting)", ge=1, le=64)
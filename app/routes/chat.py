@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from typing import Optional, Dict, Any
 from app.models.chat_models import (
     ChatRequest,
@@ -9,6 +10,7 @@ from app.models.chat_models import (
     ATSAnalysisResponse
 )
 from app.services.chat_service import ChatService
+from app.utils.sse import SSE_HEADERS, sse_stream
 
 router = APIRouter()
 chat_service = ChatService()
@@ -29,7 +31,7 @@ async def chat(request: ChatRequest):
                 detail="Message cannot be empty"
             )
         
-        result = chat_service.chat_response(
+        result = await chat_service.chat_response(
             message=request.message,
             conversation_history=request.conversation_history,
             context=request.context,
@@ -45,6 +47,28 @@ async def chat(request: ChatRequest):
             detail=f"Chat service failed: {str(e)}"
         )
 
+@router.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """
+    Streaming variant of /chat using Server-Sent Events:
+    - `token` events carry reply text as the model produces it
+    - a final `done` event carries the full ChatResponse
+    - an `error` event is sent if generation fails mid-stream
+    """
+    if not request.message or len(request.message.strip()) == 0:
+        raise HTTPException(
+            status_code=400,
+            detail="Message cannot be empty"
+        )
+    
+    events = chat_service.stream_chat_response(
+        message=request.message,
+        conversation_history=request.conversation_history,
+        context=request.context,
+        user_id=request.user_id
+    )
+    return StreamingResponse(sse_stream(events), media_type="text/event-stream", headers=SSE_HEADERS)
+
 @router.post("/career-counseling", response_model=CareerCounselingResponse)
 async def career_counseling(request: CareerCounselingRequest):
     """
@@ -62,7 +86,7 @@ async def career_counseling(request: CareerCounselingRequest):
                 detail="Career goals must be at least 10 characters long"
             )
         
-        result = chat_service.career_counseling(
+        result = await chat_service.career_counseling(
             current_role=request.current_role,
             experience_years=request.experience_years,
             skills=request.skills,
@@ -80,6 +104,29 @@ async def career_counseling(request: CareerCounselingRequest):
             detail=f"Career counseling failed: {str(e)}"
         )
 
+@router.post("/career-counseling/stream")
+async def career_counseling_stream(request: CareerCounselingRequest):
+    """
+    Streaming variant of /career-counseling using Server-Sent Events:
+    - `token` events carry advice text as the model produces it
+    - a final `done` event carries the structured CareerCounselingResponse
+    """
+    if not request.career_goals or len(request.career_goals.strip()) < 10:
+        raise HTTPException(
+            status_code=400,
+            detail="Career goals must be at least 10 characters long"
+        )
+    
+    events = chat_service.stream_career_counseling(
+        current_role=request.current_role,
+        experience_years=request.experience_years,
+        skills=request.skills,
+        career_goals=request.career_goals,
+        challenges=request.challenges,
+        industry=request.industry
+    )
+    return StreamingResponse(sse_stream(events), media_type="text/event-stream", headers=SSE_HEADERS)
+
 @router.post("/ats-analysis", response_model=ATSAnalysisResponse)
 async def ats_analysis(request: ATSAnalysisRequest):
     """
@@ -102,7 +149,7 @@ async def ats_analysis(request: ATSAnalysisRequest):
                 detail="Job description must be at least 10 characters long"
             )
         
-        result = chat_service.ats_analysis(
+        result = await chat_service.ats_analysis(
             resume_text=request.resume_text,
             job_description=request.job_description,
             ats_system=request.ats_system
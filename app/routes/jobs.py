@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException
+from starlette.concurrency import run_in_threadpool
 from typing import Optional
 from app.models.job_models import (
     JobMatchRequest,
@@ -27,7 +28,9 @@ async def match_jobs(request: JobMatchRequest):
                 detail="At least one skill must be provided"
             )
         
-        result = job_service.match_jobs(
+        # Off the event loop: the first call may wait for the job catalogue to load
+        result = await run_in_threadpool(
+            job_service.match_jobs,
             skills=request.skills,
             experience_level=request.experience_level,
             location=request.location,
@@ -48,7 +51,9 @@ async def match_jobs(request: JobMatchRequest):
 async def search_jobs(request: JobSearchRequest):
     """
     Search for jobs based on query and filters:
-    - Search by job title, company, or description
+    - Search by job title, company, or description, ranked by relevance
+    - The last word matches as a prefix ("senior py" finds Python roles); queries
+      with no ranked match fall back to a plain substring match
     - Apply location, job type, and experience filters
     - Return relevant job listings
     """
@@ -59,7 +64,8 @@ async def search_jobs(request: JobSearchRequest):
                 detail="Search query must be at least 2 characters long"
             )
         
-        result = job_service.search_jobs(
+        result = await run_in_threadpool(
+            job_service.search_jobs,
             query=request.query,
             location=request.location,
             job_type=request.job_type,
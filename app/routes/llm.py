@@ -0,0 +1,40 @@
+from fastapi import APIRouter
+from app.utils.ai_client import ai_client
+
+router = APIRouter()
+
+@router.get("/llm/providers")
+async def get_llm_providers():
+    """
+    Get health of the LLM backends in routing order:
+    - Circuit breaker state (closed, open, half_open)
+    - Rolling-window call, failure and latency stats
+    - Seconds until an open breaker is probed again
+    """
+    return {"providers": ai_client.provider_status()}
+
+@router.get("/llm/cache")
+async def get_llm_cache_stats():
+    """
+    Get LLM response cache statistics (entries, hits, misses, evictions)
+    """
+    return ai_client.cache.stats()
+
+@router.get("/llm/coalescing")
+async def get_llm_coalescing_stats():
+    """
+    Get single-flight stats: how many LLM calls were served by joining an
+    identical request that was already in flight
+    """
+    return ai_client.coalescing_stats()
+
+@router.get("/llm/metrics")
+async def get_llm_metrics():
+    """
+    Get per-call LLM metrics since startup:
+    - Requests served by each provider, the cache, or the placeholder stub
+    - Fallback reasons (open breakers, provider errors, unparseable output)
+    - Latency and prompt/completion token histograms per task, provider, model and outcome
+    - The most recent calls
+    """
+    return ai_client.metrics.snapshot()
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, HTTPException, UploadFile, File, Depends, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import List, Optional
+import json
 import os
 from datetime import datetime
 from app.models.resume_models import (
@@ -12,15 +14,25 @@ from app.models.resume_models import (
     ResumeListResponse,
     ResumeRecord,
     ResumeStoredAnalysisResponse,
+    BatchResumeAnalysisRequest,
 )
 from app.services.resume_service import ResumeService
-from app.utils.text_extractor import TextExtractor
-from app.db.session import get_db
+from app.services.extraction_service import ExtractionService
+from app.utils.upload_spool import MAX_UPLOAD_BYTES, spool_upload
+from app.utils.bulk_upload import collect_bulk_files, discard_bulk_files
+from app.db.session import get_db, SessionLocal
 from app.db import crud
 from app.routes.auth import get_current_user_from_request
+from app.utils.sse import SSE_HEADERS, sse_stream
 
 router = APIRouter()
 resume_service = ResumeService()
+extraction_service = ExtractionService()
+
+BATCH_ANALYSIS_CONCURRENCY = int(os.getenv("BATCH_ANALYSIS_CONCURRENCY", "8"))
+BATCH_ANALYSIS_FLUSH_SIZE = 25
+# Files extracted at once by /upload-resumes/bulk (the worker pool bounds actual parallelism)
+BULK_UPLOAD_CONCURRENCY = int(os.getenv("BULK_UPLOAD_CONCURRENCY", str(os.cpu_count() or 1)))
 
 @router.post("/analyze-resume", response_model=ResumeAnalysisResponse)
 async def analyze_resume(request: ResumeAnalysisRequest, db: Session = Depends(get_db), http_request: Request = None):
@@ -50,10 +62,11 @@ async def analyze_resume(request: ResumeAnalysisRequest, db: Session = Depends(g
             extracted_text=request.resume_text,
         )
 
-        result = resume_service.analyze_resume(
+        result = await resume_service.analyze_resume(
             resume_text=request.resume_text,
             job_title=request.job_title,
-            industry=request.industry
+            industry=request.industry,
+            resume_id=saved.id,
         )
 
         # Build response and persist it as analysis JSON
@@ -81,6 +94,98 @@ async def analyze_resume(request: ResumeAnalysisRequest, db: Session = Depends(g
             detail=f"Resume analysis failed: {str(e)}"
         )
 
+@router.post("/analyze-resumes/batch")
+async def analyze_resumes_batch(request: BatchResumeAnalysisRequest, db: Session = Depends(get_db), http_request: Request = None):
+    """
+    Analyze many resumes in one call, streamed back as NDJSON:
+    - Each item gives either resume_text (stored as a new resume) or a stored resume_id
+    - Analyses run concurrently, capped by `concurrency`
+    - One JSON line per item is emitted as soon as it finishes, in completion order
+    - Results are persisted with bulk writes; a final summary line closes the stream
+    """
+    user = get_current_user_from_request(http_request, db)
+
+    for index, item in enumerate(request.items):
+        if (item.resume_text is None) == (item.resume_id is None):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Item {index}: provide exactly one of resume_text or resume_id"
+            )
+
+    # Resolve stored resumes in one query and insert new ones in one transaction
+    stored = crud.get_resumes_by_ids(db, [item.resume_id for item in request.items if item.resume_id is not None])
+    new_indexes = [index for index, item in enumerate(request.items) if item.resume_text is not None]
+    new_ids = crud.bulk_create_resumes(
+        db,
+        user_id=user.id,
+        texts=[request.items[index].resume_text for index in new_indexes],
+    )
+    created = dict(zip(new_indexes, new_ids))
+
+    rejected = []
+    work = []
+    positions = []
+    for index, item in enumerate(request.items):
+        if item.resume_id is not None:
+            resume = stored.get(item.resume_id)
+            if not resume or resume.user_id != user.id:
+                rejected.append({"index": index, "status": "error", "resume_id": item.resume_id, "detail": "Resume not found"})
+                continue
+            if len((resume.extracted_text or "").strip()) < 10:
+                rejected.append({"index": index, "status": "error", "resume_id": item.resume_id, "detail": "Resume has no extracted text to analyze"})
+                continue
+            resume_id, resume_text = resume.id, resume.extracted_text
+        else:
+            resume_id, resume_text = created[index], item.resume_text
+        positions.append(index)
+        work.append({
+            "resume_id": resume_id,
+            "resume_text": resume_text,
+            "job_title": item.job_title,
+            "industry": item.industry,
+        })
+
+    concurrency = request.concurrency or BATCH_ANALYSIS_CONCURRENCY
+
+    def flush(session: Session, analyses: dict) -> None:
+        try:
+            crud.bulk_save_resume_analyses(session, analyses)
+        except Exception:
+            # Non-fatal: analyses were already streamed to the client
+            session.rollback()
+
+    async def results():
+        succeeded = 0
+        failed = len(rejected)
+        pending = {}
+        for line in rejected:
+            yield json.dumps(line) + "\n"
+
+        # The request-scoped session may be closed while we stream, so use our own
+        session = SessionLocal()
+        try:
+            async for position, analysis, error in resume_service.analyze_resumes_batch(work, concurrency=concurrency):
+                index = positions[position]
+                resume_id = work[position]["resume_id"]
+                if analysis is None:
+                    failed += 1
+                    yield json.dumps({"index": index, "status": "error", "resume_id": resume_id, "detail": error}) + "\n"
+                    continue
+                succeeded += 1
+                payload = analysis.dict()
+                pending[resume_id] = payload
+                if len(pending) >= BATCH_ANALYSIS_FLUSH_SIZE:
+                    flush(session, pending)
+                    pending = {}
+                yield json.dumps({"index": index, "status": "ok", "resume_id": resume_id, "analysis": payload}) + "\n"
+        finally:
+            flush(session, pending)
+            session.close()
+
+        yield json.dumps({"status": "complete", "total": len(request.items), "succeeded": succeeded, "failed": failed}) + "\n"
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
 @router.post("/tailor-resume", response_model=ResumeTailorResponse)
 async def tailor_resume(request: ResumeTailorRequest):
     """
@@ -103,7 +208,7 @@ async def tailor_resume(request: ResumeTailorRequest):
                 detail="Job description must be at least 10 characters long"
             )
         
-        result = resume_service.tailor_resume(
+        result = await resume_service.tailor_resume(
             resume_text=request.resume_text,
             job_description=request.job_description,
             job_title=request.job_title,
@@ -119,6 +224,34 @@ async def tailor_resume(request: ResumeTailorRequest):
             detail=f"Resume tailoring failed: {str(e)}"
         )
 
+@router.post("/tailor-resume/stream")
+async def tailor_resume_stream(request: ResumeTailorRequest):
+    """
+    Streaming variant of /tailor-resume using Server-Sent Events:
+    - `token` events carry the raw model output as it is generated
+    - `partial` events carry the JSON fields parsed so far, each time a field completes
+    - a final `done` event carries the parsed ResumeTailorResponse
+    """
+    if not request.resume_text or len(request.resume_text.strip()) < 10:
+        raise HTTPException(
+            status_code=400,
+            detail="Resume text must be at least 10 characters long"
+        )
+    
+    if not request.job_description or len(request.job_description.strip()) < 10:
+        raise HTTPException(
+            status_code=400,
+            detail="Job description must be at least 10 characters long"
+        )
+    
+    events = resume_service.stream_tailor_resume(
+        resume_text=request.resume_text,
+        job_description=request.job_description,
+        job_title=request.job_title,
+        company_name=request.company_name
+    )
+    return StreamingResponse(sse_stream(events), media_type="text/event-stream", headers=SSE_HEADERS)
+
 @router.post("/upload-resume", response_model=ResumeUploadResponse)
 async def upload_resume(file: UploadFile = File(...), db: Session = Depends(get_db), http_request: Request = None):
     """
@@ -142,16 +275,11 @@ async def upload_resume(file: UploadFile = File(...), db: Session = Depends(get_
                 detail="Unsupported file format. Please upload a PDF or DOCX file."
             )
         
-        # Validate file size (max 10MB)
-        file_content = await file.read()
-        if len(file_content) > 10 * 1024 * 1024:  # 10MB limit
-            raise HTTPException(
-                status_code=400,
-                detail="File size too large. Please upload a file smaller than 10MB."
-            )
-        
-        # Extract text from the file
-        extracted_text = TextExtractor.extract_text(file_content, file_extension)
+        # Validate file size (max 10MB) while spooling to a temp file in chunks,
+        # then extract in the worker pool so parsing never blocks the event loop
+        async with spool_upload(file, MAX_UPLOAD_BYTES) as spooled:
+            # Identical bytes uploaded before reuse the stored text and skip parsing
+            extracted_text, cache_hit, report = await extraction_service.extract_upload(db, spooled, file_extension)
         
         # Calculate word and character counts
         word_count = len(extracted_text.split())
@@ -162,7 +290,7 @@ async def upload_resume(file: UploadFile = File(...), db: Session = Depends(get_
             user_id=get_current_user_from_request(http_request, db).id,
             file_name=file.filename,
             file_type=file_extension,
-            file_size=len(file_content),
+            file_size=spooled.size,
             extracted_text=extracted_text,
         )
 
@@ -171,11 +299,13 @@ async def upload_resume(file: UploadFile = File(...), db: Session = Depends(get_
             resume_id=saved.id,
             extracted_text=extracted_text,
             file_name=file.filename,
-            file_size=len(file_content),
+            file_size=spooled.size,
             file_type=file_extension,
             extraction_timestamp=datetime.utcnow().isoformat(),
             word_count=word_count,
-            character_count=character_count
+            character_count=character_count,
+            cache_hit=cache_hit,
+            extraction_report=report,
         )
 
         return response
@@ -188,6 +318,79 @@ async def upload_resume(file: UploadFile = File(...), db: Session = Depends(get_
             detail=f"Failed to process uploaded file: {str(e)}"
         )
 
+@router.post("/upload-resumes/bulk")
+async def upload_resumes_bulk(files: List[UploadFile] = File(...), db: Session = Depends(get_db), http_request: Request = None):
+    """
+    Upload many resumes at once (PDF/DOCX files and/or ZIP archives of them), streamed back as NDJSON:
+    - Archives are expanded; every resume inside is extracted like a single upload
+    - Files are extracted in parallel in the extraction worker pool
+    - One JSON line per file is emitted as soon as its extraction finishes, in completion order
+    - All extracted resumes are inserted in one transaction; the final summary line carries their IDs
+    """
+    user_id = get_current_user_from_request(http_request, db).id
+
+    # Spool everything before streaming: the uploaded parts may be closed once we return
+    entries = await collect_bulk_files(files)
+    work = [index for index, entry in enumerate(entries) if entry.spooled is not None]
+
+    def file_line(index: int, status: str, **fields) -> str:
+        entry = entries[index]
+        line = {"index": index, "status": status, "file_name": entry.file_name, "file_type": entry.file_type}
+        if entry.archive:
+            line["archive"] = entry.archive
+        line.update(fields)
+        return json.dumps(line) + "\n"
+
+    async def results():
+        extracted = {}
+        failed = 0
+        for index, entry in enumerate(entries):
+            if entry.error:
+                failed += 1
+                yield file_line(index, "error", detail=entry.error)
+
+        # The request-scoped session may be closed while we stream, so use our own
+        session = SessionLocal()
+        try:
+            uploads = [(entries[index].spooled, entries[index].file_type) for index in work]
+            batch = extraction_service.extract_uploads_batch(session, uploads, concurrency=BULK_UPLOAD_CONCURRENCY)
+            async for position, extracted_text, cache_hit, error in batch:
+                index = work[position]
+                if extracted_text is None:
+                    failed += 1
+                    yield file_line(index, "error", detail=error)
+                    continue
+                extracted[index] = extracted_text
+                yield file_line(
+                    index, "ok",
+                    file_size=entries[index].size,
+                    word_count=len(extracted_text.split()),
+                    character_count=len(extracted_text),
+                    cache_hit=cache_hit,
+                    extracted_text=extracted_text,
+                )
+
+            summary = {"status": "complete", "total": len(entries), "succeeded": len(extracted), "failed": failed}
+            indexes = sorted(extracted)
+            try:
+                resume_ids = crud.bulk_create_resumes(
+                    session,
+                    user_id=user_id,
+                    texts=[extracted[index] for index in indexes],
+                    files=[(entries[index].file_name, entries[index].file_type, entries[index].size) for index in indexes],
+                )
+                summary["resumes"] = [{"index": index, "resume_id": resume_id} for index, resume_id in zip(indexes, resume_ids)]
+            except Exception as e:
+                session.rollback()
+                summary.update({"status": "error", "succeeded": 0, "failed": len(entries), "detail": f"Failed to save resumes: {str(e)}"})
+        finally:
+            discard_bulk_files(entries)
+            session.close()
+
+        yield json.dumps(summary) + "\n"
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
 @router.get("/resume-tips")
 async def get_resume_tips():
     """
@@ -297,8 +500,11 @@ async def delete_resume(resume_id: int, db: Session = Depends(get_db), http_requ
 
 
 @router.post("/resumes/{resume_id}/analyze", response_model=ResumeAnalysisResponse)
-async def reanalyze_resume(resume_id: int, db: Session = Depends(get_db), http_request: Request = None):
-    """Re-analyze a stored resume using its extracted_text and persist the analysis JSON."""
+async def reanalyze_resume(resume_id: int, refresh: bool = False, db: Session = Depends(get_db), http_request: Request = None):
+    """Re-analyze a stored resume using its extracted_text and persist the analysis JSON.
+
+    Pass ``refresh=true`` to bypass the LLM response cache and force a fresh completion.
+    """
     user = get_current_user_from_request(http_request, db)
     resume = crud.get_resume(db, resume_id)
     if not resume:
@@ -309,10 +515,12 @@ async def reanalyze_resume(resume_id: int, db: Session = Depends(get_db), http_r
         raise HTTPException(status_code=400, detail="Resume has no extracted text to analyze")
 
     try:
-        result = resume_service.analyze_resume(
+        result = await resume_service.analyze_resume(
             resume_text=resume.extracted_text,
             job_title=None,
             industry=None,
+            use_cache=not refresh,
+            resume_id=resume.id,
         )
         response = ResumeAnalysisResponse(
             resume_id=resume.id,
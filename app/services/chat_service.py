@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 import uuid
 from app.models.chat_models import ChatResponse, CareerCounselingResponse, ATSAnalysisResponse
 from app.utils.ai_client import ai_client
@@ -12,12 +12,12 @@ class ChatService:
         # In production, you'd store conversation history in a database
         self.conversation_history = {}
     
-    def chat_response(self, message: str, conversation_history: List[Dict[str, str]] = None, 
+    async def chat_response(self, message: str, conversation_history: List[Dict[str, str]] = None, 
                      context: Dict[str, Any] = None, user_id: str = None) -> ChatResponse:
         """Generate chat response for career counseling"""
         try:
             # Get AI response
-            ai_response = self.ai_client.chat_response(message, conversation_history)
+            ai_response = await self.ai_client.chat_response(message, conversation_history)
             
             # Generate conversation ID if not provided
             conversation_id = str(uuid.uuid4())
@@ -26,19 +26,7 @@ class ChatService:
             suggestions = self._generate_suggestions(message, ai_response)
             
             # Store conversation history (in production, use database)
-            if user_id:
-                if user_id not in self.conversation_history:
-                    self.conversation_history[user_id] = []
-                self.conversation_history[user_id].append({
-                    "role": "user",
-                    "content": message,
-                    "timestamp": datetime.now().isoformat()
-                })
-                self.conversation_history[user_id].append({
-                    "role": "assistant",
-                    "content": ai_response,
-                    "timestamp": datetime.now().isoformat()
-                })
+            self._remember_exchange(user_id, message, ai_response)
             
             return ChatResponse(
                 reply=ai_response,
@@ -55,7 +43,25 @@ class ChatService:
                 response_timestamp=datetime.now().isoformat()
             )
     
-    def career_counseling(self, current_role: str = None, experience_years: int = None,
+    async def stream_chat_response(self, message: str, conversation_history: List[Dict[str, str]] = None,
+                                   context: Dict[str, Any] = None, user_id: str = None) -> AsyncIterator[Tuple[str, Any]]:
+        """Stream a chat reply as ("token", ...) events followed by a final ("done", ChatResponse) event"""
+        parts = []
+        async for token in self.ai_client.stream_chat_response(message, conversation_history):
+            parts.append(token)
+            yield "token", {"content": token}
+        
+        ai_response = "".join(parts)
+        self._remember_exchange(user_id, message, ai_response)
+        
+        yield "done", ChatResponse(
+            reply=ai_response,
+            conversation_id=str(uuid.uuid4()),
+            suggestions=self._generate_suggestions(message, ai_response),
+            response_timestamp=datetime.now().isoformat()
+        ).dict()
+    
+    async def career_counseling(self, current_role: str = None, experience_years: int = None,
                          skills: List[str] = None, career_goals: str = None,
                          challenges: List[str] = None, industry: str = None) -> CareerCounselingResponse:
         """Provide personalized career counseling"""
@@ -66,7 +72,7 @@ class ChatService:
             )
             
             # Generate AI response
-            ai_response = self._generate_counseling_response(context)
+            ai_response = await self._generate_counseling_response(context)
             
             # Parse AI response and structure it
             structured_response = self._parse_counseling_response(ai_response)
@@ -90,14 +96,41 @@ class ChatService:
                 counseling_timestamp=datetime.now().isoformat()
             )
     
-    def ats_analysis(self, resume_text: str, job_description: str, ats_system: str = None) -> ATSAnalysisResponse:
+    async def stream_career_counseling(self, current_role: str = None, experience_years: int = None,
+                                       skills: List[str] = None, career_goals: str = None,
+                                       challenges: List[str] = None, industry: str = None) -> AsyncIterator[Tuple[str, Any]]:
+        """Stream counseling advice as ("token", ...) events followed by a final ("done", CareerCounselingResponse) event"""
+        context = self._build_counseling_context(
+            current_role, experience_years, skills, career_goals, challenges, industry
+        )
+        
+        parts = []
+        async for token in self.ai_client.stream_generate_response(
+            self._counseling_messages(context), max_tokens=1500, task="counseling"
+        ):
+            parts.append(token)
+            yield "token", {"content": token}
+        
+        ai_response = "".join(parts)
+        structured_response = self._parse_counseling_response(ai_response)
+        
+        yield "done", CareerCounselingResponse(
+            advice=structured_response.get("advice", ai_response),
+            action_plan=structured_response.get("action_plan", []),
+            skill_recommendations=structured_response.get("skill_recommendations", []),
+            career_paths=structured_response.get("career_paths", []),
+            resources=structured_response.get("resources", []),
+            counseling_timestamp=datetime.now().isoformat()
+        ).dict()
+    
+    async def ats_analysis(self, resume_text: str, job_description: str, ats_system: str = None) -> ATSAnalysisResponse:
         """Analyze resume for ATS compatibility"""
         try:
             # Basic ATS analysis
             basic_analysis = self._basic_ats_analysis(resume_text, job_description)
 
             # AI-enhanced analysis via AI client
-            ai_result = self.ai_client.ats_feedback(
+            ai_result = await self.ai_client.ats_feedback(
                 resume_text=resume_text,
                 job_description=job_description,
                 ats_system=ats_system,
@@ -161,6 +194,23 @@ class ChatService:
         
         return suggestions[:3]  # Return top 3 suggestions
     
+    def _remember_exchange(self, user_id: Optional[str], message: str, ai_response: str) -> None:
+        """Append a user/assistant exchange to the in-memory history"""
+        if not user_id:
+            return
+        if user_id not in self.conversation_history:
+            self.conversation_history[user_id] = []
+        self.conversation_history[user_id].append({
+            "role": "user",
+            "content": message,
+            "timestamp": datetime.now().isoformat()
+        })
+        self.conversation_history[user_id].append({
+            "role": "assistant",
+            "content": ai_response,
+            "timestamp": datetime.now().isoformat()
+        })
+    
     def _build_counseling_context(self, current_role: str, experience_years: int,
                                  skills: List[str], career_goals: str,
                                  challenges: List[str], industry: str) -> Dict[str, Any]:
@@ -175,8 +225,14 @@ class ChatService:
         }
         return context
     
-    def _generate_counseling_response(self, context: Dict[str, Any]) -> str:
+    async def _generate_counseling_response(self, context: Dict[str, Any]) -> str:
         """Generate AI-powered career counseling response"""
+        return await self.ai_client.generate_response(
+            self._counseling_messages(context), max_tokens=1500, task="counseling"
+        )
+    
+    def _counseling_messages(self, context: Dict[str, Any]) -> List[Dict[str, str]]:
+        """Build the counseling prompt messages"""
         system_prompt = """You are an expert career counselor. Based on the provided context, 
         give personalized career advice. Structure your response with:
         1. Overall advice
@@ -198,12 +254,10 @@ class ChatService:
         Please provide personalized career counseling advice.
         """
         
-        messages = [
+        return [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt}
         ]
-        
-        return self.ai_client.generate_response(messages, max_tokens=1500)
     
     def _parse_counseling_response(self, response: str) -> Dict[str, Any]:
         """Parse AI counseling response into structured format"""
@@ -0,0 +1,85 @@
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import asyncio
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from app.db import crud
+from app.utils.extraction_engine import OCRCache, extraction_engine
+from app.utils.upload_spool import SpooledUpload
+
+
+# Cache key for the tiered engine; bump it when extraction output changes
+EXTRACTOR_TIERED = "tiered-v2"
+
+
+class DatabaseOCRCache(OCRCache):
+    """OCR output per page hash, stored in the ocr_page_cache table"""
+
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def lookup(self, page_hashes: List[str]) -> Dict[str, str]:
+        return crud.get_cached_ocr_pages(self.db, page_hashes)
+
+    def store(self, pages: Dict[str, Tuple[str, int]]) -> None:
+        crud.save_cached_ocr_pages(self.db, pages)
+
+
+class ExtractionService:
+    """Service for turning uploaded files into text, reusing results for identical files"""
+
+    async def extract_upload(
+        self, db: Session, spooled: SpooledUpload, file_extension: str
+    ) -> Tuple[str, bool, Optional[Dict[str, Any]]]:
+        """Return (extracted_text, cache_hit, extraction_report) for a spooled upload
+
+        The report (tier per page and time per tier) is None on a cache hit.
+        """
+        cached = crud.get_cached_extraction(db, spooled.sha256, EXTRACTOR_TIERED)
+        if cached is not None:
+            return cached.extracted_text, True, None
+
+        # Scanned pages seen in earlier uploads (e.g. a re-exported resume) skip OCR too
+        extracted_text, report = await extraction_engine.extract(
+            spooled.path, file_extension, ocr_cache=DatabaseOCRCache(db)
+        )
+
+        # Only successful extractions are cached; failures raise before this point
+        crud.save_cached_extraction(
+            db,
+            content_hash=spooled.sha256,
+            extractor=EXTRACTOR_TIERED,
+            file_type=file_extension,
+            file_size=spooled.size,
+            extracted_text=extracted_text,
+        )
+        return extracted_text, False, report.to_dict()
+
+    async def extract_uploads_batch(
+        self, db: Session, uploads: List[Tuple[SpooledUpload, str]], concurrency: int = 4
+    ) -> AsyncIterator[Tuple[int, Optional[str], bool, Optional[str]]]:
+        """Extract many spooled uploads, yielding (index, text, cache_hit, error) as each finishes
+
+        ``uploads`` holds (spooled, file_extension) pairs. At most ``concurrency`` files are
+        extracted at once; the engine spreads them (and long PDFs' page ranges) over the
+        worker pool. Results arrive in completion order.
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def run(index: int, spooled: SpooledUpload, file_extension: str):
+            async with semaphore:
+                try:
+                    text, cache_hit, _ = await self.extract_upload(db, spooled, file_extension)
+                    return index, text, cache_hit, None
+                except HTTPException as e:
+                    return index, None, False, str(e.detail)
+                except Exception as e:
+                    return index, None, False, f"Failed to process uploaded file: {str(e)}"
+
+        tasks = [asyncio.ensure_future(run(index, *upload)) for index, upload in enumerate(uploads)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Stop outstanding work if the consumer goes away early
+            for task in tasks:
+                task.cancel()
@@ -0,0 +1,204 @@
+"""
+Job postings with their match/search features computed once, at ingest.
+
+When a posting enters the corpus its skills are extracted (canonical names via the
+skill matcher), the fields that filters compare are lowercased and its text is added to
+the search index and its skills to the match engine's skill matrix. Matching and
+searching then only read these features. Replacing or removing a posting rebuilds or
+drops its features, so they never go stale.
+"""
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+from app.utils.match_engine import MatchEngine
+from app.utils.search_index import SearchIndex, tokenize
+from app.utils.skill_matcher import SkillMatcher, skill_matcher
+
+
+# Relative weight of a query term found in each job field when ranking search results
+SEARCH_FIELD_WEIGHTS = {"title": 3.0, "company": 2.0, "description": 1.0, "requirements": 1.0}
+
+# JobRecord fields the match engine can filter on
+FILTER_FIELDS = ("experience_level", "location", "job_type")
+
+
+@dataclass(frozen=True)
+class JobRecord:
+    """A posting plus the features derived from it"""
+
+    key: Any
+    job: Dict[str, Any]
+    # Canonical skill names in order of first mention, and the same as a set
+    skills: Tuple[str, ...]
+    skill_set: FrozenSet[str]
+    # Lowercased filter fields
+    location: str
+    job_type: str
+    experience_level: str
+
+    def matches_filters(self, experience_level: Optional[str] = None, location: Optional[str] = None,
+                        job_type: Optional[str] = None) -> bool:
+        """True if the posting passes the filters; filter values must already be lowercased"""
+        if experience_level and experience_level not in self.experience_level:
+            return False
+        if location and location not in self.location:
+            return False
+        if job_type and job_type not in self.job_type:
+            return False
+        return True
+
+
+def search_fields(job: Dict[str, Any]) -> Dict[str, str]:
+    """The job text indexed for search, keyed like SEARCH_FIELD_WEIGHTS"""
+    return {
+        "title": job.get("title") or "",
+        "company": job.get("company") or "",
+        "description": job.get("description") or "",
+        "requirements": "\n".join(job.get("requirements") or []),
+    }
+
+
+def skill_coverage(user_skills: List[str]) -> Callable[[str], bool]:
+    """Predicate telling whether (canonical) user skills cover a job skill, memoized per skill
+
+    A job skill is covered when a user skill equals it or either contains the other.
+    """
+    user_skill_set = set(user_skills)
+    cache: Dict[str, bool] = {}
+
+    def covers(job_skill: str) -> bool:
+        covered = cache.get(job_skill)
+        if covered is None:
+            covered = job_skill in user_skill_set or any(user_skill in job_skill or job_skill in user_skill
+                                                         for user_skill in user_skills)
+            cache[job_skill] = covered
+        return covered
+
+    return covers
+
+
+class JobCorpus:
+    """Keyed job postings with precomputed skills, filter fields and search index entries"""
+
+    def __init__(self, matcher: Optional[SkillMatcher] = None) -> None:
+        self.matcher = matcher or skill_matcher
+        self.search_index = SearchIndex(SEARCH_FIELD_WEIGHTS)
+        self.match_engine = MatchEngine(FILTER_FIELDS)
+        self._records: Dict[Any, JobRecord] = {}
+        self._next_key = 0
+
+    @classmethod
+    def from_jobs(cls, jobs: List[Dict[str, Any]], matcher: Optional[SkillMatcher] = None) -> "JobCorpus":
+        corpus = cls(matcher)
+        for job in jobs:
+            corpus.add(job)
+        return corpus
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[JobRecord]:
+        return iter(self._records.values())
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._records
+
+    def get(self, key: Any) -> Optional[JobRecord]:
+        return self._records.get(key)
+
+    def add(self, job: Dict[str, Any], key: Any = None) -> JobRecord:
+        """Add a posting (under ``key``, or the next integer key); an existing key is replaced"""
+        if key is None:
+            key = self._next_key
+        if isinstance(key, int) and key >= self._next_key:
+            self._next_key = key + 1
+        record = self._build_record(key, job)
+        self._records[key] = record
+        # SearchIndex.add replaces the old entry for the key
+        self.search_index.add(key, search_fields(job))
+        self.match_engine.add(key, record.skills, {field: getattr(record, field) for field in FILTER_FIELDS})
+        return record
+
+    def update(self, key: Any, job: Dict[str, Any]) -> JobRecord:
+        """Replace a posting and rebuild its features
+
+        Raises:
+            KeyError: If there is no posting under ``key``
+        """
+        if key not in self._records:
+            raise KeyError(key)
+        return self.add(job, key)
+
+    def remove(self, key: Any) -> bool:
+        if self._records.pop(key, None) is None:
+            return False
+        self.search_index.remove(key)
+        self.match_engine.remove(key)
+        return True
+
+    def filter(self, experience_level: Optional[str] = None, location: Optional[str] = None,
+               job_type: Optional[str] = None) -> Iterator[JobRecord]:
+        """Postings passing the filters (case-insensitive substring match, like before)"""
+        experience_level, location, job_type = _lower(experience_level), _lower(location), _lower(job_type)
+        for record in self._records.values():
+            if record.matches_filters(experience_level, location, job_type):
+                yield record
+
+    def match(self, skill_matches: Callable[[str], bool], limit: int = 20, min_score: float = 0.0,
+              experience_level: Optional[str] = None, location: Optional[str] = None,
+              job_type: Optional[str] = None) -> Tuple[List[Tuple[JobRecord, float]], int]:
+        """Best ``limit`` (posting, match score) pairs above ``min_score`` and the total above it
+
+        ``skill_matches`` decides whether the user covers a (canonical) job skill; see
+        MatchEngine.top_k for how scores are computed.
+        """
+        filters = {"experience_level": _lower(experience_level), "location": _lower(location), "job_type": _lower(job_type)}
+        hits, total = self.match_engine.top_k(skill_matches, k=limit, min_score=min_score, filters=filters)
+        return [(self._records[key], score) for key, score in hits], total
+
+    def search(self, query: str, limit: int = 10, experience_level: Optional[str] = None,
+               location: Optional[str] = None, job_type: Optional[str] = None) -> List[JobRecord]:
+        """Best ``limit`` postings for ``query`` by BM25 among those passing the filters
+
+        The last query word matches as a prefix ("senior py" finds "Senior Python
+        Developer", "java" also finds "JavaScript"). When BM25 finds nothing, or the query
+        has no searchable terms (empty, or only punctuation), this falls back to the old
+        substring scan of title, company and description, so partial words in the middle
+        of the query still match and an empty query lists postings in catalogue order.
+        """
+        experience_level, location, job_type = _lower(experience_level), _lower(location), _lower(job_type)
+        records = self._records
+        if tokenize(query):
+            def accept(key: Any) -> bool:
+                return records[key].matches_filters(experience_level, location, job_type)
+
+            filtered = experience_level or location or job_type
+            hits = self.search_index.search(query, limit=limit, accept=accept if filtered else None, prefix_last=True)
+            if hits:
+                return [records[key] for key, _ in hits]
+
+        query_lower = query.lower()
+        matching = (
+            record for record in self.filter(experience_level, location, job_type)
+            if query_lower in (record.job.get("title") or "").lower()
+            or query_lower in (record.job.get("company") or "").lower()
+            or query_lower in (record.job.get("description") or "").lower()
+        )
+        return list(islice(matching, limit))
+
+    def _build_record(self, key: Any, job: Dict[str, Any]) -> JobRecord:
+        skills = tuple(self.matcher.find_all([*(job.get("requirements") or []), job.get("description") or ""]))
+        return JobRecord(
+            key=key,
+            job=job,
+            skills=skills,
+            skill_set=frozenset(skills),
+            location=(job.get("location") or "").lower(),
+            job_type=(job.get("job_type") or "").lower(),
+            experience_level=(job.get("experience_level") or "").lower(),
+        )
+
+
+def _lower(value: Optional[str]) -> Optional[str]:
+    return value.lower() if value else None
@@ -0,0 +1,199 @@
+"""
+Streaming import of job postings into the catalogue (the jobs table).
+
+Reads JSON Lines (one posting object per line) or CSV (one posting per row, with a header
+row); either may be gzip-compressed. Postings are upserted in batches of
+JOB_IMPORT_BATCH_SIZE and only one batch is held in memory, so feeds with millions of rows
+import in bounded memory. A posting with an ``external_id`` replaces the stored posting
+with that ID, so re-running an import updates rather than duplicates.
+
+Recognized fields, with accepted aliases in brackets: external_id [id], title, company,
+location, description, requirements, benefits, salary_range [salary], job_type [type],
+experience_level [level]. In CSV, requirements and benefits are either a JSON array or
+items separated by newlines or ``|``. Rows without a title are skipped and reported.
+
+    python -m app.services.job_import jobs.jsonl
+    python -m app.services.job_import feed.csv.gz --batch-size 2000
+"""
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+import argparse
+import csv
+import gzip
+import io
+import json
+import os
+import re
+import sys
+import time
+
+from sqlalchemy.orm import Session
+
+from app.db import crud
+from app.db.session import SessionLocal
+
+
+JOB_IMPORT_BATCH_SIZE = int(os.getenv("JOB_IMPORT_BATCH_SIZE", "500"))
+
+# Rejected rows kept in the stats (the count covers all of them)
+MAX_REPORTED_ERRORS = 20
+
+# Largest CSV field accepted (long descriptions exceed csv's 128 KB default)
+CSV_FIELD_LIMIT = 16 * 1024 * 1024
+
+FIELD_ALIASES = {
+    "id": "external_id",
+    "salary": "salary_range",
+    "type": "job_type",
+    "level": "experience_level",
+}
+TEXT_FIELDS = ("external_id", "title", "company", "location", "description", "salary_range", "job_type", "experience_level")
+LIST_FIELDS = ("requirements", "benefits")
+
+_LIST_SEPARATOR = re.compile(r"\s*(?:\r?\n|\|)\s*")
+
+
+@dataclass
+class ImportStats:
+    read: int = 0
+    inserted: int = 0
+    updated: int = 0
+    skipped: int = 0
+    errors: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+    def reject(self, line: int, reason: str) -> None:
+        self.skipped += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"line {line}: {reason}")
+
+
+def detect_format(path: str) -> str:
+    """'jsonl' or 'csv' from the file name (a trailing .gz is ignored)"""
+    name = path.lower()
+    if name.endswith(".gz"):
+        name = name[:-3]
+    if name.endswith((".jsonl", ".ndjson", ".json")):
+        return "jsonl"
+    if name.endswith(".csv"):
+        return "csv"
+    raise ValueError(f"Can't tell the format of {path}; use .jsonl, .ndjson or .csv (optionally .gz)")
+
+
+def normalize_posting(raw: Dict[str, Any]) -> Dict[str, Any]:
+    """A feed record as a posting dict for crud.upsert_catalogue_jobs
+
+    Raises:
+        ValueError: If the record is not an object or has no title
+    """
+    if not isinstance(raw, dict):
+        raise ValueError("expected an object")
+    record = {FIELD_ALIASES.get(key, key): value for key, value in raw.items() if key}
+    posting: Dict[str, Any] = {}
+    for name in TEXT_FIELDS:
+        value = record.get(name)
+        value = str(value).strip() if value is not None else ""
+        posting[name] = value or None
+    for name in LIST_FIELDS:
+        posting[name] = _as_list(record.get(name))
+    if not posting["title"]:
+        raise ValueError("missing title")
+    return posting
+
+
+def iter_records(stream: TextIO, fmt: str) -> Iterator[Tuple[int, Any]]:
+    """(line number, raw record) per posting; a malformed JSON line yields its ValueError instead"""
+    if fmt == "jsonl":
+        for line_number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except ValueError as e:
+                yield line_number, e
+    elif fmt == "csv":
+        csv.field_size_limit(CSV_FIELD_LIMIT)
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    else:
+        raise ValueError(f"Unsupported import format: {fmt}")
+
+
+def import_postings(db: Session, stream: TextIO, fmt: str, batch_size: int = JOB_IMPORT_BATCH_SIZE) -> ImportStats:
+    """Upsert every posting in ``stream`` into the catalogue, one batch at a time"""
+    stats = ImportStats()
+    started = time.perf_counter()
+    batch: List[Dict[str, Any]] = []
+    for line_number, record in iter_records(stream, fmt):
+        stats.read += 1
+        try:
+            if isinstance(record, ValueError):
+                raise record
+            batch.append(normalize_posting(record))
+        except ValueError as e:
+            stats.reject(line_number, str(e))
+            continue
+        if len(batch) >= batch_size:
+            _flush(db, batch, stats)
+    if batch:
+        _flush(db, batch, stats)
+    stats.seconds = round(time.perf_counter() - started, 2)
+    return stats
+
+
+def import_file(path: str, fmt: Optional[str] = None, batch_size: int = JOB_IMPORT_BATCH_SIZE) -> ImportStats:
+    fmt = fmt or detect_format(path)
+    with _open_text(path) as stream, SessionLocal() as db:
+        return import_postings(db, stream, fmt, batch_size)
+
+
+def _flush(db: Session, batch: List[Dict[str, Any]], stats: ImportStats) -> None:
+    inserted, updated = crud.upsert_catalogue_jobs(db, batch)
+    stats.inserted += inserted
+    stats.updated += updated
+    batch.clear()
+    # Nothing from this batch needs to stay in the session
+    db.expunge_all()
+
+
+def _open_text(path: str) -> TextIO:
+    raw = gzip.open(path, "rb") if path.lower().endswith(".gz") else open(path, "rb")
+    # newline="" lets the csv module handle newlines inside quoted fields
+    return io.TextIOWrapper(raw, encoding="utf-8-sig", newline="")
+
+
+def _as_list(value: Any) -> Optional[List[str]]:
+    if value is None:
+        return None
+    if isinstance(value, list):
+        return [str(item).strip() for item in value if str(item).strip()]
+    text = str(value).strip()
+    if not text:
+        return []
+    if text.startswith("["):
+        try:
+            items = json.loads(text)
+        except ValueError:
+            items = None
+        if isinstance(items, list):
+            return [str(item).strip() for item in items if str(item).strip()]
+    return [item for item in _LIST_SEPARATOR.split(text) if item]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import job postings (JSONL or CSV, optionally gzipped) into the catalogue")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=("jsonl", "csv"), help="Default: from the file extension")
+    parser.add_argument("--batch-size", type=int, default=JOB_IMPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    try:
+        stats = import_file(args.path, args.format, args.batch_size)
+    except (OSError, ValueError) as e:
+        sys.exit(f"Import failed: {e}")
+    print(json.dumps(asdict(stats), indent=2))
+
+
+if __name__ == "__main__":
+    main()
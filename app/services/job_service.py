@@ -1,38 +1,41 @@
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, List
 import re
 from collections import Counter
 from app.models.job_models import JobMatchResponse, JobSearchResponse, JobDescription, JobMatch
+from app.services.job_corpus import JobRecord, skill_coverage
+from app.services.job_store import JobStore
 from app.utils.ai_client import ai_client
+from app.utils.skill_matcher import skill_matcher
 
 class JobService:
     """Service for job matching and search"""
     
     def __init__(self):
         self.ai_client = ai_client
-        # Sample job database (in production, this would be a real database)
-        self.sample_jobs = self._load_sample_jobs()
+        self.skill_matcher = skill_matcher
+        # Job catalogue from the jobs table (the sample jobs while it is empty), loaded at
+        # startup. Skills, filter fields and search tokens are computed once per posting.
+        self.store = JobStore(matcher=self.skill_matcher, fallback=self._load_sample_jobs)
     
     def match_jobs(self, skills: List[str], experience_level: str = None, location: str = None, 
                    job_type: str = None, salary_range: str = None) -> JobMatchResponse:
         """Match jobs based on skills and preferences"""
         try:
-            # Filter jobs based on criteria
-            filtered_jobs = self._filter_jobs(experience_level, location, job_type, salary_range)
+            # Canonical names once per request, so "K8s" matches "kubernetes"
+            user_skills = [self.skill_matcher.canonical(skill) for skill in skills]
+            covers = skill_coverage(user_skills)
             
-            # Calculate matches
-            matches = []
-            for job in filtered_jobs:
-                match = self._calculate_job_match(job, skills)
-                if match["match_score"] > 30:  # Only include jobs with decent match
-                    matches.append(match)
-            
-            # Sort by match score
-            matches.sort(key=lambda x: x["match_score"], reverse=True)
+            # Score every job passing the filters at once; models only for the top 20
+            with self.store.reading() as corpus:
+                top, total_matches = corpus.match(covers, limit=20, min_score=30,  # Only include jobs with decent match
+                                                  experience_level=experience_level, location=location,
+                                                  job_type=job_type)
+            matches = [self._build_job_match(record, match_score, covers) for record, match_score in top]
             
             return JobMatchResponse(
-                matches=matches[:20],  # Top 20 matches
-                total_matches=len(matches),
+                matches=matches,
+                total_matches=total_matches,
                 search_timestamp=datetime.now().isoformat()
             )
         except Exception as e:
@@ -45,24 +48,18 @@ class JobService:
     
     def search_jobs(self, query: str, location: str = None, job_type: str = None, 
                     experience_level: str = None, limit: int = 10) -> JobSearchResponse:
-        """Search for jobs based on query"""
+        """Search for jobs based on query
+
+        Results are ranked by BM25 rather than listed in catalogue order. The last word
+        matches as a prefix, and a query BM25 finds nothing for falls back to the old
+        substring match on title, company and description.
+        """
         try:
-            # Filter jobs based on search criteria
-            filtered_jobs = self._filter_jobs(experience_level, location, job_type)
-            
-            # Search based on query
-            matching_jobs = []
-            query_lower = query.lower()
-            
-            for job in filtered_jobs:
-                # Check if query matches job title, company, or description
-                if (query_lower in job["title"].lower() or 
-                    query_lower in job["company"].lower() or 
-                    query_lower in job["description"].lower()):
-                    matching_jobs.append(job)
-            
-            # Limit results
-            matching_jobs = matching_jobs[:limit]
+            # Rank matches by BM25; filters are applied to the candidates only
+            with self.store.reading() as corpus:
+                records = corpus.search(query, limit=limit, experience_level=experience_level,
+                                        location=location, job_type=job_type)
+            matching_jobs = [record.job for record in records]
             
             return JobSearchResponse(
                 jobs=matching_jobs,
@@ -76,53 +73,17 @@ class JobService:
                 search_timestamp=datetime.now().isoformat()
             )
     
-    def _filter_jobs(self, experience_level: str = None, location: str = None, 
-                     job_type: str = None, salary_range: str = None) -> List[Dict[str, Any]]:
-        """Filter jobs based on criteria"""
-        filtered_jobs = self.sample_jobs.copy()
-        
-        if experience_level:
-            filtered_jobs = [job for job in filtered_jobs 
-                           if experience_level.lower() in job["experience_level"].lower()]
-        
-        if location:
-            filtered_jobs = [job for job in filtered_jobs 
-                           if location.lower() in job["location"].lower()]
-        
-        if job_type:
-            filtered_jobs = [job for job in filtered_jobs 
-                           if job_type.lower() in job["job_type"].lower()]
-        
-        return filtered_jobs
-    
-    def _calculate_job_match(self, job: Dict[str, Any], user_skills: List[str]) -> JobMatch:
-        """Calculate match score between user skills and job requirements"""
-        job_requirements = job.get("requirements", [])
-        job_description = job.get("description", "")
-        
-        # Extract skills from job requirements and description
-        job_skills = self._extract_skills_from_job(job_requirements, job_description)
-        
-        # Calculate skill overlap
-        user_skills_lower = [skill.lower() for skill in user_skills]
-        job_skills_lower = [skill.lower() for skill in job_skills]
-        
+    def _build_job_match(self, record: JobRecord, match_score: float, covers: Callable[[str], bool]) -> JobMatch:
+        """Response model for a job the match engine returned, with its precomputed skills split"""
         matched_skills = []
         missing_skills = []
         
-        for job_skill in job_skills_lower:
-            if any(user_skill in job_skill or job_skill in user_skill 
-                   for user_skill in user_skills_lower):
+        for job_skill in record.skills:
+            if covers(job_skill):
                 matched_skills.append(job_skill)
             else:
                 missing_skills.append(job_skill)
         
-        # Calculate match score
-        if len(job_skills_lower) == 0:
-            match_score = 50  # Default score if no skills found
-        else:
-            match_score = (len(matched_skills) / len(job_skills_lower)) * 100
-        
         # Generate match reasons
         match_reasons = []
         if len(matched_skills) > 0:
@@ -135,45 +96,15 @@ class JobService:
             match_reasons.append("Some relevant skills")
         
         return JobMatch(
-            job=JobDescription(**job),
-            match_score=round(match_score, 1),
+            job=JobDescription(**record.job),
+            match_score=match_score,
             matched_skills=matched_skills[:10],
             missing_skills=missing_skills[:10],
             match_reasons=match_reasons
         )
     
-    def _extract_skills_from_job(self, requirements: List[str], description: str) -> List[str]:
-        """Extract skills from job requirements and description"""
-        skills = []
-        
-        # Common technical skills to look for
-        tech_skills = [
-            'python', 'javascript', 'java', 'react', 'node.js', 'sql', 'aws', 'docker',
-            'kubernetes', 'git', 'linux', 'html', 'css', 'typescript', 'angular',
-            'vue.js', 'mongodb', 'postgresql', 'mysql', 'redis', 'elasticsearch',
-            'machine learning', 'ai', 'data science', 'analytics', 'tableau', 'power bi',
-            'agile', 'scrum', 'devops', 'ci/cd', 'microservices', 'api', 'rest',
-            'graphql', 'tensorflow', 'pytorch', 'pandas', 'numpy', 'scikit-learn'
-        ]
-        
-        # Check requirements
-        for req in requirements:
-            req_lower = req.lower()
-            for skill in tech_skills:
-                if skill in req_lower:
-                    skills.append(skill)
-        
-        # Check description
-        desc_lower = description.lower()
-        for skill in tech_skills:
-            if skill in desc_lower:
-                skills.append(skill)
-        
-        # Remove duplicates and return
-        return list(set(skills))
-    
     def _load_sample_jobs(self) -> List[Dict[str, Any]]:
-        """Load sample job data"""
+        """Sample job data, served while the job catalogue is empty"""
         return [
             {
                 "title": "Senior Python Developer",
@@ -0,0 +1,221 @@
+"""
+The job catalogue: postings stored in the jobs table, served from an in-memory corpus.
+
+Catalogue postings are the rows of ``jobs`` without an owner (see job_import). Each
+process streams them into a JobCorpus (skills, filter fields, search index and match
+matrix) once, at startup via warm(). The catalogue is held in memory in every worker
+process: about 2.5 KB per typical posting (roughly 520 MB for 200k postings). Above
+JOB_CATALOGUE_MAX_POSTINGS only the most recently changed postings are held (with a
+warning), and match and search don't see the rest; this mirror is not meant for
+catalogues of millions of postings. Size workers and the cap together.
+
+Afterwards, at most every JOB_CATALOGUE_REFRESH_SECONDS, the store reads only the
+postings changed since its (updated_at, id) watermark and folds them in. If rows were
+deleted (the count no longer agrees), it builds a fresh corpus off to the side, keeps
+serving the old one meanwhile, then swaps the new one in.
+
+Readers take the corpus through reading(), which holds a lock. Changes are applied under
+the same lock, so a match or search never sees a half-applied refresh. Database reads
+happen outside the lock.
+
+While the catalogue is empty, or the table can't be read, the store serves a fallback
+list of postings, so a fresh install still answers.
+"""
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import json
+import logging
+import os
+import threading
+import time
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.db import crud, models
+from app.db.session import SessionLocal
+from app.services.job_corpus import JobCorpus
+from app.utils.skill_matcher import SkillMatcher
+
+
+logger = logging.getLogger(__name__)
+
+JOB_CATALOGUE_REFRESH_SECONDS = float(os.getenv("JOB_CATALOGUE_REFRESH_SECONDS", "30"))
+# Most postings held in memory per process (0 = no limit)
+JOB_CATALOGUE_MAX_POSTINGS = int(os.getenv("JOB_CATALOGUE_MAX_POSTINGS", "200000"))
+
+# Rows fetched per round trip while loading the catalogue
+LOAD_BATCH_SIZE = 1000
+
+
+def job_to_posting(job: models.Job) -> Dict[str, Any]:
+    """A jobs row as a posting dict shaped like JobDescription"""
+    return {
+        "title": job.title,
+        "company": job.company or "",
+        "location": job.location or "",
+        "description": job.description or "",
+        "requirements": _json_list(job.requirements_json),
+        "benefits": _json_list(job.benefits_json),
+        "salary_range": job.salary_range,
+        "job_type": job.job_type or "",
+        "experience_level": job.experience_level or "",
+    }
+
+
+class JobStore:
+    """Keeps a JobCorpus in step with the catalogue in the jobs table"""
+
+    def __init__(
+        self,
+        matcher: Optional[SkillMatcher] = None,
+        fallback: Optional[Callable[[], List[Dict[str, Any]]]] = None,
+        session_factory: sessionmaker = SessionLocal,
+        refresh_seconds: float = JOB_CATALOGUE_REFRESH_SECONDS,
+        max_postings: int = JOB_CATALOGUE_MAX_POSTINGS,
+    ) -> None:
+        self.matcher = matcher
+        self.fallback = fallback
+        self.session_factory = session_factory
+        self.refresh_seconds = refresh_seconds
+        self.max_postings = max_postings
+        self._corpus: Optional[JobCorpus] = None
+        self._serving_fallback = False
+        # (updated_at, id) of the newest posting folded in
+        self._watermark: Optional[Tuple[datetime, int]] = None
+        # Only while the catalogue is over max_postings: the (updated_at, id) just before
+        # the oldest posting held, and each held posting's (updated_at, id), oldest first
+        self._cutoff: Optional[Tuple[datetime, int]] = None
+        self._versions: "OrderedDict[int, Tuple[datetime, int]]" = OrderedDict()
+        self._checked_at = 0.0
+        # Guards the corpus while it is read or changed
+        self._lock = threading.Lock()
+        # One thread at a time loads or refreshes
+        self._refresh_lock = threading.Lock()
+
+    @contextmanager
+    def reading(self) -> Iterator[JobCorpus]:
+        """The current corpus, locked against changes for the duration of the block
+
+        Blocks (in the caller's thread) until the first load has finished. A refresh that
+        is due runs first, unless another thread is already refreshing.
+        """
+        if self._corpus is None:
+            self.warm()
+        elif time.monotonic() - self._checked_at >= self.refresh_seconds and self._refresh_lock.acquire(blocking=False):
+            try:
+                self._refresh()
+            finally:
+                self._refresh_lock.release()
+        with self._lock:
+            yield self._corpus
+
+    def warm(self) -> None:
+        """Load the catalogue if it isn't loaded yet (call at startup, off the event loop)"""
+        with self._refresh_lock:
+            if self._corpus is None:
+                self._refresh()
+
+    def _refresh(self) -> None:
+        self._checked_at = time.monotonic()
+        try:
+            with self.session_factory() as db:
+                self._sync(db)
+        except SQLAlchemyError as e:
+            logger.warning("Could not read the job catalogue (%s); serving the last loaded postings", e)
+            if self._corpus is None:
+                self._swap(self._fallback_corpus(), fallback=True, watermark=None)
+
+    def _sync(self, db: Session) -> None:
+        if self._corpus is None or self._serving_fallback:
+            count = crud.count_catalogue_jobs(db)
+            if count:
+                self._load(db, count)
+            elif self._corpus is None:
+                self._swap(self._fallback_corpus(), fallback=True, watermark=None)
+            return
+
+        changed = [
+            (job.id, job_to_posting(job), (job.updated_at, job.id))
+            for job in crud.iter_catalogue_jobs(db, after=self._watermark, batch_size=LOAD_BATCH_SIZE)
+        ] if self._watermark is not None else []
+        count = crud.count_catalogue_jobs(db)
+        if changed:
+            with self._lock:
+                for key, posting, version in changed:
+                    self._corpus.add(posting, key=key)
+                    if self._cutoff is not None:
+                        self._versions[key] = version
+                        self._versions.move_to_end(key)
+                self._watermark = changed[-1][2]
+                if self._cutoff is not None:
+                    self._evict()
+        if self._cutoff is None:
+            stale = len(self._corpus) != count or bool(self.max_postings and count > self.max_postings)
+        else:
+            stale = len(self._corpus) != crud.count_catalogue_jobs(db, after=self._cutoff)
+        if stale:
+            # Rows were deleted (or have no updated_at), or the catalogue outgrew the cap;
+            # rebuild off to the side
+            self._load(db, count)
+
+    def _load(self, db: Session, count: int) -> None:
+        corpus = JobCorpus(self.matcher)
+        cutoff: Optional[Tuple[datetime, int]] = None
+        versions: "OrderedDict[int, Tuple[datetime, int]]" = OrderedDict()
+        if self.max_postings and count > self.max_postings:
+            # Postings without updated_at sort before any cutoff, so they are left out too
+            cutoff = crud.catalogue_cutoff(db, self.max_postings) or (datetime.min, 0)
+            logger.warning(
+                "The job catalogue has %d postings; holding the %d most recently changed in memory "
+                "(JOB_CATALOGUE_MAX_POSTINGS), the rest are not matched or searched",
+                count, self.max_postings,
+            )
+        watermark: Optional[Tuple[datetime, int]] = None
+        for job in crud.iter_catalogue_jobs(db, after=cutoff, batch_size=LOAD_BATCH_SIZE):
+            corpus.add(job_to_posting(job), key=job.id)
+            if job.updated_at is not None:
+                version = (job.updated_at, job.id)
+                if cutoff is not None:
+                    versions[job.id] = version
+                if watermark is None or version > watermark:
+                    watermark = version
+        self._swap(corpus, fallback=False, watermark=watermark, cutoff=cutoff, versions=versions)
+        logger.info("Loaded %d job postings from the catalogue", len(corpus))
+
+    def _evict(self) -> None:
+        # Caller holds the lock; drop the least recently changed postings over the cap
+        while len(self._corpus) > self.max_postings and self._versions:
+            key, version = self._versions.popitem(last=False)
+            self._corpus.remove(key)
+            self._cutoff = version
+
+    def _swap(
+        self,
+        corpus: JobCorpus,
+        fallback: bool,
+        watermark: Optional[Tuple[datetime, int]],
+        cutoff: Optional[Tuple[datetime, int]] = None,
+        versions: Optional["OrderedDict[int, Tuple[datetime, int]]"] = None,
+    ) -> None:
+        with self._lock:
+            self._corpus = corpus
+            self._serving_fallback = fallback
+            self._watermark = watermark
+            self._cutoff = cutoff
+            self._versions = versions if versions is not None else OrderedDict()
+
+    def _fallback_corpus(self) -> JobCorpus:
+        return JobCorpus.from_jobs(self.fallback() if self.fallback else [], self.matcher)
+
+
+def _json_list(value: Optional[str]) -> List[str]:
+    if not value:
+        return []
+    try:
+        items = json.loads(value)
+    except ValueError:
+        return []
+    return [str(item) for item in items] if isinstance(items, list) else []
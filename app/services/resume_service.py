@@ -1,7 +1,9 @@
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
+import asyncio
 import re
 from app.utils.ai_client import ai_client
+from app.utils.json_repair import IncrementalJSONParser
 from app.models.resume_models import ResumeAnalysisResponse, ResumeTailorResponse, StrengthWeakness
 
 class ResumeService:
@@ -10,11 +12,12 @@ class ResumeService:
     def __init__(self):
         self.ai_client = ai_client
     
-    def analyze_resume(self, resume_text: str, job_title: str = None, industry: str = None) -> ResumeAnalysisResponse:
+    async def analyze_resume(self, resume_text: str, job_title: str = None, industry: str = None,
+                             use_cache: bool = True, resume_id: int = 0) -> ResumeAnalysisResponse:
         """Analyze resume and return structured analysis"""
         try:
             # Get AI analysis
-            ai_analysis = self.ai_client.analyze_resume(resume_text, job_title)
+            ai_analysis = await self.ai_client.analyze_resume(resume_text, job_title, use_cache=use_cache)
             
             # Enhance with basic text analysis
             basic_analysis = self._basic_resume_analysis(resume_text)
@@ -26,6 +29,7 @@ class ResumeService:
             recommendations = self._enhance_recommendations(ai_analysis.get("recommendations", []), basic_analysis)
             
             return ResumeAnalysisResponse(
+                resume_id=resume_id,
                 overall_score=overall_score,
                 strengths=strengths,
                 weaknesses=weaknesses,
@@ -37,6 +41,7 @@ class ResumeService:
             # Fallback to basic analysis if AI fails
             basic_analysis = self._basic_resume_analysis(resume_text)
             return ResumeAnalysisResponse(
+                resume_id=resume_id,
                 overall_score=basic_analysis["score"],
                 strengths=basic_analysis["strengths"],
                 weaknesses=basic_analysis["weaknesses"],
@@ -45,36 +50,49 @@ class ResumeService:
                 analysis_timestamp=datetime.now().isoformat()
             )
     
-    def tailor_resume(self, resume_text: str, job_description: str, job_title: str, company_name: str = None) -> ResumeTailorResponse:
+    async def analyze_resumes_batch(self, items: List[Dict[str, Any]],
+                                    concurrency: int = 8) -> AsyncIterator[Tuple[int, Optional[ResumeAnalysisResponse], Optional[str]]]:
+        """Analyze many resumes concurrently, yielding (index, analysis, error) as each one finishes
+        
+        Each item is a dict with resume_id, resume_text, job_title and industry. At most
+        ``concurrency`` LLM calls are in flight at once; results arrive in completion order.
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def run(index: int, item: Dict[str, Any]):
+            async with semaphore:
+                try:
+                    analysis = await self.analyze_resume(
+                        resume_text=item["resume_text"],
+                        job_title=item.get("job_title"),
+                        industry=item.get("industry"),
+                        resume_id=item["resume_id"],
+                    )
+                    return index, analysis, None
+                except Exception as e:
+                    return index, None, str(e)
+        
+        tasks = [asyncio.ensure_future(run(index, item)) for index, item in enumerate(items)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Stop outstanding work if the consumer goes away early
+            for task in tasks:
+                task.cancel()
+    
+    async def tailor_resume(self, resume_text: str, job_description: str, job_title: str, company_name: str = None) -> ResumeTailorResponse:
         """Tailor resume for specific job"""
         try:
             # Use AI to tailor resume
-            ai_result = self.ai_client.tailor_resume(
+            ai_result = await self.ai_client.tailor_resume(
                 resume_text=resume_text,
                 job_description=job_description,
                 job_title=job_title,
                 company_name=company_name,
             )
 
-            # Extract keywords from job description for reference
-            keywords = self._extract_keywords(job_description)
-
-            # Identify changes (augment AI output if needed)
-            tailored_resume = ai_result.get("tailored_resume", resume_text)
-            changes_made = ai_result.get("changes_made", [])
-            if not changes_made:
-                changes_made = self._identify_changes(resume_text, tailored_resume, keywords)
-
-            keyword_matches = ai_result.get("keyword_matches", [])
-            if not keyword_matches:
-                keyword_matches = keywords[:10]
-
-            return ResumeTailorResponse(
-                tailored_resume=tailored_resume,
-                changes_made=changes_made,
-                keyword_matches=keyword_matches,
-                tailoring_timestamp=datetime.now().isoformat()
-            )
+            return self._build_tailor_response(resume_text, job_description, ai_result)
         except Exception as e:
             # Fallback response
             return ResumeTailorResponse(
@@ -84,6 +102,53 @@ class ResumeService:
                 tailoring_timestamp=datetime.now().isoformat()
             )
     
+    async def stream_tailor_resume(self, resume_text: str, job_description: str, job_title: str,
+                                   company_name: str = None) -> AsyncIterator[Tuple[str, Any]]:
+        """Stream tailoring output as ("token", ...) events followed by a final ("done", ResumeTailorResponse) event.
+
+        Whenever a top-level field of the JSON reply completes, a ("partial", {...}) event
+        carries the fields parsed so far.
+        """
+        parts = []
+        parser = IncrementalJSONParser()
+        async for token in self.ai_client.stream_tailor_resume(
+            resume_text=resume_text,
+            job_description=job_description,
+            job_title=job_title,
+            company_name=company_name,
+        ):
+            parts.append(token)
+            yield "token", {"content": token}
+            if parser.feed(token) and not parser.complete:
+                partial = parser.value()
+                if isinstance(partial, dict):
+                    yield "partial", partial
+        
+        ai_result = self.ai_client.parse_tailoring("".join(parts), resume_text, job_title)
+        yield "done", self._build_tailor_response(resume_text, job_description, ai_result).dict()
+    
+    def _build_tailor_response(self, resume_text: str, job_description: str, ai_result: Dict[str, Any]) -> ResumeTailorResponse:
+        """Combine AI tailoring output with keyword extraction"""
+        # Extract keywords from job description for reference
+        keywords = self._extract_keywords(job_description)
+
+        # Identify changes (augment AI output if needed)
+        tailored_resume = ai_result.get("tailored_resume", resume_text)
+        changes_made = ai_result.get("changes_made", [])
+        if not changes_made:
+            changes_made = self._identify_changes(resume_text, tailored_resume, keywords)
+
+        keyword_matches = ai_result.get("keyword_matches", [])
+        if not keyword_matches:
+            keyword_matches = keywords[:10]
+
+        return ResumeTailorResponse(
+            tailored_resume=tailored_resume,
+            changes_made=changes_made,
+            keyword_matches=keyword_matches,
+            tailoring_timestamp=datetime.now().isoformat()
+        )
+    
     def _basic_resume_analysis(self, resume_text: str) -> Dict[str, Any]:
         """Perform basic resume analysis without AI"""
         text_length = len(resume_text)
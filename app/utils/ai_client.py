@@ -1,87 +1,566 @@
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional, Set, Tuple
+import asyncio
+import hashlib
+import logging
 import os
 import json
-import requests
+import time
+
+import httpx
+
+from app.utils.chunking import chunk_text, estimate_tokens, truncate_to_tokens
+from app.utils.circuit_breaker import CircuitBreaker
+from app.utils.json_repair import parse_json_tolerant
+from app.utils.llm_cache import LLMCache
+from app.utils.llm_metrics import CACHE_HIT, ERROR, OK, SKIPPED, STUB, LLMCallRecord, LLMMetrics
+from app.utils.singleflight import SingleFlight
 
 try:
-    from openai import OpenAI
+    from openai import AsyncOpenAI
 except Exception:  # pragma: no cover
-    OpenAI = None  # type: ignore
+    AsyncOpenAI = None  # type: ignore
 
 
+logger = logging.getLogger(__name__)
+
 class _LLMProvider:
-    """Internal helper that wraps OpenAI with Ollama fallback and a deterministic stub."""
+    """Internal helper that wraps OpenAI with Ollama fallback and a deterministic stub.
+
+    All calls are async and share a single keep-alive HTTP connection pool, so a slow
+    completion never blocks the event loop and many calls can be in flight at once.
+    """
 
     def __init__(self) -> None:
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
         self.openai_model = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
+        # Any OpenAI-compatible endpoint (proxy, local gateway, benchmarks/fake_llm_server.py)
+        self.openai_base_url = os.getenv("OPENAI_BASE_URL") or None
         self.ollama_base_url = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
         self.ollama_model = os.getenv("OLLAMA_MODEL", "llama2")
+        self.ollama_timeout = float(os.getenv("OLLAMA_TIMEOUT", "30"))
+        # Request JSON-constrained output for structured tasks (OpenAI response_format, Ollama format)
+        self.json_mode_enabled = os.getenv("LLM_JSON_MODE", "true").lower() in ("1", "true", "yes")
 
+        # Connection pool sizing for the shared HTTP client
+        self.request_timeout = float(os.getenv("LLM_REQUEST_TIMEOUT", "60"))
+        self.max_connections = int(os.getenv("LLM_MAX_CONNECTIONS", "200"))
+        self.max_keepalive_connections = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "50"))
+
+        self._http_client: Optional[httpx.AsyncClient] = None
         self._openai_client = None
-        if self.openai_api_key and OpenAI is not None:
+
+        self.cache = LLMCache.from_env()
+
+        # Health-aware routing: one breaker per backend, probed in the background while open
+        self.probe_timeout = float(os.getenv("LLM_BREAKER_PROBE_TIMEOUT", "5"))
+        self.breakers: Dict[str, CircuitBreaker] = {
+            "openai": CircuitBreaker.from_env("openai"),
+            "ollama": CircuitBreaker.from_env("ollama"),
+        }
+        self._probe_tasks: Set[asyncio.Task] = set()
+
+        self.singleflight = SingleFlight()
+        self.metrics = LLMMetrics()
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        # Created lazily so the pool is bound to the running event loop
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.request_timeout, connect=5.0),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                ),
+            )
+            self._openai_client = None
+        return self._http_client
+
+    def _get_openai_client(self):
+        if not self.openai_api_key or AsyncOpenAI is None:
+            return None
+        http_client = self._get_http_client()
+        if self._openai_client is None:
             try:
-                self._openai_client = OpenAI(api_key=self.openai_api_key)
+                self._openai_client = AsyncOpenAI(
+                    api_key=self.openai_api_key, base_url=self.openai_base_url, http_client=http_client
+                )
             except Exception:
                 self._openai_client = None
+        return self._openai_client
 
-    def chat(self, messages: List[Dict[str, str]], max_tokens: int = 1000, temperature: float = 0.2) -> str:
-        # Prefer OpenAI if configured
-        if self._openai_client:
+    async def aclose(self) -> None:
+        """Close the shared connection pool (called on application shutdown)."""
+        if self._http_client is not None and not self._http_client.is_closed:
+            await self._http_client.aclose()
+        self._http_client = None
+        self._openai_client = None
+
+    async def chat(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int = 1000,
+        temperature: float = 0.2,
+        use_cache: bool = True,
+        json_mode: bool = False,
+        task: str = "generate",
+    ) -> str:
+        # Identical prompts already in flight share one completion instead of issuing another
+        flight_key = self._request_fingerprint(messages, max_tokens, temperature, use_cache, json_mode)
+        return await self.singleflight.do(
+            flight_key, lambda: self._route_chat(messages, max_tokens, temperature, use_cache, json_mode, task)
+        )
+
+    async def _route_chat(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float,
+        use_cache: bool,
+        json_mode: bool,
+        task: str,
+    ) -> str:
+        if not use_cache:
+            self.cache.record_bypass()
+        json_mode = json_mode and self.json_mode_enabled
+
+        # Prefer OpenAI if configured, then Ollama; providers with an open breaker are skipped
+        for name, model in self._provider_chain():
+            cache_key = LLMCache.make_key(name, model, messages, max_tokens, temperature, json_mode)
+            cached = await self.cache.aget(cache_key) if use_cache else None
+            if cached is not None:
+                self.metrics.record(LLMCallRecord(task, name, model, CACHE_HIT))
+                return cached
+
+            breaker = self.breakers[name]
+            if not breaker.allow_request():
+                self._maybe_probe(name)
+                self._record_skip(task, name, model)
+                continue
+
+            started = time.monotonic()
             try:
-                resp = self._openai_client.chat.completions.create(
-                    model=self.openai_model,
-                    messages=messages,
-                    max_tokens=max_tokens,
-                    temperature=temperature,
-                )
-                return resp.choices[0].message.content or ""
-            except Exception:
-                pass
+                if name == "openai":
+                    content, usage = await self._openai_chat(messages, max_tokens, temperature, json_mode)
+                else:
+                    content, usage = await self._ollama_chat(messages, json_mode)
+            except Exception as exc:
+                latency = time.monotonic() - started
+                breaker.record_failure(latency, f"{type(exc).__name__}: {exc}")
+                self._record_failure(task, name, model, latency, exc)
+                continue
+            latency = time.monotonic() - started
+            breaker.record_success(latency)
+            self.metrics.record(self._completion_record(task, name, model, latency, messages, content, usage))
+            if content:
+                await self.cache.aset(cache_key, content)
+            return content
 
-        # Fallback to Ollama if reachable
-        try:
-            resp = requests.post(
-                f"{self.ollama_base_url}/api/chat",
-                json={"model": self.ollama_model, "messages": messages, "stream": False},
-                timeout=30,
-            )
-            if resp.ok:
-                data = resp.json()
-                # Ollama returns a list of message deltas; consolidate
-                if isinstance(data, dict) and "message" in data:
-                    return data["message"].get("content", "")
-                if isinstance(data, dict) and "choices" in data:
-                    return data["choices"][0]["message"]["content"]
-        except Exception:
-            pass
+        return self._stub_reply(task, messages)
+
+    async def stream(
+        self,
+        messages: List[Dict[str, str]],
+        max_tokens: int = 1000,
+        temperature: float = 0.2,
+        use_cache: bool = True,
+        json_mode: bool = False,
+        task: str = "generate",
+    ) -> AsyncIterator[str]:
+        """Yield completion tokens as they arrive, using the same routing as ``chat``.
+
+        A provider can only be skipped before it has produced output; a failure
+        mid-stream is raised to the caller. Cache hits are yielded as a single chunk.
+        """
+        if not use_cache:
+            self.cache.record_bypass()
+        json_mode = json_mode and self.json_mode_enabled
 
+        for name, model in self._provider_chain():
+            cache_key = LLMCache.make_key(name, model, messages, max_tokens, temperature, json_mode)
+            cached = await self.cache.aget(cache_key) if use_cache else None
+            if cached is not None:
+                self.metrics.record(LLMCallRecord(task, name, model, CACHE_HIT, streamed=True))
+                yield cached
+                return
+
+            breaker = self.breakers[name]
+            if not breaker.allow_request():
+                self._maybe_probe(name)
+                self._record_skip(task, name, model, streamed=True)
+                continue
+
+            started = time.monotonic()
+            first_token_latency: Optional[float] = None
+            parts: List[str] = []
+            usage: Dict[str, int] = {}
+            if name == "openai":
+                tokens = self._openai_stream(messages, max_tokens, temperature, json_mode)
+            else:
+                tokens = self._ollama_stream(messages, json_mode, usage)
+            try:
+                async for token in tokens:
+                    if first_token_latency is None:
+                        first_token_latency = time.monotonic() - started
+                    parts.append(token)
+                    yield token
+            except Exception as exc:
+                latency = time.monotonic() - started
+                breaker.record_failure(latency, f"{type(exc).__name__}: {exc}")
+                self._record_failure(task, name, model, latency, exc, streamed=True, mid_stream=bool(parts))
+                if parts:
+                    raise
+                continue
+            finally:
+                # Release the upstream connection even if our consumer stopped early
+                await tokens.aclose()
+            # Judge streaming health on time-to-first-token, not total generation time
+            breaker.record_success(first_token_latency if first_token_latency is not None else time.monotonic() - started)
+            content = "".join(parts)
+            self.metrics.record(self._completion_record(
+                task, name, model, time.monotonic() - started, messages, content,
+                (usage["prompt"], usage["completion"]) if usage else None, streamed=True,
+            ))
+            if content:
+                await self.cache.aset(cache_key, content)
+            return
+
+        yield self._stub_reply(task, messages, streamed=True)
+
+    def _stub_reply(self, task: str, messages: List[Dict[str, str]], streamed: bool = False) -> str:
         # Last-resort deterministic stub
+        logger.warning("No LLM provider could serve %s request; returning placeholder reply", task)
+        self.metrics.record(LLMCallRecord(task, "stub", None, STUB, streamed=streamed, fallback_reason="providers_exhausted"))
         last_user = next((m for m in reversed(messages) if m.get("role") == "user"), None)
         content = last_user.get("content") if last_user else ""
-        return (
-            "AI service not configured. Here's a helpful placeholder based on your input:\n" + (content or "")
+        return "AI service not configured. Here's a helpful placeholder based on your input:\n" + (content or "")
+
+    def _record_skip(self, task: str, name: str, model: str, streamed: bool = False) -> None:
+        self.metrics.record(LLMCallRecord(
+            task, name, model, SKIPPED, streamed=streamed, fallback_reason=f"{name}:breaker_open"
+        ))
+
+    def _record_failure(
+        self, task: str, name: str, model: str, latency: float, exc: Exception,
+        streamed: bool = False, mid_stream: bool = False,
+    ) -> None:
+        reason = f"{name}:{'stream_interrupted' if mid_stream else type(exc).__name__}"
+        logger.warning("LLM %s call to %s (%s) failed after %.2fs: %s: %s",
+                       task, name, model, latency, type(exc).__name__, exc)
+        self.metrics.record(LLMCallRecord(
+            task, name, model, ERROR, latency, streamed=streamed, fallback_reason=reason
+        ))
+
+    @staticmethod
+    def _completion_record(
+        task: str,
+        name: str,
+        model: str,
+        latency: float,
+        messages: List[Dict[str, str]],
+        content: str,
+        usage: Optional[Tuple[int, int]],
+        streamed: bool = False,
+    ) -> LLMCallRecord:
+        # Prefer the provider's own usage report; otherwise estimate locally
+        if usage is not None:
+            prompt_tokens, completion_tokens = usage
+        else:
+            prompt_tokens = sum(estimate_tokens(m.get("content") or "") for m in messages)
+            completion_tokens = estimate_tokens(content)
+        return LLMCallRecord(
+            task, name, model, OK, latency,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            tokens_estimated=usage is None,
+            streamed=streamed,
+            fallback_reason=None if content else f"{name}:empty_response",
+        )
+
+    def provider_status(self) -> List[Dict[str, Any]]:
+        """Breaker snapshots for each backend, in routing order."""
+        configured = {name for name, _ in self._provider_chain()}
+        models = {"openai": self.openai_model, "ollama": self.ollama_model}
+        return [
+            {**breaker.snapshot(), "model": models[name], "configured": name in configured}
+            for name, breaker in self.breakers.items()
+        ]
+
+    @staticmethod
+    def _request_fingerprint(
+        messages: List[Dict[str, str]], max_tokens: int, temperature: float, use_cache: bool, json_mode: bool
+    ) -> str:
+        payload = json.dumps(
+            [messages, max_tokens, temperature, use_cache, json_mode],
+            sort_keys=True,
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _provider_chain(self) -> List[Tuple[str, str]]:
+        chain: List[Tuple[str, str]] = []
+        if self.openai_api_key and AsyncOpenAI is not None:
+            chain.append(("openai", self.openai_model))
+        chain.append(("ollama", self.ollama_model))
+        return chain
+
+    async def _openai_chat(
+        self, messages: List[Dict[str, str]], max_tokens: int, temperature: float, json_mode: bool
+    ) -> Tuple[str, Optional[Tuple[int, int]]]:
+        openai_client = self._get_openai_client()
+        if openai_client is None:
+            raise RuntimeError("OpenAI client unavailable")
+        resp = await openai_client.chat.completions.create(
+            model=self.openai_model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            **self._openai_format(json_mode),
+        )
+        usage = (resp.usage.prompt_tokens, resp.usage.completion_tokens) if resp.usage else None
+        return resp.choices[0].message.content or "", usage
+
+    async def _ollama_chat(
+        self, messages: List[Dict[str, str]], json_mode: bool
+    ) -> Tuple[str, Optional[Tuple[int, int]]]:
+        resp = await self._get_http_client().post(
+            f"{self.ollama_base_url}/api/chat",
+            json=self._ollama_payload(messages, stream=False, json_mode=json_mode),
+            timeout=self.ollama_timeout,
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        # Ollama returns a list of message deltas; consolidate
+        if isinstance(data, dict) and "message" in data:
+            return data["message"].get("content", ""), self._ollama_usage(data)
+        if isinstance(data, dict) and "choices" in data:
+            return data["choices"][0]["message"]["content"], None
+        raise ValueError("Unexpected Ollama response shape")
+
+    async def _openai_stream(
+        self, messages: List[Dict[str, str]], max_tokens: int, temperature: float, json_mode: bool
+    ) -> AsyncIterator[str]:
+        openai_client = self._get_openai_client()
+        if openai_client is None:
+            raise RuntimeError("OpenAI client unavailable")
+        stream = await openai_client.chat.completions.create(
+            model=self.openai_model,
+            messages=messages,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            stream=True,
+            **self._openai_format(json_mode),
         )
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+
+    async def _ollama_stream(
+        self, messages: List[Dict[str, str]], json_mode: bool, usage: Dict[str, int]
+    ) -> AsyncIterator[str]:
+        # Ollama streams newline-delimited JSON objects, each carrying a message delta
+        async with self._get_http_client().stream(
+            "POST",
+            f"{self.ollama_base_url}/api/chat",
+            json=self._ollama_payload(messages, stream=True, json_mode=json_mode),
+            timeout=self.ollama_timeout,
+        ) as resp:
+            resp.raise_for_status()
+            async for line in resp.aiter_lines():
+                if not line.strip():
+                    continue
+                data = json.loads(line)
+                if data.get("error"):
+                    raise RuntimeError(data["error"])
+                content = (data.get("message") or {}).get("content")
+                if content:
+                    yield content
+                if data.get("done"):
+                    counts = self._ollama_usage(data)
+                    if counts is not None:
+                        usage["prompt"], usage["completion"] = counts
+                    break
+
+    @staticmethod
+    def _ollama_usage(data: Dict[str, Any]) -> Optional[Tuple[int, int]]:
+        # Final Ollama messages report prompt_eval_count / eval_count
+        if "eval_count" not in data:
+            return None
+        return int(data.get("prompt_eval_count") or 0), int(data["eval_count"])
+
+    @staticmethod
+    def _openai_format(json_mode: bool) -> Dict[str, Any]:
+        # JSON mode constrains decoding to a single syntactically valid object
+        return {"response_format": {"type": "json_object"}} if json_mode else {}
+
+    def _ollama_payload(self, messages: List[Dict[str, str]], stream: bool, json_mode: bool) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {"model": self.ollama_model, "messages": messages, "stream": stream}
+        if json_mode:
+            payload["format"] = "json"
+        return payload
+
+    def _maybe_probe(self, name: str) -> None:
+        """Start a background half-open probe once the breaker's cool-down has elapsed."""
+        if not self.breakers[name].try_begin_probe():
+            return
+        task = asyncio.get_running_loop().create_task(self._probe(name))
+        # Keep a reference so the task isn't garbage-collected mid-flight
+        self._probe_tasks.add(task)
+        task.add_done_callback(self._probe_tasks.discard)
+
+    async def _probe(self, name: str) -> None:
+        breaker = self.breakers[name]
+        try:
+            if name == "openai":
+                openai_client = self._get_openai_client()
+                if openai_client is None:
+                    raise RuntimeError("OpenAI client unavailable")
+                await openai_client.with_options(timeout=self.probe_timeout).models.list()
+            else:
+                resp = await self._get_http_client().get(
+                    f"{self.ollama_base_url}/api/tags", timeout=self.probe_timeout
+                )
+                resp.raise_for_status()
+        except Exception as exc:
+            breaker.end_probe(False, f"{type(exc).__name__}: {exc}")
+            return
+        breaker.end_probe(True)
+
+
+def _unique(items: List[Any]) -> List[Any]:
+    """De-duplicate while keeping first-seen order; dicts and strings compare case-insensitively."""
+    seen = set()
+    result = []
+    for item in items:
+        key = json.dumps(item, sort_keys=True, default=str).lower()
+        if key not in seen:
+            seen.add(key)
+            result.append(item)
+    return result
 
 
 class AIClient:
-    """AI client with OpenAI primary, Ollama fallback, and stub as last resort."""
+    """Async AI client with OpenAI primary, Ollama fallback, and stub as last resort."""
 
     def __init__(self) -> None:
         self._llm = _LLMProvider()
+        # Documents longer than this are analyzed in parallel chunks and merged
+        self.chunk_tokens = int(os.getenv("LLM_CHUNK_TOKENS", "2500"))
+        self.job_description_tokens = int(os.getenv("LLM_JOB_DESCRIPTION_TOKENS", "1500"))
+
+    async def aclose(self) -> None:
+        await self._llm.aclose()
+
+    @property
+    def cache(self) -> LLMCache:
+        return self._llm.cache
+
+    def provider_status(self) -> List[Dict[str, Any]]:
+        return self._llm.provider_status()
+
+    def coalescing_stats(self) -> Dict[str, Any]:
+        return self._llm.singleflight.stats()
+
+    @property
+    def metrics(self) -> LLMMetrics:
+        return self._llm.metrics
+
+    def _unparseable(self, task: str, exc: Exception) -> None:
+        # The caller falls back to heuristics; make that visible rather than silent
+        logger.warning("Could not parse %s response from model: %s: %s", task, type(exc).__name__, exc)
+        self._llm.metrics.record_fallback(f"{task}:unparseable_response")
 
     # General chat helpers
-    def chat_response(self, message: str, conversation_history: Optional[List[Dict[str, str]]] = None) -> str:
+    async def chat_response(
+        self,
+        message: str,
+        conversation_history: Optional[List[Dict[str, str]]] = None,
+        use_cache: bool = True,
+    ) -> str:
         conversation_history = conversation_history or []
         messages = [m for m in conversation_history]
         messages.append({"role": "user", "content": message})
-        return self._llm.chat(messages, max_tokens=400)
+        return await self._llm.chat(messages, max_tokens=400, use_cache=use_cache, task="chat")
+
+    async def generate_response(
+        self, messages: List[Dict[str, str]], max_tokens: int = 1500, use_cache: bool = True, task: str = "generate"
+    ) -> str:
+        return await self._llm.chat(messages, max_tokens=max_tokens, use_cache=use_cache, task=task)
+
+    def stream_chat_response(
+        self,
+        message: str,
+        conversation_history: Optional[List[Dict[str, str]]] = None,
+        use_cache: bool = True,
+    ) -> AsyncIterator[str]:
+        messages = list(conversation_history or [])
+        messages.append({"role": "user", "content": message})
+        return self._llm.stream(messages, max_tokens=400, use_cache=use_cache, task="chat")
 
-    def generate_response(self, messages: List[Dict[str, str]], max_tokens: int = 1500) -> str:
-        return self._llm.chat(messages, max_tokens=max_tokens)
+    def stream_generate_response(
+        self, messages: List[Dict[str, str]], max_tokens: int = 1500, use_cache: bool = True, task: str = "generate"
+    ) -> AsyncIterator[str]:
+        return self._llm.stream(messages, max_tokens=max_tokens, use_cache=use_cache, task=task)
 
     # Resume analysis
-    def analyze_resume(self, resume_text: str, job_title: Optional[str] = None) -> Dict[str, Any]:
+    async def analyze_resume(self, resume_text: str, job_title: Optional[str] = None, use_cache: bool = True) -> Dict[str, Any]:
+        chunks = chunk_text(resume_text, self.chunk_tokens)
+        if len(chunks) == 1:
+            raw = await self._llm.chat(
+                self._analysis_messages(resume_text, job_title),
+                max_tokens=800,
+                use_cache=use_cache,
+                json_mode=True,
+                task="analyze",
+            )
+            data = self._parse_analysis(raw)
+        else:
+            # Map: analyze each section-aligned chunk in parallel; reduce: merge the partial results
+            raws = await asyncio.gather(*[
+                self._llm.chat(
+                    self._analysis_messages(chunk, job_title, part=(i + 1, len(chunks))),
+                    max_tokens=800,
+                    use_cache=use_cache,
+                    json_mode=True,
+                    task="analyze",
+                )
+                for i, chunk in enumerate(chunks)
+            ])
+            partials = [
+                (parsed, estimate_tokens(chunk))
+                for parsed, chunk in zip(map(self._parse_analysis, raws), chunks)
+                if parsed is not None
+            ]
+            data = self._merge_analyses(partials) if partials else None
+
+        if data is not None:
+            return data
+
+        # Basic heuristic fallback
+        word_count = len(resume_text.split())
+        strengths: List[Dict[str, Any]] = []
+        weaknesses: List[Dict[str, Any]] = []
+        recommendations: List[str] = []
+        if word_count >= 300:
+            strengths.append({"category": "Length", "description": "Adequate detail", "impact": "medium"})
+        else:
+            weaknesses.append({"category": "Length", "description": "Too short", "impact": "medium"})
+            recommendations.append("Add accomplishment-focused bullet points with metrics")
+        return {
+            "overall_score": 60.0,
+            "strengths": strengths,
+            "weaknesses": weaknesses,
+            "recommendations": recommendations,
+            "summary": f"Analysis for {job_title or 'resume'} completed.",
+        }
+
+    @staticmethod
+    def _analysis_messages(
+        resume_text: str, job_title: Optional[str], part: Optional[Tuple[int, int]] = None
+    ) -> List[Dict[str, str]]:
         system = (
             "You are an expert resume analyst. Return a concise JSON object with keys: "
             "overall_score (0-100), strengths (list of {category, description, impact}), "
@@ -89,20 +568,21 @@ class AIClient:
             "Be practical, specific, and ATS-aware."
         )
         user = f"""
-Resume:
+Resume{AIClient._part_note(part)}:
 {resume_text}
 
 Target role: {job_title or 'N/A'}
 
 Return ONLY JSON, no markdown.
 """
-        raw = self._llm.chat([
+        return [
             {"role": "system", "content": system},
             {"role": "user", "content": user},
-        ], max_tokens=800)
+        ]
 
+    def _parse_analysis(self, raw: str) -> Optional[Dict[str, Any]]:
         try:
-            data = json.loads(self._extract_json(raw))
+            data = self._parse_json_object(raw)
             # Minimal validation and fallback defaults
             return {
                 "overall_score": float(data.get("overall_score", 65)),
@@ -111,27 +591,81 @@ Return ONLY JSON, no markdown.
                 "recommendations": data.get("recommendations", []),
                 "summary": data.get("summary", "Resume analysis completed."),
             }
-        except Exception:
-            # Basic heuristic fallback
-            word_count = len(resume_text.split())
-            strengths: List[Dict[str, Any]] = []
-            weaknesses: List[Dict[str, Any]] = []
-            recommendations: List[str] = []
-            if word_count >= 300:
-                strengths.append({"category": "Length", "description": "Adequate detail", "impact": "medium"})
-            else:
-                weaknesses.append({"category": "Length", "description": "Too short", "impact": "medium"})
-                recommendations.append("Add accomplishment-focused bullet points with metrics")
-            return {
-                "overall_score": 60.0,
-                "strengths": strengths,
-                "weaknesses": weaknesses,
-                "recommendations": recommendations,
-                "summary": f"Analysis for {job_title or 'resume'} completed.",
-            }
+        except Exception as exc:
+            self._unparseable("analyze", exc)
+            return None
+
+    @staticmethod
+    def _merge_analyses(partials: List[Tuple[Dict[str, Any], int]]) -> Dict[str, Any]:
+        """Combine per-chunk analyses; the score is weighted by chunk size."""
+        total_weight = sum(weight for _, weight in partials) or 1
+        return {
+            "overall_score": round(sum(p["overall_score"] * weight for p, weight in partials) / total_weight, 1),
+            "strengths": _unique([item for p, _ in partials for item in p["strengths"]]),
+            "weaknesses": _unique([item for p, _ in partials for item in p["weaknesses"]]),
+            "recommendations": _unique([item for p, _ in partials for item in p["recommendations"]]),
+            "summary": " ".join(_unique([p["summary"] for p, _ in partials if p.get("summary")])),
+        }
 
     # Resume tailoring
-    def tailor_resume(self, resume_text: str, job_description: str, job_title: str, company_name: Optional[str] = None) -> Dict[str, Any]:
+    async def tailor_resume(
+        self,
+        resume_text: str,
+        job_description: str,
+        job_title: str,
+        company_name: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> Dict[str, Any]:
+        chunks = chunk_text(resume_text, self.chunk_tokens)
+        job_description = truncate_to_tokens(job_description, self.job_description_tokens)
+        if len(chunks) == 1:
+            messages = self._tailoring_messages(resume_text, job_description, job_title, company_name)
+            raw = await self._llm.chat(messages, max_tokens=1200, use_cache=use_cache, json_mode=True, task="tailor")
+            return self.parse_tailoring(raw, resume_text, job_title)
+
+        # Each chunk is rewritten independently and stitched back together in order
+        raws = await asyncio.gather(*[
+            self._llm.chat(
+                self._tailoring_messages(chunk, job_description, job_title, company_name, part=(i + 1, len(chunks))),
+                max_tokens=1200,
+                use_cache=use_cache,
+                json_mode=True,
+                task="tailor",
+            )
+            for i, chunk in enumerate(chunks)
+        ])
+        partials = [self._parse_tailoring_data(raw) for raw in raws]
+        if all(p is None for p in partials):
+            return self.parse_tailoring("", resume_text, job_title)
+        return {
+            "tailored_resume": "\n\n".join(
+                (p or {}).get("tailored_resume") or chunk for p, chunk in zip(partials, chunks)
+            ),
+            "changes_made": _unique([item for p in partials if p for item in p.get("changes_made", [])]),
+            "keyword_matches": _unique([item for p in partials if p for item in p.get("keyword_matches", [])]),
+        }
+
+    def stream_tailor_resume(
+        self,
+        resume_text: str,
+        job_description: str,
+        job_title: str,
+        company_name: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> AsyncIterator[str]:
+        """Stream the raw tailoring completion; pass the joined text to ``parse_tailoring``."""
+        job_description = truncate_to_tokens(job_description, self.job_description_tokens)
+        messages = self._tailoring_messages(resume_text, job_description, job_title, company_name)
+        return self._llm.stream(messages, max_tokens=1200, use_cache=use_cache, json_mode=True, task="tailor")
+
+    @staticmethod
+    def _tailoring_messages(
+        resume_text: str,
+        job_description: str,
+        job_title: str,
+        company_name: Optional[str],
+        part: Optional[Tuple[int, int]] = None,
+    ) -> List[Dict[str, str]]:
         system = (
             "You are a resume rewriting assistant. Rewrite the resume to target the job while preserving truthfulness. "
             "Return JSON with: tailored_resume (string), changes_made (list of strings), keyword_matches (list of strings). "
@@ -144,32 +678,80 @@ Company: {company_name or 'N/A'}
 Job Description:
 {job_description}
 
-Original Resume:
+Original Resume{AIClient._part_note(part)}:
 {resume_text}
 
 Return ONLY JSON, no markdown.
 """
-        raw = self._llm.chat([
+        return [
             {"role": "system", "content": system},
             {"role": "user", "content": user},
-        ], max_tokens=1200)
+        ]
+
+    def parse_tailoring(self, raw: str, resume_text: str, job_title: str) -> Dict[str, Any]:
+        data = self._parse_tailoring_data(raw)
+        if data is not None:
+            if not data["tailored_resume"]:
+                data["tailored_resume"] = resume_text
+            return data
+        # Conservative fallback: append keyword emphasis
+        return {
+            "tailored_resume": resume_text + f"\n\n[Tailored for {job_title} - keywords emphasized]",
+            "changes_made": ["Emphasized role-specific keywords", "Improved alignment with job requirements"],
+            "keyword_matches": [],
+        }
+
+    def _parse_tailoring_data(self, raw: str) -> Optional[Dict[str, Any]]:
         try:
-            data = json.loads(self._extract_json(raw))
+            data = self._parse_json_object(raw)
             return {
-                "tailored_resume": data.get("tailored_resume", resume_text),
+                "tailored_resume": data.get("tailored_resume", ""),
                 "changes_made": data.get("changes_made", []),
                 "keyword_matches": data.get("keyword_matches", []),
             }
-        except Exception:
-            # Conservative fallback: append keyword emphasis
-            return {
-                "tailored_resume": resume_text + f"\n\n[Tailored for {job_title} - keywords emphasized]",
-                "changes_made": ["Emphasized role-specific keywords", "Improved alignment with job requirements"],
-                "keyword_matches": [],
-            }
+        except Exception as exc:
+            self._unparseable("tailor", exc)
+            return None
 
     # ATS feedback
-    def ats_feedback(self, resume_text: str, job_description: str, ats_system: Optional[str] = None) -> Dict[str, Any]:
+    async def ats_feedback(
+        self,
+        resume_text: str,
+        job_description: str,
+        ats_system: Optional[str] = None,
+        use_cache: bool = True,
+    ) -> Dict[str, Any]:
+        chunks = chunk_text(resume_text, self.chunk_tokens)
+        job_description = truncate_to_tokens(job_description, self.job_description_tokens)
+        raws = await asyncio.gather(*[
+            self._llm.chat(
+                self._ats_messages(
+                    chunk, job_description, ats_system, part=(i + 1, len(chunks)) if len(chunks) > 1 else None
+                ),
+                max_tokens=900,
+                use_cache=use_cache,
+                json_mode=True,
+                task="ats",
+            )
+            for i, chunk in enumerate(chunks)
+        ])
+        partials = [p for p in map(self._parse_ats, raws) if p is not None]
+        if len(partials) == 1:
+            return partials[0]
+        if partials:
+            return self._merge_ats(partials)
+        return {
+            "ats_score": 0.0,
+            "keyword_matches": [],
+            "missing_keywords": [],
+            "formatting_issues": ["Unable to run AI-based ATS analysis"],
+            "recommendations": ["Add relevant keywords from the job description"],
+        }
+
+    @staticmethod
+    def _ats_messages(
+        resume_text: str, job_description: str, ats_system: Optional[str], part: Optional[Tuple[int, int]] = None
+    ) -> List[Dict[str, str]]:
         system = (
             "You are an ATS optimization expert. Compare resume to job description. "
             "Return JSON with: ats_score (0-100), keyword_matches (list), missing_keywords (list), "
@@ -181,17 +763,19 @@ ATS: {ats_system or 'generic'}
 Job Description:
 {job_description}
 
-Resume:
+Resume{AIClient._part_note(part)}:
 {resume_text}
 
 Return ONLY JSON, no markdown.
 """
-        raw = self._llm.chat([
+        return [
             {"role": "system", "content": system},
             {"role": "user", "content": user},
-        ], max_tokens=900)
+        ]
+
+    def _parse_ats(self, raw: str) -> Optional[Dict[str, Any]]:
         try:
-            data = json.loads(self._extract_json(raw))
+            data = self._parse_json_object(raw)
             return {
                 "ats_score": float(data.get("ats_score", 0)),
                 "keyword_matches": data.get("keyword_matches", []),
@@ -199,26 +783,42 @@ Return ONLY JSON, no markdown.
                 "formatting_issues": data.get("formatting_issues", []),
                 "recommendations": data.get("recommendations", []),
             }
-        except Exception:
-            return {
-                "ats_score": 0.0,
-                "keyword_matches": [],
-                "missing_keywords": [],
-                "formatting_issues": ["Unable to run AI-based ATS analysis"],
-                "recommendations": ["Add relevant keywords from the job description"],
-            }
+        except Exception as exc:
+            self._unparseable("ats", exc)
+            return None
+
+    @staticmethod
+    def _merge_ats(partials: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """A keyword found in any chunk counts as matched; the score becomes keyword coverage."""
+        matched = _unique([kw for p in partials for kw in p["keyword_matches"]])
+        matched_lower = {str(kw).lower() for kw in matched}
+        missing = [kw for kw in _unique([kw for p in partials for kw in p["missing_keywords"]])
+                   if str(kw).lower() not in matched_lower]
+        if matched or missing:
+            score = 100.0 * len(matched) / (len(matched) + len(missing))
+        else:
+            score = sum(p["ats_score"] for p in partials) / len(partials)
+        return {
+            "ats_score": round(score, 1),
+            "keyword_matches": matched,
+            "missing_keywords": missing,
+            "formatting_issues": _unique([item for p in partials for item in p["formatting_issues"]]),
+            "recommendations": _unique([item for p in partials for item in p["recommendations"]]),
+        }
+
+    @staticmethod
+    def _part_note(part: Optional[Tuple[int, int]]) -> str:
+        if not part:
+            return ""
+        return f" (part {part[0]} of {part[1]}; assess only this part)"
 
     @staticmethod
-    def _extract_json(text: str) -> str:
-        # If model wraps JSON in extra text, try to find the JSON object boundaries
-        text = text.strip()
-        if text.startswith("{") and text.endswith("}"):
-            return text
-        start = text.find("{")
-        end = text.rfind("}")
-        if start != -1 and end != -1 and end > start:
-            return text[start : end + 1]
-        return text
+    def _parse_json_object(raw: str) -> Dict[str, Any]:
+        # Tolerates surrounding prose, trailing garbage and truncated output
+        data = parse_json_tolerant(raw)
+        if not isinstance(data, dict):
+            raise ValueError("Expected a JSON object")
+        return data
 
 
 ai_client = AIClient()
@@ -0,0 +1,201 @@
+"""
+Bulk resume uploads: several files and/or ZIP archives in one request.
+
+Every part is spooled to a temp file first (see upload_spool), then ZIP archives are
+expanded member by member into temp files of their own, each hashed on the way so the
+extraction cache applies to them like to single uploads. Problems with one file
+(unsupported type, oversized or encrypted member, broken archive) become an error on
+that entry instead of failing the whole request.
+"""
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+import hashlib
+import os
+import tempfile
+import zipfile
+
+from fastapi import HTTPException, UploadFile
+from starlette.concurrency import run_in_threadpool
+
+from app.utils.upload_spool import (
+    MAX_UPLOAD_BYTES,
+    UPLOAD_CHUNK_BYTES,
+    UPLOAD_SPOOL_DIR,
+    SpooledUpload,
+    _unlink,
+    discard,
+    spool_to_temp,
+)
+
+
+RESUME_EXTENSIONS = (".pdf", ".docx", ".doc")
+ARCHIVE_EXTENSIONS = (".zip",)
+
+# Whole request body (all parts together), and resumes per request after expanding archives
+BULK_UPLOAD_MAX_BYTES = int(os.getenv("BULK_UPLOAD_MAX_BYTES", str(100 * 1024 * 1024)))
+BULK_UPLOAD_MAX_FILES = int(os.getenv("BULK_UPLOAD_MAX_FILES", "200"))
+
+
+@dataclass
+class BulkUploadFile:
+    """One resume in a bulk upload: a spooled file ready to extract, or the reason it isn't"""
+
+    file_name: str
+    file_type: str
+    size: Optional[int] = None
+    # Name of the ZIP archive the file came from, if any
+    archive: Optional[str] = None
+    spooled: Optional[SpooledUpload] = None
+    error: Optional[str] = None
+
+
+async def collect_bulk_files(
+    uploads: List[UploadFile],
+    max_files: int = BULK_UPLOAD_MAX_FILES,
+    max_file_bytes: int = MAX_UPLOAD_BYTES,
+) -> List[BulkUploadFile]:
+    """Spool every upload and expand archives; the caller must discard_bulk_files() the result.
+
+    Raises:
+        HTTPException: If the request holds more than ``max_files`` resumes
+    """
+    entries: List[BulkUploadFile] = []
+    try:
+        for upload in uploads:
+            file_name = upload.filename or ""
+            file_type = os.path.splitext(file_name)[1].lower()
+            if file_type not in RESUME_EXTENSIONS + ARCHIVE_EXTENSIONS:
+                entries.append(BulkUploadFile(file_name, file_type, error=_unsupported_detail(file_type)))
+                continue
+
+            archive_limit = BULK_UPLOAD_MAX_BYTES if file_type in ARCHIVE_EXTENSIONS else max_file_bytes
+            try:
+                spooled = await spool_to_temp(upload, archive_limit)
+            except HTTPException as exc:
+                entries.append(BulkUploadFile(file_name, file_type, error=str(exc.detail)))
+                continue
+
+            if file_type in RESUME_EXTENSIONS:
+                entries.append(BulkUploadFile(file_name, file_type, size=spooled.size, spooled=spooled))
+            else:
+                try:
+                    # Decompression is CPU work; keep it off the event loop
+                    entries.extend(await run_in_threadpool(
+                        expand_zip, spooled, max_files - _resume_count(entries), max_file_bytes
+                    ))
+                finally:
+                    discard(spooled)
+            if _resume_count(entries) > max_files:
+                raise _too_many_files(max_files)
+    except BaseException:
+        discard_bulk_files(entries)
+        raise
+    return entries
+
+
+def expand_zip(archive: SpooledUpload, max_files: int, max_file_bytes: int = MAX_UPLOAD_BYTES) -> List[BulkUploadFile]:
+    """Copy the resumes inside a spooled ZIP archive to temp files, one entry per member
+
+    Directories, macOS resource forks and hidden files are skipped. Members are read in
+    chunks and cut off at ``max_file_bytes`` whatever their header claims.
+
+    Raises:
+        HTTPException: If the archive holds more than ``max_files`` resumes
+    """
+    entries: List[BulkUploadFile] = []
+    try:
+        with zipfile.ZipFile(archive.path) as zf:
+            members = [info for info in zf.infolist() if not _skip_member(info)]
+            if sum(1 for info in members if _member_type(info) in RESUME_EXTENSIONS) > max_files:
+                raise _too_many_files(max_files)
+            for info in members:
+                entries.append(_expand_member(zf, info, archive.file_name, max_file_bytes))
+    except (zipfile.BadZipFile, zipfile.LargeZipFile, OSError) as e:
+        discard_bulk_files(entries)
+        return [BulkUploadFile(archive.file_name, ".zip", size=archive.size, error=f"Invalid ZIP archive: {str(e)}")]
+    except BaseException:
+        discard_bulk_files(entries)
+        raise
+    return entries
+
+
+def discard_bulk_files(entries: List[BulkUploadFile]) -> None:
+    for entry in entries:
+        if entry.spooled is not None:
+            discard(entry.spooled)
+
+
+def _expand_member(zf: zipfile.ZipFile, info: zipfile.ZipInfo, archive_name: str, max_file_bytes: int) -> BulkUploadFile:
+    file_name = os.path.basename(info.filename)
+    file_type = _member_type(info)
+    entry = BulkUploadFile(file_name, file_type, size=info.file_size, archive=archive_name)
+    if file_type in ARCHIVE_EXTENSIONS:
+        entry.error = "Nested archives are not supported."
+    elif file_type not in RESUME_EXTENSIONS:
+        entry.error = _unsupported_detail(file_type)
+    elif info.flag_bits & 0x1:
+        entry.error = "Encrypted archive members are not supported."
+    elif info.file_size > max_file_bytes:
+        entry.error = _member_too_large_detail(max_file_bytes)
+    else:
+        entry.spooled, entry.error = _spool_member(zf, info, file_name, max_file_bytes)
+        if entry.spooled is not None:
+            entry.size = entry.spooled.size
+    return entry
+
+
+def _spool_member(
+    zf: zipfile.ZipFile, info: zipfile.ZipInfo, file_name: str, max_file_bytes: int
+) -> Tuple[Optional[SpooledUpload], Optional[str]]:
+    fd, path = tempfile.mkstemp(prefix="upload-", suffix=_member_type(info), dir=UPLOAD_SPOOL_DIR)
+    written = 0
+    digest = hashlib.sha256()
+    error = None
+    try:
+        with os.fdopen(fd, "wb") as out, zf.open(info) as member:
+            while True:
+                chunk = member.read(UPLOAD_CHUNK_BYTES)
+                if not chunk:
+                    break
+                written += len(chunk)
+                if written > max_file_bytes:
+                    # The header understated the size (or lied outright)
+                    error = _member_too_large_detail(max_file_bytes)
+                    break
+                digest.update(chunk)
+                out.write(chunk)
+    except (zipfile.BadZipFile, OSError, EOFError) as e:
+        error = f"Could not read file from archive: {str(e)}"
+    except BaseException:
+        _unlink(path)
+        raise
+    if error:
+        _unlink(path)
+        return None, error
+    return SpooledUpload(path=path, file_name=file_name, size=written, sha256=digest.hexdigest()), None
+
+
+def _skip_member(info: zipfile.ZipInfo) -> bool:
+    name = info.filename
+    base = os.path.basename(name.rstrip("/"))
+    return info.is_dir() or name.startswith("__MACOSX/") or base.startswith(".") or not base
+
+
+def _member_type(info: zipfile.ZipInfo) -> str:
+    return os.path.splitext(info.filename)[1].lower()
+
+
+def _resume_count(entries: List[BulkUploadFile]) -> int:
+    return sum(1 for entry in entries if entry.file_type in RESUME_EXTENSIONS)
+
+
+def _too_many_files(max_files: int) -> HTTPException:
+    return HTTPException(status_code=400, detail=f"Too many files. Upload at most {max_files} resumes per request.")
+
+
+def _unsupported_detail(file_type: str) -> str:
+    return f"Unsupported file format: {file_type or 'none'}. Supported formats: .pdf, .docx, .zip"
+
+
+def _member_too_large_detail(limit: int) -> str:
+    return f"File size too large. Files must be smaller than {limit // (1024 * 1024)}MB."
@@ -0,0 +1,153 @@
+"""
+Token-aware splitting of long resumes and job descriptions for map-reduce LLM calls
+"""
+from typing import List
+import math
+import re
+
+try:
+    import tiktoken
+except Exception:  # pragma: no cover
+    tiktoken = None  # type: ignore
+
+
+# Resume / job description section headings we split on
+_SECTION_NAMES = (
+    r"professional summary|summary|objective|profile|about me|"
+    r"work experience|professional experience|experience|employment history|work history|"
+    r"education|academic background|"
+    r"technical skills|skills|core competencies|competencies|"
+    r"projects|certifications|certificates|awards|achievements|publications|"
+    r"volunteer experience|volunteering|languages|interests|references|"
+    r"responsibilities|requirements|qualifications|preferred qualifications|benefits|about us|about the role"
+)
+
+# Heading on its own line, optionally followed by a colon
+_LINE_HEADING_RE = re.compile(rf"(?im)^[ \t]*(?:{_SECTION_NAMES})[ \t]*:?[ \t]*$")
+
+# Headings inside whitespace-collapsed text: ALL CAPS names, or any case followed by a colon
+_INLINE_HEADING_RE = re.compile(rf"(?<!\w)(?:(?:{_SECTION_NAMES.upper()})(?!\w)|(?i:{_SECTION_NAMES}):)")
+
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+_SENTENCE_RE = re.compile(r"(?<=[.!?;])\s+")
+
+_encoding = None
+
+
+def estimate_tokens(text: str) -> int:
+    """Token count via tiktoken when installed, else the ~4 characters per token rule of thumb."""
+    if not text:
+        return 0
+    encoding = _get_encoding()
+    if encoding is not None:
+        try:
+            return len(encoding.encode(text, disallowed_special=()))
+        except Exception:
+            pass
+    return math.ceil(len(text) / 4)
+
+
+def _get_encoding():
+    global _encoding
+    if _encoding is None and tiktoken is not None:
+        try:
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            return None
+    return _encoding
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Keep the head of ``text`` that fits in ``max_tokens``, cut at a word boundary."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    # Binary search on character length; token estimates are monotonic in prefix length
+    low, high = 0, len(text)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if estimate_tokens(text[:mid]) <= max_tokens:
+            low = mid
+        else:
+            high = mid - 1
+    head = text[:low]
+    cut = head.rfind(" ")
+    if cut > low // 2:
+        head = head[:cut]
+    return head.rstrip()
+
+
+def split_sections(text: str) -> List[str]:
+    """Split a document at recognised section headings, keeping each heading with its body."""
+    starts = [m.start() for m in _LINE_HEADING_RE.finditer(text)]
+    if not starts:
+        # Extracted text is often whitespace-collapsed onto one line
+        starts = [m.start() for m in _INLINE_HEADING_RE.finditer(text)]
+    if not starts:
+        return [text.strip()] if text.strip() else []
+
+    bounds = ([0] if starts[0] > 0 else []) + starts + [len(text)]
+    sections = [text[a:b].strip() for a, b in zip(bounds, bounds[1:])]
+    return [section for section in sections if section]
+
+
+def chunk_text(text: str, max_tokens: int) -> List[str]:
+    """Split ``text`` into chunks of at most ``max_tokens``, preferring section boundaries.
+
+    Consecutive small sections are packed together; oversized sections are split by
+    paragraphs, then lines, then sentences, then words.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return [text]
+
+    pieces: List[str] = []
+    for section in split_sections(text):
+        pieces.extend(_split_oversized(section, max_tokens))
+    return _pack(pieces, max_tokens, "\n\n")
+
+
+def _split_oversized(text: str, max_tokens: int, level: int = 0) -> List[str]:
+    if estimate_tokens(text) <= max_tokens:
+        return [text]
+    splitters = (
+        (_PARAGRAPH_RE, "\n\n"),
+        (re.compile(r"\n"), "\n"),
+        (_SENTENCE_RE, " "),
+        (re.compile(r"\s+"), " "),
+    )
+    for depth in range(level, len(splitters)):
+        pattern, joiner = splitters[depth]
+        parts = [part for part in pattern.split(text) if part.strip()]
+        if len(parts) > 1:
+            pieces: List[str] = []
+            for part in parts:
+                pieces.extend(_split_oversized(part, max_tokens, depth + 1))
+            return _pack(pieces, max_tokens, joiner)
+    # A single unbreakable run: hard-cut it
+    head = truncate_to_tokens(text, max_tokens) or text[: max_tokens * 4]
+    rest = text[len(head):].strip()
+    return [head] + (_split_oversized(rest, max_tokens, len(splitters)) if rest else [])
+
+
+def _pack(pieces: List[str], max_tokens: int, joiner: str) -> List[str]:
+    # Sizes are added up per piece rather than re-estimated on the growing chunk. Without
+    # tiktoken they are counted in characters, joiners included, which is exactly what
+    # estimate_tokens would say for the joined chunk. With tiktoken each piece is counted
+    # together with its joiner, since " word" is usually a single token.
+    if _get_encoding() is None:
+        measure, budget = len, max_tokens * 4
+    else:
+        measure, budget = estimate_tokens, max_tokens
+    chunks: List[str] = []
+    current: List[str] = []
+    used = 0
+    for piece in pieces:
+        size = measure(joiner + piece) if current else measure(piece)
+        if current and used + size > budget:
+            chunks.append(joiner.join(current))
+            current, used = [], 0
+            size = measure(piece)
+        current.append(piece)
+        used += size
+    if current:
+        chunks.append(joiner.join(current))
+    return chunks
@@ -0,0 +1,156 @@
+"""
+Rolling-window circuit breaker used to route around unhealthy LLM providers.
+"""
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+import os
+import threading
+import time
+
+
+class CircuitBreaker:
+    """Per-provider circuit breaker tracking error rate and latency over a time window.
+
+    closed    -> calls flow; opens when the failure or slow-call rate crosses its threshold
+    open      -> calls are skipped immediately until the cool-down elapses
+    half_open -> a single background probe decides whether to close or re-open
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        window_seconds: float = 60.0,
+        min_calls: int = 5,
+        failure_rate_threshold: float = 0.5,
+        slow_call_seconds: float = 10.0,
+        slow_call_rate_threshold: float = 0.8,
+        open_seconds: float = 30.0,
+    ) -> None:
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.open_seconds = open_seconds
+
+        self.state = self.CLOSED
+        self.opened_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.times_opened = 0
+        self.rejected_calls = 0
+
+        # (timestamp, succeeded, latency_seconds)
+        self._calls: Deque[Tuple[float, bool, float]] = deque()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, name: str) -> "CircuitBreaker":
+        return cls(
+            name,
+            window_seconds=float(os.getenv("LLM_BREAKER_WINDOW_SECONDS", "60")),
+            min_calls=int(os.getenv("LLM_BREAKER_MIN_CALLS", "5")),
+            failure_rate_threshold=float(os.getenv("LLM_BREAKER_FAILURE_RATE", "0.5")),
+            slow_call_seconds=float(os.getenv("LLM_BREAKER_SLOW_CALL_SECONDS", "10")),
+            slow_call_rate_threshold=float(os.getenv("LLM_BREAKER_SLOW_CALL_RATE", "0.8")),
+            open_seconds=float(os.getenv("LLM_BREAKER_OPEN_SECONDS", "30")),
+        )
+
+    def allow_request(self) -> bool:
+        """Return True if live traffic may be sent to this provider."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            self.rejected_calls += 1
+            return False
+
+    def try_begin_probe(self) -> bool:
+        """Move an open breaker whose cool-down has elapsed to half-open.
+
+        Returns True exactly once per cool-down; the caller is then responsible for
+        running a probe and reporting it through ``end_probe``.
+        """
+        with self._lock:
+            if self.state != self.OPEN or self.opened_at is None:
+                return False
+            if time.monotonic() - self.opened_at < self.open_seconds:
+                return False
+            self.state = self.HALF_OPEN
+            return True
+
+    def end_probe(self, succeeded: bool, error: Optional[str] = None) -> None:
+        with self._lock:
+            if succeeded:
+                self.state = self.CLOSED
+                self.opened_at = None
+                self._calls.clear()
+            else:
+                self.last_error = error or self.last_error
+                self._open()
+
+    def record_success(self, latency: float) -> None:
+        self._record(True, latency, None)
+
+    def record_failure(self, latency: float, error: Optional[str] = None) -> None:
+        self._record(False, latency, error)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            self._prune(now)
+            calls, failures, slow = self._counts()
+            latencies = [latency for _, _, latency in self._calls]
+            return {
+                "name": self.name,
+                "state": self.state,
+                "window_seconds": self.window_seconds,
+                "calls": calls,
+                "failures": failures,
+                "slow_calls": slow,
+                "failure_rate": round(failures / calls, 4) if calls else 0.0,
+                "avg_latency_seconds": round(sum(latencies) / calls, 4) if calls else 0.0,
+                "max_latency_seconds": round(max(latencies), 4) if calls else 0.0,
+                "rejected_calls": self.rejected_calls,
+                "times_opened": self.times_opened,
+                "retry_in_seconds": (
+                    round(max(0.0, self.open_seconds - (now - self.opened_at)), 2)
+                    if self.state == self.OPEN and self.opened_at is not None
+                    else None
+                ),
+                "last_error": self.last_error,
+            }
+
+    def _record(self, succeeded: bool, latency: float, error: Optional[str]) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._calls.append((now, succeeded, latency))
+            if error:
+                self.last_error = error
+            self._prune(now)
+            if self.state != self.CLOSED:
+                return
+            calls, failures, slow = self._counts()
+            if calls < self.min_calls:
+                return
+            if failures / calls >= self.failure_rate_threshold or slow / calls >= self.slow_call_rate_threshold:
+                self._open()
+
+    def _open(self) -> None:
+        # Caller holds the lock
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self.times_opened += 1
+
+    def _prune(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        while self._calls and self._calls[0][0] < cutoff:
+            self._calls.popleft()
+
+    def _counts(self) -> Tuple[int, int, int]:
+        failures = sum(1 for _, ok, _ in self._calls if not ok)
+        slow = sum(1 for _, _, latency in self._calls if latency >= self.slow_call_seconds)
+        return len(self._calls), failures, slow
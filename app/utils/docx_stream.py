@@ -0,0 +1,143 @@
+"""
+Streaming DOCX text extraction.
+
+Reads ``word/document.xml`` straight out of the zip with an incremental XML parser
+and yields paragraph text and table rows in document order. Finished body elements
+are discarded as the parser moves on, and so is each finished row of a top-level
+table, so memory stays flat however long the document or its tables get. Vertically merged cells are emitted once (python-docx repeats the
+top cell's text in every row it spans) and horizontally merged cells are a single
+``w:tc`` to begin with.
+
+Anything this reader doesn't understand raises UnsupportedDocx so callers can fall back
+to python-docx.
+"""
+from typing import BinaryIO, Iterator, List
+import xml.etree.ElementTree as ET
+import zipfile
+
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_W = "{%s}" % W_NS
+
+_BODY = _W + "body"
+_P = _W + "p"
+_T = _W + "t"
+_TAB = _W + "tab"
+_BR = _W + "br"
+_CR = _W + "cr"
+_TBL = _W + "tbl"
+_TR = _W + "tr"
+_TC = _W + "tc"
+_VMERGE = _W + "vMerge"
+_VAL = _W + "val"
+
+# Run content that python-docx renders as characters
+_BREAKS = {_TAB: "\t", _BR: "\n", _CR: "\n"}
+
+
+class UnsupportedDocx(Exception):
+    """The file is not a plain WordprocessingML package this reader can stream"""
+
+
+class _Cell:
+    __slots__ = ("paragraphs", "continuation")
+
+    def __init__(self) -> None:
+        self.paragraphs: List[str] = []
+        # True for the lower parts of a vertically merged cell (their text lives above)
+        self.continuation = False
+
+
+def iter_docx_fragments(source: BinaryIO) -> Iterator[str]:
+    """
+    Yield body paragraphs and table rows (cells joined with " | ") in document order
+
+    Raises:
+        UnsupportedDocx: If the package can't be streamed (not a zip, no main document,
+            Strict OOXML namespace, malformed XML)
+    """
+    try:
+        archive = zipfile.ZipFile(source)
+    except (zipfile.BadZipFile, OSError) as e:
+        raise UnsupportedDocx(str(e))
+    with archive:
+        try:
+            document = archive.open("word/document.xml")
+        except KeyError:
+            raise UnsupportedDocx("word/document.xml not found")
+        with document:
+            try:
+                yield from _iter_document(document)
+            except ET.ParseError as e:
+                raise UnsupportedDocx(str(e))
+
+
+def _iter_document(document: BinaryIO) -> Iterator[str]:
+    paragraphs: List[List[str]] = []
+    cells: List[_Cell] = []
+    rows: List[List[str]] = []
+    body = None
+    # The top-level table being read; its rows are dropped one by one as they finish
+    table = None
+    depth = 0
+
+    for event, elem in ET.iterparse(document, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            depth += 1
+            if depth == 1 and not tag.startswith(_W):
+                # e.g. Strict OOXML (purl.oclc.org namespace)
+                raise UnsupportedDocx(f"unexpected root element {tag}")
+            if tag == _P:
+                paragraphs.append([])
+            elif tag == _TC:
+                cells.append(_Cell())
+            elif tag == _TR:
+                rows.append([])
+            elif tag == _TBL and depth == 3:
+                table = elem
+            elif tag == _BODY:
+                body = elem
+            continue
+
+        depth -= 1
+        if tag == _T:
+            if paragraphs and elem.text:
+                paragraphs[-1].append(elem.text)
+        elif tag in _BREAKS:
+            if paragraphs:
+                paragraphs[-1].append(_BREAKS[tag])
+        elif tag == _VMERGE:
+            # <w:vMerge/> or val="continue" continues the cell above; val="restart" starts one
+            if cells and elem.get(_VAL, "continue") == "continue":
+                cells[-1].continuation = True
+        elif tag == _P:
+            text = "".join(paragraphs.pop())
+            if len(paragraphs):
+                # A paragraph inside a text box: part of the enclosing paragraph
+                paragraphs[-1].append(text)
+            elif cells:
+                cells[-1].paragraphs.append(text)
+            else:
+                yield text
+        elif tag == _TC:
+            cell = cells.pop()
+            text = "\n".join(cell.paragraphs).strip()
+            if text and not cell.continuation and rows:
+                rows[-1].append(text)
+        elif tag == _TR:
+            row = rows.pop()
+            if row:
+                line = " | ".join(row)
+                if cells:
+                    # Nested table: its rows belong to the enclosing cell
+                    cells[-1].paragraphs.append(line)
+                else:
+                    yield line
+            if depth == 3 and table is not None:
+                # A top-level row is done; don't keep it until the table closes
+                table.remove(elem)
+
+        if depth == 2 and body is not None:
+            # A top-level block (paragraph, table, section properties) is done; drop it
+            body.clear()
@@ -0,0 +1,545 @@
+"""
+Tiered document extraction engine.
+
+Every PDF page goes through the cheapest backend that can handle it:
+
+1. probe     - read the page's resource dictionary (no content decoding) to see whether it
+               has fonts (a text layer) and/or images
+2. text      - plain text-layer extraction (PyPDF2 when installed, otherwise pdfminer
+               without layout analysis)
+3. layout    - pdfminer with full LAParams layout analysis, only for pages whose plain
+               text came out glued together or unusable
+4. ocr       - rasterize and run Tesseract, only for pages with no usable text layer; each
+               page is rendered at a DPI picked from its size and scan resolution, pages
+               are spread over the pool, and output is cached by a hash of the page content
+
+Long documents are split into page ranges that run in parallel on the extraction pool.
+Each extraction returns an ExtractionReport with the tier that served every page and
+the time spent in each tier.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple, Union
+import asyncio
+import hashlib
+import io
+import logging
+import math
+import os
+import time
+
+from fastapi import HTTPException
+from pdfminer.converter import TextConverter
+from pdfminer.layout import LAParams
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+from pdfminer.psparser import LIT
+from pdfminer.pdftypes import PDFObjRef, PDFStream, resolve1
+
+from app.utils.extraction_pool import ExtractionPool, extraction_pool
+from app.utils.text_extractor import TextExtractor
+from app.utils.text_normalizer import join_normalized, normalize_pages, normalize_text
+
+# Optional deps: PyPDF2 is the cheapest text tier, pdf2image + pytesseract enable OCR
+try:
+    from PyPDF2 import PdfReader
+except Exception:
+    PdfReader = None
+
+try:
+    from pdf2image import convert_from_bytes, convert_from_path
+except Exception:
+    convert_from_bytes = None
+    convert_from_path = None
+
+try:
+    import pytesseract
+except Exception:
+    pytesseract = None
+
+
+logger = logging.getLogger(__name__)
+
+# Tiers, cheapest first
+TIER_PROBE = "probe"
+TIER_PYPDF2 = "pypdf2"
+TIER_PDFMINER = "pdfminer"
+TIER_LAYOUT = "pdfminer_layout"
+TIER_OCR = "ocr"
+TIER_OCR_CACHE = "ocr_cache"
+TIER_EMPTY = "empty"
+TIER_DOCX = "docx"
+
+# Page text with fewer non-whitespace characters than this doesn't count as a text layer
+PAGE_MIN_CHARS = int(os.getenv("EXTRACTION_PAGE_MIN_CHARS", "20"))
+# Longer average "words" mean spacing was lost and layout analysis is needed
+MAX_MEAN_WORD_LENGTH = 20
+
+# OCR render resolution: never above the scan's own resolution or the pixel budget
+OCR_MIN_DPI = int(os.getenv("OCR_MIN_DPI", "150"))
+OCR_MAX_DPI = int(os.getenv("OCR_MAX_DPI", "300"))
+OCR_MAX_PIXELS = int(os.getenv("OCR_MAX_PIXELS", str(12_000_000)))
+
+LAYOUT_PARAMS = LAParams(
+    char_margin=2.0,
+    line_margin=0.5,
+    word_margin=0.1,
+    boxes_flow=0.5,
+    all_texts=False
+)
+
+_LIT_IMAGE = LIT("Image")
+_LIT_FORM = LIT("Form")
+
+# Page-level verdicts on extracted text
+_OK = "ok"
+_SPARSE = "sparse"
+_GLUED = "glued"
+_GARBAGE = "garbage"
+
+_NO_TEXT_DETAIL = (
+    "Could not extract meaningful text from PDF. "
+    "The file might be corrupted, password-protected, or contain only images."
+)
+_NO_OCR_DETAIL = (
+    "Could not extract meaningful text from PDF. OCR dependencies are missing. "
+    "Install 'pdf2image', 'pytesseract', and Poppler."
+)
+
+
+@dataclass
+class ExtractionReport:
+    """Which tier served each page and how long each tier took"""
+
+    file_type: str
+    pages: int = 0
+    # Tier that produced the text of each page, in page order
+    page_tiers: List[str] = field(default_factory=list)
+    # Time spent per tier, including attempts that were rejected and escalated
+    tier_seconds: Dict[str, float] = field(default_factory=dict)
+    total_seconds: float = 0.0
+
+    def add_time(self, tier: str, seconds: float) -> None:
+        self.tier_seconds[tier] = self.tier_seconds.get(tier, 0.0) + seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        tier_pages: Dict[str, int] = {}
+        for tier in self.page_tiers:
+            tier_pages[tier] = tier_pages.get(tier, 0) + 1
+        return {
+            "file_type": self.file_type,
+            "pages": self.pages,
+            "page_tiers": list(self.page_tiers),
+            "tier_pages": tier_pages,
+            "tier_seconds": {tier: round(seconds, 4) for tier, seconds in self.tier_seconds.items()},
+            "total_seconds": round(self.total_seconds, 4),
+        }
+
+
+@dataclass
+class PageRangeResult:
+    """Worker output for a page range; pages still needing OCR have tier 'ocr' and no text"""
+
+    # (page_index, tier, normalized_text)
+    pages: List[Tuple[int, str, str]] = field(default_factory=list)
+    # page_index -> (page_hash, dpi) for pages left to OCR
+    ocr_pages: Dict[int, Tuple[str, int]] = field(default_factory=dict)
+    tier_seconds: Dict[str, float] = field(default_factory=dict)
+
+    def add_time(self, tier: str, seconds: float) -> None:
+        self.tier_seconds[tier] = self.tier_seconds.get(tier, 0.0) + seconds
+
+
+class OCRCache:
+    """Lookup/store hooks for OCR output per page hash; the base class caches nothing"""
+
+    def lookup(self, page_hashes: List[str]) -> Dict[str, str]:
+        return {}
+
+    def store(self, pages: Dict[str, Tuple[str, int]]) -> None:
+        """``pages`` maps page_hash -> (text, dpi)"""
+
+
+def ocr_available() -> bool:
+    return convert_from_bytes is not None and pytesseract is not None
+
+
+def count_pdf_pages(file_content: Union[bytes, str]) -> int:
+    """
+    Count the pages of a PDF without decoding any page content
+
+    Raises:
+        HTTPException: If the PDF cannot be parsed
+    """
+    try:
+        with TextExtractor._open_source(file_content) as source:
+            document = PDFDocument(PDFParser(source))
+            pages = resolve1(document.catalog.get("Pages"))
+            count = pages.get("Count") if isinstance(pages, dict) else None
+            if isinstance(count, int):
+                return count
+            # Malformed page tree: walk it instead
+            return sum(1 for _ in PDFPage.create_pages(document))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Failed to process PDF file: {str(e)}")
+
+
+def extract_pdf_page_range(
+    file_content: Union[bytes, str], first_page: int = 0, last_page: Optional[int] = None
+) -> PageRangeResult:
+    """
+    Run the probe and text tiers over pages [first_page, last_page) of a PDF
+
+    Pages that need OCR are returned without text so the caller can batch them.
+
+    Raises:
+        HTTPException: If the PDF cannot be parsed
+    """
+    result = PageRangeResult()
+    try:
+        with TextExtractor._open_source(file_content) as source, \
+                TextExtractor._open_source(file_content) as pypdf_source:
+            document = PDFDocument(PDFParser(source))
+            resources = PDFResourceManager(caching=True)
+            # PyPDF2 seeks on its own handle so the two parsers don't disturb each other
+            reader = PdfReader(pypdf_source) if PdfReader is not None else None
+            for index, page in enumerate(PDFPage.create_pages(document)):
+                if index < first_page:
+                    continue
+                if last_page is not None and index >= last_page:
+                    break
+                tier, text = _extract_page(result, resources, reader, index, page)
+                # Cleaned here so only the compact text of each page travels back to the parent
+                result.pages.append((index, tier, normalize_text(text)))
+    except Exception as e:
+        if isinstance(e, HTTPException):
+            raise e
+        raise HTTPException(status_code=400, detail=f"Failed to process PDF file: {str(e)}")
+    return result
+
+
+def ocr_pdf_pages(
+    file_content: Union[bytes, str], pages: List[Tuple[int, int]]
+) -> Tuple[Dict[int, str], float]:
+    """
+    Rasterize only the given pages, each at its own DPI, and run Tesseract on them
+
+    Args:
+        file_content: PDF file content as bytes, or a path to the file
+        pages: (page_index, dpi) pairs
+
+    Returns:
+        (normalized text per page index, seconds spent)
+
+    Raises:
+        HTTPException: If OCR fails
+    """
+    started = time.perf_counter()
+    texts: Dict[int, str] = {}
+    try:
+        for index, dpi in pages:
+            # pdf2image page numbers are 1-based and inclusive
+            options = dict(dpi=dpi, first_page=index + 1, last_page=index + 1, grayscale=True)
+            if isinstance(file_content, str):
+                images = convert_from_path(file_content, **options)
+            else:
+                images = convert_from_bytes(file_content, **options)
+            texts[index] = join_normalized(normalize_pages(pytesseract.image_to_string(image) for image in images))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"OCR processing failed: {str(e)}")
+    return texts, time.perf_counter() - started
+
+
+def extract_pdf(file_content: Union[bytes, str], ocr_cache: Optional[OCRCache] = None) -> Tuple[str, ExtractionReport]:
+    """Run every tier in the current process (no pool, no page splitting)"""
+    started = time.perf_counter()
+    results = [extract_pdf_page_range(file_content)]
+    report = ExtractionReport(file_type=".pdf")
+    ocr_cache = ocr_cache or OCRCache()
+    ocr, jobs = _cached_ocr(results, ocr_cache)
+    if jobs and ocr_available():
+        texts, seconds = ocr_pdf_pages(file_content, jobs)
+        report.add_time(TIER_OCR, seconds)
+        _store_ocr(results, texts, ocr, ocr_cache)
+    return _assemble(report, results, ocr, started)
+
+
+class ExtractionEngine:
+    """Runs the tiers on the extraction pool, splitting long PDFs into page ranges"""
+
+    def __init__(self, pool: ExtractionPool, parallel_min_pages: int = 8, min_pages_per_job: int = 4) -> None:
+        self.pool = pool
+        # PDFs with at least this many pages are extracted as page ranges in parallel (0 disables)
+        self.parallel_min_pages = parallel_min_pages
+        self.min_pages_per_job = max(1, min_pages_per_job)
+
+    @classmethod
+    def from_env(cls, pool: ExtractionPool) -> "ExtractionEngine":
+        return cls(
+            pool,
+            parallel_min_pages=int(os.getenv("EXTRACTION_PARALLEL_MIN_PAGES", "8")),
+            min_pages_per_job=int(os.getenv("EXTRACTION_MIN_PAGES_PER_JOB", "4")),
+        )
+
+    async def extract(
+        self, file_content: Union[bytes, str], file_extension: str, ocr_cache: Optional[OCRCache] = None
+    ) -> Tuple[str, ExtractionReport]:
+        """Extract from bytes or, preferably, a file path (workers then read the file themselves)."""
+        if file_extension.lower() == ".pdf":
+            return await self.extract_pdf(file_content, ocr_cache)
+
+        started = time.perf_counter()
+        text = await self.pool.run(TextExtractor.extract_text, file_content, file_extension)
+        elapsed = time.perf_counter() - started
+        report = ExtractionReport(file_type=file_extension.lower(), total_seconds=elapsed)
+        report.add_time(TIER_DOCX, elapsed)
+        return text, report
+
+    async def extract_pdf(
+        self, file_content: Union[bytes, str], ocr_cache: Optional[OCRCache] = None
+    ) -> Tuple[str, ExtractionReport]:
+        started = time.perf_counter()
+        if self._can_split(file_content):
+            pages = await self.pool.run(count_pdf_pages, file_content)
+            ranges = self._page_ranges(pages)
+        else:
+            ranges = [(0, None)]
+        results = await asyncio.gather(*[
+            self.pool.run(extract_pdf_page_range, file_content, first, last) for first, last in ranges
+        ])
+
+        report = ExtractionReport(file_type=".pdf")
+        ocr_cache = ocr_cache or OCRCache()
+        ocr, jobs = _cached_ocr(results, ocr_cache)
+        if jobs and ocr_available():
+            texts = await self._run_ocr(file_content, jobs, report)
+            _store_ocr(results, texts, ocr, ocr_cache)
+        text, report = _assemble(report, results, ocr, started)
+        logger.info("Extracted %d PDF pages by tier %s", report.pages, report.to_dict()["tier_pages"])
+        return text, report
+
+    async def _run_ocr(
+        self, file_content: Union[bytes, str], jobs: List[Tuple[int, int]], report: ExtractionReport
+    ) -> Dict[int, str]:
+        if not self._can_split(file_content) or len(jobs) == 1:
+            texts, seconds = await self.pool.run(ocr_pdf_pages, file_content, jobs)
+            report.add_time(TIER_OCR, seconds)
+            return texts
+        # One page per job: rendering + Tesseract dominate, so pages spread evenly over workers
+        outputs = await asyncio.gather(*[self.pool.run(ocr_pdf_pages, file_content, [job]) for job in jobs])
+        texts = {}
+        for page_texts, seconds in outputs:
+            texts.update(page_texts)
+            report.add_time(TIER_OCR, seconds)
+        return texts
+
+    def _can_split(self, file_content: Union[bytes, str]) -> bool:
+        # Only paths are split: each worker opens the file itself instead of receiving a copy
+        return isinstance(file_content, str) and self.pool.max_workers > 1 and self.parallel_min_pages > 0
+
+    def _page_ranges(self, pages: int) -> List[Tuple[int, Optional[int]]]:
+        if pages < self.parallel_min_pages:
+            return [(0, None)]
+        jobs = max(1, min(self.pool.max_workers, math.ceil(pages / self.min_pages_per_job)))
+        size = math.ceil(pages / jobs)
+        return [(first, min(first + size, pages)) for first in range(0, pages, size)]
+
+
+def _extract_page(
+    result: PageRangeResult, resources: PDFResourceManager, reader: Any, index: int, page: PDFPage
+) -> Tuple[str, str]:
+    started = time.perf_counter()
+    has_fonts, image_size = _probe_page(page)
+    result.add_time(TIER_PROBE, time.perf_counter() - started)
+    has_images = image_size is not None
+
+    if not has_fonts:
+        if not has_images:
+            return TIER_EMPTY, ""
+        return _needs_ocr(result, index, page, image_size)
+
+    tier, text, verdict = TIER_PDFMINER, "", _SPARSE
+    attempts = [TIER_PYPDF2 if reader is not None else TIER_PDFMINER, TIER_LAYOUT]
+    for tier in attempts:
+        started = time.perf_counter()
+        try:
+            text = _page_text(tier, resources, reader, index, page)
+        except Exception:
+            # A backend choking on one page just escalates to the next tier
+            text = ""
+        result.add_time(tier, time.perf_counter() - started)
+        verdict = _assess(text)
+        if verdict == _OK:
+            return tier, text
+        if verdict == _SPARSE and tier == TIER_PDFMINER:
+            # Layout analysis regroups the same characters; it can't find more of them
+            break
+
+    # Glyphs without a unicode mapping can still be read off the rendered page
+    if verdict == _GARBAGE or (verdict == _SPARSE and has_images):
+        return _needs_ocr(result, index, page, image_size)
+    # Short or oddly spaced text is still the best this page has
+    return tier, text
+
+
+def _needs_ocr(
+    result: PageRangeResult, index: int, page: PDFPage, image_size: Optional[Tuple[int, int]]
+) -> Tuple[str, str]:
+    started = time.perf_counter()
+    result.ocr_pages[index] = (_page_hash(page), _ocr_dpi(page, image_size))
+    result.add_time(TIER_PROBE, time.perf_counter() - started)
+    return TIER_OCR, ""
+
+
+def _probe_page(page: PDFPage) -> Tuple[bool, Optional[Tuple[int, int]]]:
+    """(has_fonts, pixel size of the largest image or None) from the page's resource dictionary alone"""
+    resources = resolve1(page.resources) or {}
+    has_fonts = bool(resolve1(resources.get("Font")))
+    image_size: Optional[Tuple[int, int]] = None
+    xobjects = resolve1(resources.get("XObject")) or {}
+    for ref in xobjects.values():
+        xobject = resolve1(ref)
+        subtype = xobject.get("Subtype") if hasattr(xobject, "get") else None
+        if subtype is _LIT_IMAGE:
+            size = (resolve1(xobject.get("Width")) or 0, resolve1(xobject.get("Height")) or 0)
+            if image_size is None or size[0] * size[1] > image_size[0] * image_size[1]:
+                image_size = size
+        elif subtype is _LIT_FORM:
+            # Form XObjects carry their own resources; assume they may hold text
+            has_fonts = True
+    return has_fonts, image_size
+
+
+def _ocr_dpi(page: PDFPage, image_size: Optional[Tuple[int, int]]) -> int:
+    x0, y0, x1, y1 = page.mediabox
+    width_in, height_in = abs(x1 - x0) / 72.0, abs(y1 - y0) / 72.0
+    dpi = float(OCR_MAX_DPI)
+    if image_size and width_in > 0 and height_in > 0:
+        # A full-page scan: rendering above its own resolution only adds pixels, not detail
+        dpi = min(dpi, max(image_size[0] / width_in, image_size[1] / height_in))
+    if width_in > 0 and height_in > 0:
+        dpi = min(dpi, math.sqrt(OCR_MAX_PIXELS / (width_in * height_in)))
+    return int(max(OCR_MIN_DPI, dpi))
+
+
+def _page_hash(page: PDFPage) -> str:
+    """SHA-256 over everything that affects how a page renders (content streams and resources)"""
+    digest = hashlib.sha256(repr(page.mediabox).encode())
+    seen: set = set()
+    for stream in page.contents:
+        _hash_object(digest, stream, seen)
+    _hash_object(digest, page.resources, seen)
+    return digest.hexdigest()
+
+
+def _hash_object(digest: Any, obj: Any, seen: set) -> None:
+    if isinstance(obj, PDFObjRef):
+        # Shared objects (fonts, images) are hashed once; also guards against cycles
+        if obj.objid in seen:
+            digest.update(b"ref")
+            return
+        seen.add(obj.objid)
+        obj = obj.resolve()
+    if isinstance(obj, PDFStream):
+        _hash_object(digest, obj.attrs, seen)
+        # Raw bytes unless a text tier already decoded the stream (pdfminer drops them then)
+        digest.update(obj.rawdata if obj.rawdata is not None else obj.get_data())
+    elif isinstance(obj, dict):
+        for key in sorted(obj):
+            digest.update(str(key).encode())
+            _hash_object(digest, obj[key], seen)
+    elif isinstance(obj, list):
+        for item in obj:
+            _hash_object(digest, item, seen)
+    else:
+        digest.update(repr(obj).encode())
+
+
+def _page_text(tier: str, resources: PDFResourceManager, reader: Any, index: int, page: PDFPage) -> str:
+    if tier == TIER_PYPDF2:
+        return reader.pages[index].extract_text() or ""
+    buffer = io.StringIO()
+    device = TextConverter(resources, buffer, laparams=LAYOUT_PARAMS if tier == TIER_LAYOUT else None)
+    try:
+        PDFPageInterpreter(resources, device).process_page(page)
+    finally:
+        device.close()
+    return buffer.getvalue()
+
+
+def _assess(text: str) -> str:
+    words = text.split()
+    chars = sum(len(word) for word in words)
+    if chars < PAGE_MIN_CHARS:
+        return _SPARSE
+    # Unmapped glyphs: pdfminer emits "(cid:NN)", PyPDF2 the replacement character
+    unmapped = text.count("(cid:") * 6 + text.count("\ufffd")
+    if unmapped * 4 > chars:
+        return _GARBAGE
+    if chars / len(words) > MAX_MEAN_WORD_LENGTH:
+        return _GLUED
+    return _OK
+
+
+def _cached_ocr(
+    results: List[PageRangeResult], ocr_cache: OCRCache
+) -> Tuple[Dict[int, Tuple[str, str]], List[Tuple[int, int]]]:
+    """Split pages needing OCR into cache hits (index -> (tier, text)) and (index, dpi) jobs"""
+    pending = {index: entry for result in results for index, entry in result.ocr_pages.items()}
+    if not pending:
+        return {}, []
+    cached = ocr_cache.lookup(sorted({page_hash for page_hash, _ in pending.values()}))
+    ocr: Dict[int, Tuple[str, str]] = {}
+    jobs: List[Tuple[int, int]] = []
+    queued = set()
+    for index, (page_hash, dpi) in sorted(pending.items()):
+        if page_hash in cached:
+            # normalize_text is idempotent; it also covers entries stored before normalization
+            ocr[index] = (TIER_OCR_CACHE, normalize_text(cached[page_hash]))
+        elif page_hash not in queued:
+            # Repeated pages within one document are rendered once
+            queued.add(page_hash)
+            jobs.append((index, dpi))
+    return ocr, jobs
+
+
+def _store_ocr(
+    results: List[PageRangeResult], texts: Dict[int, str], ocr: Dict[int, Tuple[str, str]], ocr_cache: OCRCache
+) -> None:
+    pending = {index: entry for result in results for index, entry in result.ocr_pages.items()}
+    by_hash = {pending[index][0]: (text, pending[index][1]) for index, text in texts.items()}
+    for index, (page_hash, _) in pending.items():
+        if index not in ocr and page_hash in by_hash:
+            ocr[index] = (TIER_OCR, by_hash[page_hash][0])
+    ocr_cache.store(by_hash)
+
+
+def _assemble(
+    report: ExtractionReport, results: List[PageRangeResult], ocr: Dict[int, Tuple[str, str]], started: float
+) -> Tuple[str, ExtractionReport]:
+    parts: List[str] = []
+    ocr_missing = False
+    # Ranges were gathered in order, so pages are already in document order
+    for result in results:
+        for tier, seconds in result.tier_seconds.items():
+            report.add_time(tier, seconds)
+        for index, tier, text in result.pages:
+            if tier == TIER_OCR:
+                if index in ocr:
+                    tier, text = ocr[index]
+                else:
+                    ocr_missing = True
+            report.page_tiers.append(tier)
+            if text:
+                parts.append(text)
+    report.pages = len(report.page_tiers)
+
+    cleaned = join_normalized(parts)
+    report.total_seconds = time.perf_counter() - started
+    if not TextExtractor._has_meaningful_text(cleaned):
+        raise HTTPException(status_code=400, detail=_NO_OCR_DETAIL if ocr_missing else _NO_TEXT_DETAIL)
+    return cleaned, report
+
+
+extraction_engine = ExtractionEngine.from_env(extraction_pool)
@@ -0,0 +1,192 @@
+"""
+Process pool for CPU-heavy document extraction (pdfminer layout analysis, python-docx, OCR).
+
+Parsing runs in worker processes so it never blocks the event loop and scales across
+cores. Each job has a timeout (a stuck worker is killed and the pool restarted) and
+workers run under an address-space cap so a pathological file fails instead of taking
+the host down.
+
+A process pool can't lose one worker without breaking, so a restart fails every job in
+flight. Jobs caught up in another job's timeout are resubmitted to the new pool. After a
+worker crash the culprit is unknown, so each affected job is retried once, one at a time.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional, TypeVar
+import asyncio
+import logging
+import os
+import threading
+import weakref
+
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+
+try:
+    import resource
+except Exception:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore
+
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionError(Exception):
+    """Extraction failure carried back from a worker; maps onto an HTTP error"""
+
+    def __init__(self, status_code: int, detail: str) -> None:
+        super().__init__(status_code, detail)
+        self.status_code = status_code
+        self.detail = detail
+
+    def __reduce__(self):
+        # Rebuilt with the same arguments when unpickled in the parent process
+        return (type(self), (self.status_code, self.detail))
+
+    def to_http(self) -> HTTPException:
+        return HTTPException(status_code=self.status_code, detail=self.detail)
+
+
+def _init_worker(memory_limit_mb: int) -> None:
+    # Jobs are already spread over worker processes; keep Tesseract (OCR) single-threaded
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+    if resource is None or memory_limit_mb <= 0:
+        return
+    limit = memory_limit_mb * 1024 * 1024
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ValueError, OSError):
+        pass
+
+
+class _WorkerCrashed(Exception):
+    """The pool broke under a job because a worker died"""
+
+
+def _run_job(fn: Callable[..., T], *args: Any) -> T:
+    # Runs inside the worker: surface expected failures as a picklable ExtractionError
+    try:
+        return fn(*args)
+    except HTTPException as exc:
+        raise ExtractionError(exc.status_code, str(exc.detail))
+    except MemoryError:
+        raise ExtractionError(413, "File is too complex to process within the configured memory limit.")
+
+
+class ExtractionPool:
+    """Lazily started process pool that runs extraction jobs with timeouts"""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        timeout_seconds: float = 30.0,
+        memory_limit_mb: int = 1024,
+    ) -> None:
+        # 0 workers runs jobs in the threadpool instead (no subprocesses, no limits)
+        self.max_workers = (os.cpu_count() or 1) if max_workers is None else max_workers
+        self.timeout_seconds = timeout_seconds
+        self.memory_limit_mb = memory_limit_mb
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Pools killed because some job timed out; their other jobs are resubmitted
+        self._recycled: "weakref.WeakSet[ProcessPoolExecutor]" = weakref.WeakSet()
+        # Created on first use, inside the running event loop
+        self._crash_retry_lock: Optional[asyncio.Lock] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "ExtractionPool":
+        workers = os.getenv("EXTRACTION_WORKERS")
+        return cls(
+            max_workers=int(workers) if workers else None,
+            timeout_seconds=float(os.getenv("EXTRACTION_TIMEOUT_SECONDS", "30")),
+            memory_limit_mb=int(os.getenv("EXTRACTION_MEMORY_LIMIT_MB", "1024")),
+        )
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn(*args)`` in a worker; raises HTTPException on failure or timeout.
+
+        ``fn`` and its arguments must be picklable (module-level functions or static methods).
+        """
+        try:
+            if self.max_workers <= 0:
+                return await run_in_threadpool(_run_job, fn, *args)
+            return await self._run_in_process(fn, *args)
+        except ExtractionError as exc:
+            raise exc.to_http()
+
+    async def _run_in_process(self, fn: Callable[..., T], *args: Any) -> T:
+        try:
+            return await self._attempt(fn, *args)
+        except _WorkerCrashed:
+            logger.warning("Extraction worker crashed while running %s; restarting pool and retrying", fn.__qualname__)
+        if self._crash_retry_lock is None:
+            self._crash_retry_lock = asyncio.Lock()
+        # Retry one job at a time, so a file that crashes workers can't take others down twice
+        async with self._crash_retry_lock:
+            try:
+                return await self._attempt(fn, *args)
+            except _WorkerCrashed:
+                logger.warning("Extraction worker crashed again while running %s", fn.__qualname__)
+                raise ExtractionError(500, "File processing failed: the extraction worker crashed.")
+
+    async def _attempt(self, fn: Callable[..., T], *args: Any) -> T:
+        loop = asyncio.get_running_loop()
+        while True:
+            executor = self._get_executor()
+            try:
+                future = loop.run_in_executor(executor, _run_job, fn, *args)
+                return await asyncio.wait_for(future, timeout=self.timeout_seconds)
+            except asyncio.TimeoutError:
+                logger.warning("Extraction job %s timed out after %.1fs; restarting pool", fn.__qualname__, self.timeout_seconds)
+                # A worker stuck in C code can't be interrupted; kill the pool and start over
+                self._restart(executor, recycled=True)
+                raise ExtractionError(408, f"File processing timed out after {self.timeout_seconds:g} seconds.")
+            except BrokenProcessPool:
+                if executor in self._recycled:
+                    # Another job's timeout took the pool down; this job did nothing wrong
+                    logger.info("Resubmitting extraction job %s after a pool restart", fn.__qualname__)
+                    continue
+                # A worker died (e.g. killed by the OS); the pool is unusable now
+                self._restart(executor)
+                raise _WorkerCrashed()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=_init_worker,
+                    initargs=(self.memory_limit_mb,),
+                )
+            return self._executor
+
+    def _restart(self, broken: ProcessPoolExecutor, recycled: bool = False) -> None:
+        with self._lock:
+            if recycled:
+                # Marked before the kill, so jobs failing with it see the mark
+                self._recycled.add(broken)
+            # Another job may already have replaced it
+            if self._executor is broken:
+                self._executor = None
+        _terminate(broken)
+
+    def shutdown(self, wait: bool = False) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+def _terminate(executor: ProcessPoolExecutor) -> None:
+    # ProcessPoolExecutor has no public way to kill busy workers
+    processes = list((getattr(executor, "_processes", None) or {}).values())
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+extraction_pool = ExtractionPool.from_env()
@@ -0,0 +1,200 @@
+"""
+Tolerant, incremental JSON parsing for LLM output.
+
+Models wrap JSON in prose or markdown fences, append trailing text, leave trailing
+commas, or get cut off by max_tokens. The parser scans the output once, keeps enough
+state to close a truncated document, and ignores anything after the top-level value.
+A number or literal still being written when the output stops is dropped rather than
+read as is, since ``8`` may be the start of ``85``.
+
+Top-level fields are parsed once, as they complete, so reading the value mid-stream
+only re-parses the field still being written.
+"""
+from typing import Any, List, Optional, Tuple
+import json
+
+
+_CLOSERS = {"{": "}", "[": "]"}
+_STRUCTURAL = '{}[],:"'
+_LITERALS = ("true", "false", "null")
+
+
+class IncrementalJSONParser:
+    """Feed LLM output chunk by chunk and read the best-effort value at any point"""
+
+    def __init__(self) -> None:
+        self._chunks: List[str] = []
+        self._length = 0
+        self._start = -1
+        self._end: Optional[int] = None
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        # Start of the bare token (number or literal) the text currently ends in, or -1
+        self._token_start = -1
+        # (cut offset, open containers) for the last point where the prefix ends cleanly
+        self._safe: Optional[Tuple[int, Tuple[str, ...]]] = None
+        self.fields_completed = 0
+        # Completed top-level fields, parsed as they close (None if one didn't parse on
+        # its own; value() then re-parses everything), and the text of the current field
+        self._fields: Optional[dict] = {}
+        self._field_start = -1
+        self._field_parts: List[str] = []
+
+    @property
+    def complete(self) -> bool:
+        return self._end is not None
+
+    def feed(self, chunk: str) -> bool:
+        """Consume more output. Returns True when a top-level field or the whole value completed."""
+        if not chunk:
+            return False
+        offset = self._length
+        self._chunks.append(chunk)
+        self._length += len(chunk)
+        if self._end is not None:
+            return False
+
+        progressed = False
+        field_from = 0
+        for i, ch in enumerate(chunk):
+            pos = offset + i
+            if self._start < 0:
+                # Skip leading prose/fences up to the first object
+                if ch == "{":
+                    self._start = pos
+                    self._stack.append(ch)
+                    self._safe = (pos + 1, tuple(self._stack))
+                    self._field_start, field_from = pos + 1, i + 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch not in _STRUCTURAL and not ch.isspace():
+                if self._token_start < 0:
+                    self._token_start = pos
+                continue
+            self._token_start = -1
+            if ch == '"':
+                self._in_string = True
+            elif ch in _CLOSERS:
+                self._stack.append(ch)
+                self._safe = (pos + 1, tuple(self._stack))
+            elif ch in "}]":
+                if self._stack:
+                    self._stack.pop()
+                if not self._stack:
+                    self._end = pos + 1
+                    return True
+                self._safe = (pos + 1, tuple(self._stack))
+            elif ch == ",":
+                self._safe = (pos, tuple(self._stack))
+                if len(self._stack) == 1:
+                    self.fields_completed += 1
+                    progressed = True
+                    self._close_field(chunk[field_from:i])
+                    self._field_start, field_from = pos + 1, i + 1
+        if self._start >= 0:
+            self._field_parts.append(chunk[field_from:])
+        return progressed
+
+    def value(self) -> Optional[Any]:
+        """Parse what has arrived so far, repairing truncation; None if nothing usable yet."""
+        if self._start < 0:
+            return None
+        if self._end is not None:
+            return _loads_lenient("".join(self._chunks)[self._start:self._end])
+        if self._fields is None:
+            return self._repair("".join(self._chunks)[self._start:], self._start, "")
+        # Only the field still being written needs repairing
+        tail = self._repair("".join(self._field_parts), self._field_start, "{")
+        return {**self._fields, **tail} if isinstance(tail, dict) else dict(self._fields)
+
+    def _close_field(self, last_part: str) -> None:
+        if self._fields is not None:
+            field = "".join(self._field_parts) + last_part
+            # An empty field (",,") is as invalid here as in the whole document
+            parsed = _loads_lenient("{" + field + "}") if field.strip() else None
+            if isinstance(parsed, dict) and parsed:
+                self._fields.update(parsed)
+            else:
+                self._fields = None
+        self._field_parts = []
+
+    def _repair(self, text: str, base: int, prefix: str) -> Optional[Any]:
+        """Close ``text`` (the output from offset ``base`` on, after ``prefix``) as it stands"""
+        # Optimistic repair: close the open string and containers as they stand, unless
+        # the text ends in a number or literal that may not be finished yet
+        if self._token_start < 0 or text[self._token_start - base:] in _LITERALS:
+            candidate = prefix + text
+            if self._in_string:
+                candidate = (candidate[:-1] if self._escape else candidate) + '"'
+            value = _loads_lenient(candidate + _closing(self._stack))
+            if value is not None:
+                return value
+
+        # Otherwise cut back to the last clean boundary (drops a half-written key or value)
+        if self._safe is not None:
+            cut, stack = self._safe
+            if cut >= base:
+                return _loads_lenient(prefix + text[:cut - base] + _closing(stack))
+        return None
+
+
+def parse_json_tolerant(text: str) -> Any:
+    """Parse the first JSON object in ``text``; raises ValueError if none can be recovered."""
+    parser = IncrementalJSONParser()
+    parser.feed(text or "")
+    value = parser.value()
+    if value is None:
+        raise ValueError("No JSON value could be recovered from model output")
+    return value
+
+
+def _closing(stack) -> str:
+    return "".join(_CLOSERS[opener] for opener in reversed(stack))
+
+
+def _loads_lenient(text: str) -> Optional[Any]:
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    try:
+        return json.loads(_strip_trailing_commas(text))
+    except ValueError:
+        return None
+
+
+def _strip_trailing_commas(text: str) -> str:
+    """Drop commas directly before a closing bracket, leaving string contents alone"""
+    out: List[str] = []
+    in_string = escape = False
+    pending = -1  # index in out of a comma that may turn out to be trailing
+    for ch in text:
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch in "}]" and pending >= 0:
+            del out[pending]
+        elif ch == '"':
+            in_string = True
+        elif ch == ",":
+            pending = len(out)
+            out.append(ch)
+            continue
+        if not ch.isspace() or in_string:
+            pending = -1
+        out.append(ch)
+    return "".join(out)
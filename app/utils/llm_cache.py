@@ -0,0 +1,265 @@
+"""
+Content-addressed cache for LLM completions.
+
+Two tiers: a bounded in-memory LRU in front of a persistent SQLite table. Entries
+expire after a TTL and both tiers are trimmed to a maximum entry count.
+
+Async callers use ``aget``/``aset``: memory hits are answered inline, SQLite reads and
+writes run in the threadpool. Disk hits only queue their ``accessed_at`` touch; queued
+touches are written with the next insert, so a hit never commits on its own.
+"""
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from starlette.concurrency import run_in_threadpool
+
+
+class LLMCache:
+    """Two-tier (memory LRU + SQLite) cache for LLM responses"""
+
+    def __init__(
+        self,
+        ttl_seconds: float = 86400,
+        max_memory_entries: int = 512,
+        max_disk_entries: int = 10000,
+        disk_path: Optional[str] = None,
+        enabled: bool = True,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.disk_path = disk_path
+        self.enabled = enabled
+
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Serializes use of the SQLite connection; never held while waiting on _lock
+        self._disk_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disk_writes = 0
+        # key -> accessed_at of disk hits not yet written back
+        self._touched: Dict[str, float] = {}
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.evictions = 0
+
+        if self.enabled and self.disk_path:
+            try:
+                self._conn = sqlite3.connect(self.disk_path, check_same_thread=False)
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS llm_cache ("
+                    "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                    "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+                )
+                self._conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_accessed_at ON llm_cache (accessed_at)")
+                self._conn.commit()
+            except sqlite3.Error:
+                # Disk tier is optional; keep serving from memory
+                self._conn = None
+
+    @classmethod
+    def from_env(cls) -> "LLMCache":
+        return cls(
+            ttl_seconds=float(os.getenv("LLM_CACHE_TTL_SECONDS", "86400")),
+            max_memory_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "512")),
+            max_disk_entries=int(os.getenv("LLM_CACHE_DISK_MAX_ENTRIES", "10000")),
+            disk_path=os.getenv("LLM_CACHE_PATH", "./llm_cache.db") or None,
+            enabled=os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes"),
+        )
+
+    @staticmethod
+    def make_key(
+        provider: str,
+        model: str,
+        messages: List[Dict[str, str]],
+        max_tokens: int,
+        temperature: float,
+        json_mode: bool = False,
+    ) -> str:
+        """Hash the request parameters that determine a completion."""
+        parts: List[Any] = [provider, model, messages, max_tokens, temperature]
+        if json_mode:
+            # Only appended when set so existing plain-text keys stay valid
+            parts.append("json")
+        payload = json.dumps(
+            parts,
+            sort_keys=True,
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        value = self._get_memory(key)
+        if value is None:
+            value = self._get_disk(key)
+        return value
+
+    async def aget(self, key: str) -> Optional[str]:
+        """``get`` that keeps the SQLite lookup off the event loop"""
+        if not self.enabled:
+            return None
+        value = self._get_memory(key)
+        if value is None:
+            value = await run_in_threadpool(self._get_disk, key)
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        if not self.enabled:
+            return
+        now = time.time()
+        self._set_memory(key, now, value)
+        self._set_disk(key, now, value)
+
+    async def aset(self, key: str, value: str) -> None:
+        """``set`` that keeps the SQLite write off the event loop"""
+        if not self.enabled:
+            return
+        now = time.time()
+        self._set_memory(key, now, value)
+        if self._conn is not None:
+            await run_in_threadpool(self._set_disk, key, now, value)
+
+    def _get_memory(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created_at, value = entry
+                if now - created_at <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return value
+                del self._memory[key]
+            if self._conn is None:
+                self.misses += 1
+        return None
+
+    def _get_disk(self, key: str) -> Optional[str]:
+        if self._conn is None:
+            return None
+        now = time.time()
+        row = None
+        with self._disk_lock:
+            try:
+                row = self._conn.execute(
+                    "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and now - row[1] > self.ttl_seconds:
+                    self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    self._conn.commit()
+                    row = None
+                elif row is not None:
+                    self._touched[key] = now
+            except sqlite3.Error:
+                row = None
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            value, created_at = row
+            self._remember(key, created_at, value)
+            self.disk_hits += 1
+            return value
+
+    def _set_memory(self, key: str, now: float, value: str) -> None:
+        with self._lock:
+            self._remember(key, now, value)
+
+    def _set_disk(self, key: str, now: float, value: str) -> None:
+        if self._conn is None:
+            return
+        with self._disk_lock:
+            try:
+                self._flush_touched()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, value, now, now),
+                )
+                self._disk_writes += 1
+                # Trimming scans the table, so amortize it over several writes
+                if self._disk_writes % 64 == 0:
+                    self._trim_disk(now)
+                self._conn.commit()
+            except sqlite3.Error:
+                pass
+
+    def record_bypass(self) -> None:
+        with self._lock:
+            self.bypasses += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        if self._conn is not None:
+            with self._disk_lock:
+                self._touched.clear()
+                try:
+                    self._conn.execute("DELETE FROM llm_cache")
+                    self._conn.commit()
+                except sqlite3.Error:
+                    pass
+
+    def stats(self) -> Dict[str, Any]:
+        disk_entries = 0
+        if self._conn is not None:
+            with self._disk_lock:
+                try:
+                    disk_entries = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+                except sqlite3.Error:
+                    pass
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "memory_entries": len(self._memory),
+                "disk_entries": disk_entries,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "bypasses": self.bypasses,
+                "evictions": self.evictions,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            }
+
+    def _remember(self, key: str, created_at: float, value: str) -> None:
+        # Caller holds the lock
+        self._memory[key] = (created_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _flush_touched(self) -> None:
+        # Caller holds the disk lock; committed together with the caller's write
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE llm_cache SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def _trim_disk(self, now: float) -> None:
+        # Caller holds the disk lock; drop expired rows, then the least recently used overflow
+        self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+        count = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        overflow = count - self.max_disk_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN "
+                "(SELECT key FROM llm_cache ORDER BY accessed_at ASC LIMIT ?)",
+                (overflow,),
+            )
+            with self._lock:
+                self.evictions += overflow
@@ -0,0 +1,181 @@
+"""
+In-process metrics for LLM calls: per-attempt records aggregated into histograms.
+"""
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+import bisect
+import threading
+import time
+
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+TOKEN_BUCKETS = (16, 64, 128, 256, 512, 1024, 2048, 4096, 8192)
+
+# Outcomes of a single provider attempt
+OK = "ok"
+ERROR = "error"
+SKIPPED = "skipped"
+CACHE_HIT = "cache_hit"
+STUB = "stub"
+_SERVED = (OK, CACHE_HIT, STUB)
+
+
+class Histogram:
+    """Fixed-bucket histogram with count, sum, min/max and bucket-interpolated quantiles"""
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        self.bounds = tuple(bounds)
+        # One extra bucket for values above the last bound
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = self.bounds[index - 1] if index > 0 else (self.min or 0.0)
+                upper = self.bounds[index] if index < len(self.bounds) else (self.max or lower)
+                # Linear interpolation inside the bucket, clamped to what was actually observed
+                estimate = lower + (upper - lower) * ((rank - seen) / bucket_count)
+                return min(max(estimate, self.min or 0.0), self.max or estimate)
+            seen += bucket_count
+        return self.max
+
+    def snapshot(self) -> Dict[str, Any]:
+        buckets = [{"le": bound, "count": count} for bound, count in zip(self.bounds, self.counts)]
+        buckets.append({"le": "+Inf", "count": self.counts[-1]})
+        return {
+            "count": self.count,
+            "sum": round(self.total, 4),
+            "mean": round(self.total / self.count, 4) if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": _round(self.quantile(0.5)),
+            "p95": _round(self.quantile(0.95)),
+            "p99": _round(self.quantile(0.99)),
+            "buckets": buckets,
+        }
+
+
+@dataclass
+class LLMCallRecord:
+    """One routing attempt: a provider call, a breaker skip, a cache hit or the stub"""
+
+    task: str
+    provider: str
+    model: Optional[str]
+    outcome: str
+    latency_seconds: float = 0.0
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    # True when counts come from the local estimate rather than the provider's usage report
+    tokens_estimated: bool = False
+    streamed: bool = False
+    # Why this attempt did not serve the request (or why the stub was used)
+    fallback_reason: Optional[str] = None
+    timestamp: float = field(default_factory=time.time)
+
+
+@dataclass
+class _Series:
+    latency: Histogram = field(default_factory=lambda: Histogram(LATENCY_BUCKETS))
+    prompt_tokens: Histogram = field(default_factory=lambda: Histogram(TOKEN_BUCKETS))
+    completion_tokens: Histogram = field(default_factory=lambda: Histogram(TOKEN_BUCKETS))
+
+
+class LLMMetrics:
+    """Aggregates LLMCallRecords by (task, provider, model, outcome)"""
+
+    def __init__(self, recent_size: int = 100) -> None:
+        self._series: Dict[Tuple[str, str, str, str], _Series] = {}
+        self._fallback_reasons: Dict[str, int] = {}
+        self._recent: Deque[LLMCallRecord] = deque(maxlen=recent_size)
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def record(self, call: LLMCallRecord) -> None:
+        key = (call.task, call.provider, call.model or "", call.outcome)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series()
+            series.latency.observe(call.latency_seconds)
+            if call.prompt_tokens is not None:
+                series.prompt_tokens.observe(call.prompt_tokens)
+            if call.completion_tokens is not None:
+                series.completion_tokens.observe(call.completion_tokens)
+            if call.fallback_reason:
+                self._fallback_reasons[call.fallback_reason] = self._fallback_reasons.get(call.fallback_reason, 0) + 1
+            self._recent.append(call)
+
+    def record_fallback(self, reason: str) -> None:
+        """Count a fallback that happened outside a provider attempt (e.g. unparseable output)."""
+        with self._lock:
+            self._fallback_reasons[reason] = self._fallback_reasons.get(reason, 0) + 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+            self._fallback_reasons.clear()
+            self._recent.clear()
+            self.started_at = time.time()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            providers: Dict[str, Dict[str, int]] = {}
+            tasks: Dict[str, Dict[str, int]] = {}
+            served_by: Dict[str, int] = {}
+            series: List[Dict[str, Any]] = []
+            for (task, provider, model, outcome), data in sorted(self._series.items()):
+                count = data.latency.count
+                per_provider = providers.setdefault(provider, {})
+                per_provider[outcome] = per_provider.get(outcome, 0) + count
+                per_task = tasks.setdefault(task, {})
+                per_task[outcome] = per_task.get(outcome, 0) + count
+                # Each request ends in exactly one ok/cache_hit/stub record
+                if outcome in _SERVED:
+                    source = provider if outcome == OK else outcome
+                    served_by[source] = served_by.get(source, 0) + count
+                series.append({
+                    "task": task,
+                    "provider": provider,
+                    "model": model or None,
+                    "outcome": outcome,
+                    "count": count,
+                    "latency_seconds": data.latency.snapshot(),
+                    "prompt_tokens": data.prompt_tokens.snapshot(),
+                    "completion_tokens": data.completion_tokens.snapshot(),
+                })
+
+            requests = sum(served_by.values())
+            return {
+                "since": self.started_at,
+                "requests": requests,
+                "served_by": served_by,
+                "hit_rates": {
+                    source: round(count / requests, 4) for source, count in served_by.items()
+                } if requests else {},
+                "providers": providers,
+                "tasks": tasks,
+                "fallback_reasons": dict(self._fallback_reasons),
+                "series": series,
+                "recent": [asdict(call) for call in self._recent],
+            }
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 4) if value is not None else None
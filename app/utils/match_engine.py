@@ -0,0 +1,208 @@
+"""
+Vectorized skill-match scoring over a whole job corpus.
+
+Jobs are kept as a sparse job x skill incidence matrix: two flat arrays of (row, skill
+column) entries plus each row's skill count. A request turns the user's skills into a
+boolean vector over the skill columns (the only per-skill Python work), then every job's
+matched-skill count comes from one weighted bincount over the entries, its score from one
+array division, and the best ``k`` from a partial selection (argpartition) rather than
+a full sort.
+
+Filter fields (e.g. location) are stored as integer codes into a per-field table of
+distinct values, so a substring filter is evaluated once per distinct value and applied
+to all rows by indexing.
+
+Rows are appended as jobs arrive; removed or replaced jobs leave dead rows that are
+compacted away once they outnumber the live ones. A replaced job keeps its place in the
+tie-breaking order, like a replaced dict value does. NumPy arrays are rebuilt lazily on
+the first query after a change.
+"""
+from array import array
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# Compact only once there are at least this many dead rows (and more dead than live)
+COMPACT_MIN_DEAD_ROWS = 1024
+
+# Score of a job that lists no known skills (matches the scalar scorer)
+NO_SKILLS_SCORE = 50.0
+
+
+class _Snapshot:
+    """NumPy copies of the row data, valid until the next change"""
+
+    __slots__ = ("entry_rows", "entry_skills", "skill_counts", "sequence", "alive", "codes")
+
+    def __init__(self, entry_rows, entry_skills, skill_counts, sequence, alive, codes) -> None:
+        self.entry_rows = entry_rows
+        self.entry_skills = entry_skills
+        self.skill_counts = skill_counts
+        self.sequence = sequence
+        self.alive = alive
+        self.codes = codes
+
+
+class MatchEngine:
+    """Scores all jobs against a set of user skills at once and returns the top ``k``"""
+
+    def __init__(self, filter_fields: Sequence[str] = ()) -> None:
+        self.filter_fields = tuple(filter_fields)
+
+        self._skill_ids: Dict[str, int] = {}
+        self.skills: List[str] = []
+
+        self._entry_rows = array("I")
+        self._entry_skills = array("I")
+        self._skill_counts = array("I")
+        # Insertion sequence per row; ties go to the lower one
+        self._sequence = array("Q")
+        self._next_sequence = 0
+        self._alive = bytearray()
+        self._keys: List[Any] = []
+        self._key_rows: Dict[Any, int] = {}
+        self._dead = 0
+
+        self._field_ids: Dict[str, Dict[str, int]] = {field: {} for field in self.filter_fields}
+        self._field_values: Dict[str, List[str]] = {field: [] for field in self.filter_fields}
+        self._field_codes: Dict[str, array] = {field: array("I") for field in self.filter_fields}
+
+        self._snapshot: Optional[_Snapshot] = None
+
+    def __len__(self) -> int:
+        return len(self._key_rows)
+
+    def add(self, key: Any, skills: Iterable[str], fields: Optional[Dict[str, str]] = None) -> None:
+        """Add a job's skills and (lowercased) filter field values; an existing key is replaced"""
+        old_row = self._key_rows.get(key)
+        if old_row is None:
+            sequence = self._next_sequence
+            self._next_sequence += 1
+        else:
+            sequence = self._sequence[old_row]
+            self.remove(key)
+        row = len(self._keys)
+        columns = {self._skill_id(skill) for skill in skills}
+        self._entry_rows.extend([row] * len(columns))
+        self._entry_skills.extend(columns)
+        self._skill_counts.append(len(columns))
+        self._sequence.append(sequence)
+        self._alive.append(1)
+        self._keys.append(key)
+        self._key_rows[key] = row
+        fields = fields or {}
+        for field in self.filter_fields:
+            self._field_codes[field].append(self._value_id(field, fields.get(field) or ""))
+        self._snapshot = None
+
+    def remove(self, key: Any) -> bool:
+        row = self._key_rows.pop(key, None)
+        if row is None:
+            return False
+        self._alive[row] = 0
+        self._dead += 1
+        self._snapshot = None
+        return True
+
+    def top_k(
+        self,
+        skill_matches: Callable[[str], bool],
+        k: int = 20,
+        min_score: float = 0.0,
+        filters: Optional[Dict[str, Optional[str]]] = None,
+    ) -> Tuple[List[Tuple[Any, float]], int]:
+        """Best ``k`` (key, score) pairs with score above ``min_score``, and how many qualified
+
+        ``skill_matches(skill)`` says whether the user covers a job skill; it is called
+        once per distinct skill in the corpus, not per job. A job's score is the share of
+        its skills covered, 0-100, rounded to one decimal. ``filters`` maps filter fields
+        to lowercased substrings the field must contain. Ties keep insertion order.
+        """
+        snapshot = self._materialize()
+        rows = len(self._keys)
+        if rows == 0:
+            return [], 0
+
+        covered = np.fromiter((bool(skill_matches(skill)) for skill in self.skills), dtype=bool, count=len(self.skills))
+        matched = np.bincount(snapshot.entry_rows, weights=covered[snapshot.entry_skills], minlength=rows)
+        counts = snapshot.skill_counts
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = np.where(counts > 0, matched * 100.0 / counts, NO_SKILLS_SCORE)
+        # Tenths of a point as integers: the rounding JobMatch.match_score reports
+        tenths = np.rint(scores * 10.0).astype(np.int64)
+
+        eligible = snapshot.alive & (tenths > int(round(min_score * 10)))
+        for field, value in (filters or {}).items():
+            if value:
+                values = self._field_values[field]
+                accepted = np.fromiter((value in candidate for candidate in values), dtype=bool, count=len(values))
+                eligible &= accepted[snapshot.codes[field]]
+
+        total = int(np.count_nonzero(eligible))
+        if total == 0:
+            return [], 0
+        # Unique sort key: score first, then earlier insertion (a stable descending sort's order)
+        span = self._next_sequence
+        order_key = np.where(eligible, tenths * span + (span - 1 - snapshot.sequence), -1)
+        if total > k:
+            best = np.argpartition(order_key, rows - k)[rows - k:]
+        else:
+            best = np.flatnonzero(eligible)
+        best = best[np.argsort(order_key[best])[::-1]]
+        return [(self._keys[row], score / 10.0) for row, score in zip(best.tolist(), tenths[best].tolist())], total
+
+    def _materialize(self) -> _Snapshot:
+        if self._snapshot is None:
+            if self._dead >= COMPACT_MIN_DEAD_ROWS and self._dead > len(self._key_rows):
+                self._compact()
+            self._snapshot = _Snapshot(
+                entry_rows=np.array(self._entry_rows, dtype=np.int64),
+                entry_skills=np.array(self._entry_skills, dtype=np.int64),
+                skill_counts=np.array(self._skill_counts, dtype=np.float64),
+                sequence=np.array(self._sequence, dtype=np.int64),
+                alive=np.frombuffer(bytes(self._alive), dtype=np.uint8).astype(bool),
+                codes={field: np.array(codes, dtype=np.int64) for field, codes in self._field_codes.items()},
+            )
+        return self._snapshot
+
+    def _compact(self) -> None:
+        """Drop dead rows and renumber the live ones in order"""
+        alive = np.frombuffer(bytes(self._alive), dtype=np.uint8).astype(bool)
+        new_rows = np.cumsum(alive) - 1
+        entry_rows = np.array(self._entry_rows, dtype=np.int64)
+        keep = alive[entry_rows]
+
+        self._entry_rows = _to_array(new_rows[entry_rows[keep]])
+        self._entry_skills = _to_array(np.array(self._entry_skills, dtype=np.int64)[keep])
+        self._skill_counts = _to_array(np.array(self._skill_counts, dtype=np.int64)[alive])
+        self._sequence = array("Q", np.array(self._sequence, dtype=np.uint64)[alive].tolist())
+        for field, codes in self._field_codes.items():
+            self._field_codes[field] = _to_array(np.array(codes, dtype=np.int64)[alive])
+        self._keys = [key for key, live in zip(self._keys, alive.tolist()) if live]
+        self._key_rows = {key: row for row, key in enumerate(self._keys)}
+        self._alive = bytearray(b"\x01" * len(self._keys))
+        self._dead = 0
+
+    def _skill_id(self, skill: str) -> int:
+        skill_id = self._skill_ids.get(skill)
+        if skill_id is None:
+            skill_id = len(self.skills)
+            self._skill_ids[skill] = skill_id
+            self.skills.append(skill)
+        return skill_id
+
+    def _value_id(self, field: str, value: str) -> int:
+        ids = self._field_ids[field]
+        value_id = ids.get(value)
+        if value_id is None:
+            value_id = len(self._field_values[field])
+            ids[value] = value_id
+            self._field_values[field].append(value)
+        return value_id
+
+
+def _to_array(values: np.ndarray) -> array:
+    out = array("I")
+    out.frombytes(values.astype(np.uint32).tobytes())
+    return out
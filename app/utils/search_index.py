@@ -0,0 +1,340 @@
+"""
+In-memory inverted index with BM25 ranking.
+
+Documents are tokenized once when they are added: each term gets a posting list of
+(document, weighted term frequency) kept in compact arrays, and each document's token
+sequence is kept (as term ids) so phrase queries can be checked without re-reading its
+text. Fields carry weights (a hit in a job title counts more than one in the
+description), applied BM25F-style to term frequency and document length.
+
+Removing or replacing a document leaves its postings behind as tombstones; document
+frequencies are kept for live documents only, and the index is compacted (tombstones
+dropped, documents renumbered) once dead documents outnumber live ones.
+
+Query syntax:
+    python developer        every term must match; results are ranked by BM25
+    "machine learning"      phrase: the terms must appear next to each other
+    kube*                   prefix: any term starting with "kube"
+
+With ``prefix_last`` the last word is a prefix even without the ``*``, for queries
+typed as you go ("senior py").
+"""
+from array import array
+from bisect import bisect_left
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import heapq
+import math
+import re
+
+import numpy as np
+
+
+# Words, with dotted parts and trailing +/# kept: "node.js", "c++", "c#", "3.5"
+_TOKEN = re.compile(r"[^\W_]+(?:\.[^\W_]+)*[+#]*")
+_QUERY = re.compile(r'"([^"]*)"|(\S+)')
+
+# Term id 0 separates fields in the stored token sequence, so phrases never span fields
+_FIELD_BREAK = 0
+
+MAX_PREFIX_EXPANSIONS = 50
+BISECT_RATIO = 16
+
+# Compact only once there are at least this many dead documents (and more dead than live)
+COMPACT_MIN_DEAD_DOCS = 1024
+
+
+class _Zero(dict):
+    """Mapping that reads 0.0 for every key (``within`` scores left out)"""
+
+    def __missing__(self, key: Any) -> float:
+        return 0.0
+
+
+_ZERO = _Zero()
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased search tokens of ``text``"""
+    return _TOKEN.findall(text.lower()) if text else []
+
+
+class _Clause:
+    __slots__ = ("kind", "terms")
+
+    def __init__(self, kind: str, terms: List[int]) -> None:
+        # "term" (one id), "phrase" (ids in order) or "prefix" (alternative ids)
+        self.kind = kind
+        self.terms = terms
+
+
+class SearchIndex:
+    """Inverted index over keyed documents made of weighted text fields"""
+
+    def __init__(self, field_weights: Dict[str, float], k1: float = 1.2, b: float = 0.75) -> None:
+        self.field_weights = field_weights
+        self.k1 = k1
+        self.b = b
+
+        self._vocab: Dict[str, int] = {}
+        # Posting lists indexed by term id; id 0 is the field break
+        self._doc_ids: List[array] = [array("I")]
+        self._freqs: List[array] = [array("f")]
+        # Live documents containing each term (posting lists also hold removed ones)
+        self._df = array("I", [0])
+
+        self._keys: List[Any] = []
+        self._key_docs: Dict[Any, int] = {}
+        self._lengths = array("f")
+        self._tokens = array("I")
+        self._token_ends = array("Q")
+        self._deleted: set = set()
+        self._total_length = 0.0
+
+        # Derived data, rebuilt lazily after changes
+        self._norms: Optional[List[float]] = None
+        self._sorted_terms: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return len(self._keys) - len(self._deleted)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._key_docs
+
+    def add(self, key: Any, fields: Dict[str, Optional[str]]) -> None:
+        """Index a document; adding an existing key replaces it"""
+        if key in self._key_docs:
+            self.remove(key)
+        doc = len(self._keys)
+        counts: Dict[int, float] = {}
+        length = 0.0
+        for name, weight in self.field_weights.items():
+            term_ids = [self._term_id(token) for token in tokenize(fields.get(name) or "")]
+            self._tokens.extend(term_ids)
+            self._tokens.append(_FIELD_BREAK)
+            for term_id in term_ids:
+                counts[term_id] = counts.get(term_id, 0.0) + weight
+            length += weight * len(term_ids)
+        for term_id, freq in counts.items():
+            self._doc_ids[term_id].append(doc)
+            self._freqs[term_id].append(freq)
+            self._df[term_id] += 1
+        self._token_ends.append(len(self._tokens))
+        self._lengths.append(length)
+        self._keys.append(key)
+        self._key_docs[key] = doc
+        self._total_length += length
+        self._norms = None
+
+    def remove(self, key: Any) -> bool:
+        """Drop a document; its postings stay behind as tombstones until the next compaction"""
+        doc = self._key_docs.pop(key, None)
+        if doc is None:
+            return False
+        start = self._token_ends[doc - 1] if doc else 0
+        for term_id in set(self._tokens[start:self._token_ends[doc]]):
+            if term_id != _FIELD_BREAK:
+                self._df[term_id] -= 1
+        self._deleted.add(doc)
+        self._total_length -= self._lengths[doc]
+        self._norms = None
+        if len(self._deleted) >= COMPACT_MIN_DEAD_DOCS and len(self._deleted) > len(self):
+            self._compact()
+        return True
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        accept: Optional[Callable[[Any], bool]] = None,
+        prefix_last: bool = False,
+    ) -> List[Tuple[Any, float]]:
+        """Best ``limit`` (key, score) pairs for ``query``, highest score first
+
+        ``accept`` filters candidate keys (e.g. location) before the top ``limit`` are picked.
+        ``prefix_last`` treats the last (unquoted) word as a prefix, as if it ended in ``*``.
+        """
+        scores = self._match(query, prefix_last)
+        if not scores:
+            return []
+        keys = self._keys
+        candidates: Iterator[Tuple[int, float]] = iter(scores.items())
+        if self._deleted:
+            deleted = self._deleted
+            candidates = ((doc, score) for doc, score in candidates if doc not in deleted)
+        if accept is not None:
+            candidates = ((doc, score) for doc, score in candidates if accept(keys[doc]))
+        best = heapq.nlargest(limit, candidates, key=itemgetter(1))
+        return [(keys[doc], score) for doc, score in best]
+
+    def _match(self, query: str, prefix_last: bool = False) -> Dict[int, float]:
+        clauses = self._parse(query, prefix_last)
+        if clauses is None:
+            return {}
+        # Rarest clause first, so later clauses only look at its (few) candidates
+        clauses.sort(key=self._clause_size)
+        scores: Optional[Dict[int, float]] = None
+        for clause in clauses:
+            scores = self._clause_scores(clause, scores)
+            if not scores:
+                return {}
+        return scores or {}
+
+    def _parse(self, query: str, prefix_last: bool = False) -> Optional[List[_Clause]]:
+        """Clauses for the query, or None if some clause can't match anything"""
+        clauses = []
+        parts = _QUERY.findall(query)
+        for position, (phrase, word) in enumerate(parts):
+            text = phrase if phrase else word
+            prefix = not phrase and (text.endswith("*") or (prefix_last and position == len(parts) - 1))
+            tokens = tokenize(text)
+            if not tokens:
+                continue
+            if prefix:
+                expansions = self._expand_prefix(tokens.pop())
+                if not expansions:
+                    return None
+                clauses.append(_Clause("prefix", expansions))
+            if tokens:
+                term_ids = [self._vocab.get(token) for token in tokens]
+                if None in term_ids:
+                    return None
+                # Punctuated words ("ci/cd", "scikit-learn") are matched as phrases
+                clauses.append(_Clause("term" if len(term_ids) == 1 else "phrase", term_ids))
+        return clauses or None
+
+    def _expand_prefix(self, prefix: str) -> List[int]:
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self._vocab)
+        terms = self._sorted_terms
+        expansions = []
+        for position in range(bisect_left(terms, prefix), len(terms)):
+            if not terms[position].startswith(prefix):
+                break
+            expansions.append(self._vocab[terms[position]])
+        if len(expansions) > MAX_PREFIX_EXPANSIONS:
+            # Keep the most common completions, and the prefix itself when it is a term
+            exact = self._vocab.get(prefix)
+            expansions = heapq.nlargest(
+                MAX_PREFIX_EXPANSIONS, expansions, key=lambda term_id: (term_id == exact, self._df[term_id])
+            )
+        return expansions
+
+    def _clause_size(self, clause: _Clause) -> int:
+        sizes = [len(self._doc_ids[term_id]) for term_id in clause.terms]
+        return sum(sizes) if clause.kind == "prefix" else min(sizes)
+
+    def _clause_scores(self, clause: _Clause, within: Optional[Dict[int, float]]) -> Dict[int, float]:
+        """Docs matching ``clause`` (restricted to ``within``), with ``within``'s scores added"""
+        if clause.kind == "prefix":
+            scores: Dict[int, float] = {}
+            for term_id in clause.terms:
+                for doc, score in self._term_scores(term_id, within, accumulate=False).items():
+                    scores[doc] = scores.get(doc, 0.0) + score
+            if within is not None:
+                return {doc: within[doc] + score for doc, score in scores.items()}
+            return scores
+
+        # Each term narrows the candidates and adds its score to theirs
+        scores = self._term_scores(clause.terms[0], within)
+        for term_id in clause.terms[1:]:
+            scores = self._term_scores(term_id, scores)
+        if clause.kind == "phrase":
+            pattern = array("I", clause.terms).tobytes()
+            scores = {doc: score for doc, score in scores.items() if self._contains_sequence(doc, pattern)}
+        return scores
+
+    def _term_scores(
+        self, term_id: int, within: Optional[Dict[int, float]], accumulate: bool = True
+    ) -> Dict[int, float]:
+        """BM25 score of one term for the docs containing it, restricted to ``within``
+
+        With ``accumulate`` the scores already in ``within`` are added on.
+        """
+        doc_ids = self._doc_ids[term_id]
+        freqs = self._freqs[term_id]
+        norms = self._length_norms()
+        live = len(self)
+        df = self._df[term_id]
+        idf = math.log(1.0 + (live - df + 0.5) / (df + 0.5))
+        scale = idf * (self.k1 + 1.0)
+
+        if within is None:
+            return {doc: scale * freq / (freq + norms[doc]) for doc, freq in zip(doc_ids, freqs)}
+        base = within if accumulate else _ZERO
+
+        # A binary search per candidate only beats one pass over the postings when the
+        # candidates are far fewer
+        postings = len(doc_ids)
+        if postings <= BISECT_RATIO * len(within):
+            return {
+                doc: base[doc] + scale * freq / (freq + norms[doc])
+                for doc, freq in zip(doc_ids, freqs) if doc in within
+            }
+        scores = {}
+        for doc in within:
+            position = bisect_left(doc_ids, doc)
+            if position < postings and doc_ids[position] == doc:
+                freq = freqs[position]
+                scores[doc] = base[doc] + scale * freq / (freq + norms[doc])
+        return scores
+
+    def _contains_sequence(self, doc: int, pattern: bytes) -> bool:
+        start = self._token_ends[doc - 1] if doc else 0
+        haystack = self._tokens[start:self._token_ends[doc]].tobytes()
+        position = haystack.find(pattern)
+        while position != -1:
+            # Only matches aligned to whole term ids count
+            if position % self._tokens.itemsize == 0:
+                return True
+            position = haystack.find(pattern, position + 1)
+        return False
+
+    def _length_norms(self) -> List[float]:
+        """Per-document BM25 length normalization, k1 * (1 - b + b * len / avg_len)"""
+        if self._norms is None:
+            live = len(self)
+            average = self._total_length / live if live else 1.0
+            k1, b = self.k1, self.b
+            base = k1 * (1.0 - b)
+            per_length = k1 * b / average if average else 0.0
+            self._norms = [base + per_length * length for length in self._lengths]
+        return self._norms
+
+    def _compact(self) -> None:
+        """Drop removed documents' postings and tokens, renumbering the live ones in order"""
+        alive = np.ones(len(self._keys), dtype=bool)
+        alive[list(self._deleted)] = False
+        remap = np.cumsum(alive, dtype=np.int64) - 1
+        remap[~alive] = -1
+
+        for term_id in range(1, len(self._doc_ids)):
+            doc_ids = np.frombuffer(self._doc_ids[term_id], dtype=np.uint32)
+            if not len(doc_ids):
+                continue
+            new_ids = remap[doc_ids]
+            keep = new_ids >= 0
+            self._doc_ids[term_id] = array("I", new_ids[keep].astype(np.uint32).tobytes())
+            self._freqs[term_id] = array("f", np.frombuffer(self._freqs[term_id], dtype=np.float32)[keep].tobytes())
+
+        ends = np.frombuffer(self._token_ends, dtype=np.uint64).astype(np.int64)
+        token_counts = np.diff(ends, prepend=0)
+        tokens = np.frombuffer(self._tokens, dtype=np.uint32)[np.repeat(alive, token_counts)]
+        self._tokens = array("I", tokens.tobytes())
+        self._token_ends = array("Q", np.cumsum(token_counts[alive]).astype(np.uint64).tobytes())
+        self._lengths = array("f", np.frombuffer(self._lengths, dtype=np.float32)[alive].tobytes())
+        self._keys = [key for key, live in zip(self._keys, alive.tolist()) if live]
+        self._key_docs = {key: doc for doc, key in enumerate(self._keys)}
+        self._deleted = set()
+        self._norms = None
+
+    def _term_id(self, token: str) -> int:
+        term_id = self._vocab.get(token)
+        if term_id is None:
+            term_id = len(self._doc_ids)
+            self._vocab[token] = term_id
+            self._doc_ids.append(array("I"))
+            self._freqs.append(array("f"))
+            self._df.append(0)
+            self._sorted_terms = None
+        return term_id
@@ -0,0 +1,51 @@
+"""
+Single-flight coalescing: concurrent callers with the same key share one in-flight call.
+"""
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+import asyncio
+
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Deduplicate identical concurrent async calls"""
+
+    def __init__(self) -> None:
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn`` once per key at a time; duplicates await the leader's result.
+
+        The shared call runs as its own task and every caller awaits it through
+        ``asyncio.shield``, so one caller being cancelled (e.g. a client disconnect)
+        doesn't cancel the work the others are waiting on.
+        """
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        task = asyncio.ensure_future(fn())
+        self._inflight[key] = task
+        self.leaders += 1
+        task.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.leaders + self.coalesced
+        return {
+            "in_flight": len(self._inflight),
+            "leader_calls": self.leaders,
+            "coalesced_calls": self.coalesced,
+            "coalesced_rate": round(self.coalesced / total, 4) if total else 0.0,
+        }
+
+    def _finish(self, key: str, task: asyncio.Future) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved in case every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,229 @@
+"""
+Skill extraction with an Aho-Corasick automaton.
+
+A skill vocabulary (canonical names plus aliases, e.g. ``kubernetes: k8s, kube``) is
+compiled once into a multi-pattern automaton. Matching lowercases the text, collapses
+whitespace and walks it once, whatever the vocabulary size; a hit only counts when it
+is not glued to other letters or digits, so ``java`` doesn't fire inside
+``javascript`` and ``ai`` doesn't fire inside ``maintain``. Overlapping hits are
+resolved leftmost-longest, so ``node js`` is node.js only, not also javascript.
+
+The vocabulary comes from SKILL_VOCABULARY_PATH when set: either a JSON object mapping
+each skill to its aliases (or a JSON list of skills), or a text file with one
+``skill: alias, alias`` line per skill.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+import json
+import logging
+import os
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SKILLS: Dict[str, List[str]] = {
+    "python": ["python3"],
+    "javascript": ["js", "ecmascript"],
+    "java": [],
+    "react": ["react.js", "reactjs"],
+    "node.js": ["nodejs", "node js"],
+    "sql": [],
+    "aws": ["amazon web services"],
+    "docker": [],
+    "kubernetes": ["k8s", "kube"],
+    "git": [],
+    "linux": [],
+    "html": ["html5"],
+    "css": ["css3"],
+    "typescript": [],
+    "angular": ["angularjs", "angular.js"],
+    "vue.js": ["vue", "vuejs"],
+    "mongodb": ["mongo"],
+    "postgresql": ["postgres", "psql"],
+    "mysql": [],
+    "redis": [],
+    "elasticsearch": ["elastic search"],
+    "machine learning": ["ml"],
+    "ai": ["artificial intelligence"],
+    "data science": [],
+    "analytics": [],
+    "tableau": [],
+    "power bi": ["powerbi"],
+    "agile": [],
+    "scrum": [],
+    "devops": [],
+    "ci/cd": ["ci cd", "continuous integration", "continuous delivery"],
+    "microservices": ["microservice"],
+    "api": ["apis"],
+    "rest": ["restful", "rest api", "rest apis"],
+    "graphql": [],
+    "tensorflow": [],
+    "pytorch": [],
+    "pandas": [],
+    "numpy": [],
+    "scikit-learn": ["sklearn", "scikit learn"],
+}
+
+SKILL_VOCABULARY_PATH = os.getenv("SKILL_VOCABULARY_PATH") or None
+
+
+class SkillMatcher:
+    """Finds known skills (by name or alias) in free text in a single pass"""
+
+    def __init__(self, vocabulary: Dict[str, Iterable[str]]) -> None:
+        # alias (or name) -> canonical name, all normalized like the text being matched
+        self.aliases: Dict[str, str] = {}
+        for skill, aliases in vocabulary.items():
+            canonical = _normalize(skill)
+            if not canonical:
+                continue
+            for name in (skill, *aliases):
+                normalized = _normalize(name)
+                if normalized:
+                    self.aliases.setdefault(normalized, canonical)
+        self.skills: List[str] = sorted(set(self.aliases.values()))
+        self._transitions, self._outputs = _build_automaton(self.aliases)
+
+    @classmethod
+    def from_file(cls, path: str) -> "SkillMatcher":
+        return cls(load_vocabulary(path))
+
+    @classmethod
+    def from_env(cls) -> "SkillMatcher":
+        if SKILL_VOCABULARY_PATH:
+            try:
+                return cls.from_file(SKILL_VOCABULARY_PATH)
+            except (OSError, ValueError) as e:
+                logger.warning("Could not load skill vocabulary from %s (%s); using the built-in list", SKILL_VOCABULARY_PATH, e)
+        return cls(DEFAULT_SKILLS)
+
+    def find(self, text: str) -> List[str]:
+        """Canonical skills mentioned in ``text``, each once, in order of first mention"""
+        found: Dict[str, None] = {}
+        for skill, _, _ in self.matches(text):
+            found.setdefault(skill, None)
+        return list(found)
+
+    def find_all(self, texts: Iterable[str]) -> List[str]:
+        """Like find() over several texts (e.g. a job's requirements and its description)"""
+        found: Dict[str, None] = {}
+        for text in texts:
+            for skill, _, _ in self.matches(text):
+                found.setdefault(skill, None)
+        return list(found)
+
+    def matches(self, text: str) -> List[Tuple[str, int, int]]:
+        """(canonical skill, start, end) for each match, with offsets into the normalized text
+
+        Overlaps are resolved leftmost-longest: the longest match at the earliest start
+        wins and any match overlapping it is dropped.
+        """
+        text = _normalize(text)
+        if not text:
+            return []
+        transitions, outputs = self._transitions, self._outputs
+        root = transitions[0]
+        results = []
+        state = 0
+        for position, char in enumerate(text):
+            # No state transitions back to the root, so a miss (None) falls back to it
+            state = transitions[state].get(char) or root.get(char, 0)
+            if not outputs[state]:
+                continue
+            end = position + 1
+            # Word boundaries: the match must not continue into a letter or digit on either side
+            if end < len(text) and _is_word_char(char) and _is_word_char(text[end]):
+                continue
+            for length, skill in outputs[state]:
+                start = end - length
+                if start and _is_word_char(text[start - 1]) and _is_word_char(text[start]):
+                    continue
+                results.append((skill, start, end))
+        if len(results) < 2:
+            return results
+        results.sort(key=lambda match: (match[1], -match[2]))
+        kept = []
+        covered_to = 0
+        for match in results:
+            if match[1] >= covered_to:
+                kept.append(match)
+                covered_to = match[2]
+        return kept
+
+    def canonical(self, name: str) -> str:
+        """The canonical skill for a name or alias (``K8s`` -> ``kubernetes``); other names are just normalized"""
+        normalized = _normalize(name)
+        return self.aliases.get(normalized, normalized)
+
+
+def load_vocabulary(path: str) -> Dict[str, List[str]]:
+    """Read a skill vocabulary file (JSON object/list, or ``skill: alias, alias`` lines)"""
+    with open(path, encoding="utf-8") as fh:
+        content = fh.read()
+    if path.lower().endswith(".json"):
+        data = json.loads(content)
+        if isinstance(data, list):
+            return {str(skill): [] for skill in data}
+        if isinstance(data, dict):
+            return {str(skill): [str(alias) for alias in (aliases or [])] for skill, aliases in data.items()}
+        raise ValueError("skill vocabulary JSON must be an object or a list")
+    vocabulary: Dict[str, List[str]] = {}
+    for line in content.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        skill, _, aliases = line.partition(":")
+        vocabulary[skill.strip()] = [alias.strip() for alias in aliases.split(",") if alias.strip()]
+    return vocabulary
+
+
+def _normalize(text: Optional[str]) -> str:
+    return " ".join(text.lower().split()) if text else ""
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum()
+
+
+def _build_automaton(patterns: Dict[str, str]) -> Tuple[List[Dict[str, int]], List[Tuple[Tuple[int, str], ...]]]:
+    """Aho-Corasick automaton as (transitions, outputs) per state; state 0 is the root
+
+    Failure links are resolved at build time: each state's transitions include those
+    inherited from its failure chain, except the root's own, which the matcher falls
+    back to. So matching costs one or two dict lookups per character and no loop.
+    outputs[state] holds the (pattern length, canonical skill) pairs ending there.
+    """
+    goto: List[Dict[str, int]] = [{}]
+    outputs: List[List[Tuple[int, str]]] = [[]]
+    for pattern, skill in patterns.items():
+        state = 0
+        for char in pattern:
+            next_state = goto[state].get(char)
+            if next_state is None:
+                next_state = len(goto)
+                goto[state][char] = next_state
+                goto.append({})
+                outputs.append([])
+            state = next_state
+        outputs[state].append((len(pattern), skill))
+
+    # Breadth-first: a state's failure link is the longest proper suffix that is also in
+    # the trie, so every state's link is final before its children are visited
+    fail = [0] * len(goto)
+    transitions: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in range(len(goto) - 1)]
+    queue = list(goto[0].values())
+    for state in queue:
+        if fail[state]:
+            transitions[state] = dict(transitions[fail[state]])
+        transitions[state].update(goto[state])
+        for char, next_state in goto[state].items():
+            queue.append(next_state)
+            link = fail[state]
+            while link and char not in goto[link]:
+                link = fail[link]
+            fail[next_state] = goto[link].get(char, 0)
+            # Patterns ending at the suffix state end here too
+            outputs[next_state].extend(outputs[fail[next_state]])
+    return transitions, [tuple(output) for output in outputs]
+
+
+skill_matcher = SkillMatcher.from_env()
@@ -0,0 +1,29 @@
+"""
+Server-Sent Events helpers for streaming endpoints
+"""
+from typing import Any, AsyncIterator, Optional, Tuple
+import json
+
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    # Disable proxy buffering (nginx) so tokens reach the client immediately
+    "X-Accel-Buffering": "no",
+}
+
+
+def format_sse(data: Any, event: Optional[str] = None) -> str:
+    """Encode one SSE message; ``data`` is serialized as JSON."""
+    payload = json.dumps(data, ensure_ascii=False)
+    if event:
+        return f"event: {event}\ndata: {payload}\n\n"
+    return f"data: {payload}\n\n"
+
+
+async def sse_stream(events: AsyncIterator[Tuple[str, Any]]) -> AsyncIterator[str]:
+    """Turn ``(event, data)`` pairs into SSE messages, reporting failures as an ``error`` event."""
+    try:
+        async for event, data in events:
+            yield format_sse(data, event)
+    except Exception as e:
+        yield format_sse({"detail": str(e)}, "error")
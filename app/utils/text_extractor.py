@@ -2,24 +2,24 @@
 Text extraction utilities for PDF and DOCX files
 """
 import io
-from typing import Optional
-from pdfminer.high_level import extract_text_to_fp
-from pdfminer.layout import LAParams
-from pdfminer.pdfinterp import PDFResourceManager
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator, Union
 from docx import Document
 from fastapi import HTTPException
+from app.utils.docx_stream import UnsupportedDocx, iter_docx_fragments
+from app.utils.text_normalizer import join_normalized, normalize_pages, normalize_text
 
 
 class TextExtractor:
     """Utility class for extracting text from various file formats"""
     
     @staticmethod
-    def extract_from_pdf(file_content: bytes) -> str:
+    def extract_from_pdf(file_content: Union[bytes, str]) -> str:
         """
-        Extract text from PDF file content
+        Extract text from PDF file content using the tiered extraction engine
         
         Args:
-            file_content: PDF file content as bytes
+            file_content: PDF file content as bytes, or a path to the file
             
         Returns:
             Extracted text as string
@@ -27,59 +27,19 @@ class TextExtractor:
         Raises:
             HTTPException: If PDF processing fails
         """
-        try:
-            # Create a string buffer to capture the extracted text
-            text_buffer = io.StringIO()
-            
-            # Create PDF resource manager and layout parameters
-            resource_manager = PDFResourceManager()
-            laparams = LAParams(
-                char_margin=2.0,
-                line_margin=0.5,
-                word_margin=0.1,
-                boxes_flow=0.5,
-                all_texts=False
-            )
-            
-            # Extract text to the buffer
-            extract_text_to_fp(
-                io.BytesIO(file_content),
-                text_buffer,
-                laparams=laparams,
-                output_type='text',
-                codec='utf-8'
-            )
-            
-            # Get the extracted text
-            extracted_text = text_buffer.getvalue()
-            text_buffer.close()
-            
-            # Clean up the text
-            cleaned_text = TextExtractor._clean_text(extracted_text)
-            
-            if not cleaned_text or len(cleaned_text.strip()) < 10:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Could not extract meaningful text from PDF. The file might be corrupted, password-protected, or contain only images."
-                )
-                
-            return cleaned_text
-            
-        except Exception as e:
-            if isinstance(e, HTTPException):
-                raise e
-            raise HTTPException(
-                status_code=400,
-                detail=f"Failed to process PDF file: {str(e)}"
-            )
+        # The tiered engine imports this module, so resolve it lazily
+        from app.utils.extraction_engine import extract_pdf
+
+        text, _ = extract_pdf(file_content)
+        return text
     
     @staticmethod
-    def extract_from_docx(file_content: bytes) -> str:
+    def extract_from_docx(file_content: Union[bytes, str]) -> str:
         """
         Extract text from DOCX file content
         
         Args:
-            file_content: DOCX file content as bytes
+            file_content: DOCX file content as bytes, or a path to the file
             
         Returns:
             Extracted text as string
@@ -88,35 +48,16 @@ class TextExtractor:
             HTTPException: If DOCX processing fails
         """
         try:
-            # Create a BytesIO object from the file content
-            doc_buffer = io.BytesIO(file_content)
-            
-            # Load the document
-            doc = Document(doc_buffer)
-            
-            # Extract text from all paragraphs
-            paragraphs = []
-            for paragraph in doc.paragraphs:
-                if paragraph.text.strip():
-                    paragraphs.append(paragraph.text.strip())
-            
-            # Extract text from tables
-            table_texts = []
-            for table in doc.tables:
-                for row in table.rows:
-                    row_texts = []
-                    for cell in row.cells:
-                        if cell.text.strip():
-                            row_texts.append(cell.text.strip())
-                    if row_texts:
-                        table_texts.append(" | ".join(row_texts))
-            
-            # Combine all text
-            all_text = paragraphs + table_texts
-            extracted_text = "\n".join(all_text)
-            
-            # Clean up the text
-            cleaned_text = TextExtractor._clean_text(extracted_text)
+            try:
+                # Stream word/document.xml: paragraphs and table rows in document order,
+                # cleaned one at a time as they are read
+                with TextExtractor._open_source(file_content) as doc_buffer:
+                    cleaned_text = join_normalized(normalize_pages(iter_docx_fragments(doc_buffer)))
+            except UnsupportedDocx:
+                # Exotic package: let python-docx load the whole document
+                with TextExtractor._open_source(file_content) as doc_buffer:
+                    doc = Document(doc_buffer)
+                cleaned_text = join_normalized(normalize_pages(TextExtractor._docx_fragments(doc)))
             
             if not cleaned_text or len(cleaned_text.strip()) < 10:
                 raise HTTPException(
@@ -135,12 +76,12 @@ class TextExtractor:
             )
     
     @staticmethod
-    def extract_text(file_content: bytes, file_extension: str) -> str:
+    def extract_text(file_content: Union[bytes, str], file_extension: str) -> str:
         """
         Extract text from file based on its extension
         
         Args:
-            file_content: File content as bytes
+            file_content: File content as bytes, or a path to the file
             file_extension: File extension (e.g., '.pdf', '.docx')
             
         Returns:
@@ -161,6 +102,30 @@ class TextExtractor:
                 detail=f"Unsupported file format: {file_extension}. Supported formats: .pdf, .docx"
             )
     
+    @staticmethod
+    def _docx_fragments(doc) -> Iterator[str]:
+        for paragraph in doc.paragraphs:
+            yield paragraph.text
+        for table in doc.tables:
+            for row in table.rows:
+                row_texts = [cell.text.strip() for cell in row.cells if cell.text.strip()]
+                if row_texts:
+                    yield " | ".join(row_texts)
+    
+    @staticmethod
+    @contextmanager
+    def _open_source(file_content: Union[bytes, str]) -> Iterator[BinaryIO]:
+        """Binary stream over in-memory content or a file on disk (read lazily, not copied)"""
+        if isinstance(file_content, str):
+            with open(file_content, "rb") as fh:
+                yield fh
+        else:
+            yield io.BytesIO(file_content)
+    
+    @staticmethod
+    def _has_meaningful_text(text: str) -> bool:
+        return bool(text and len(text.strip()) >= 10)
+    
     @staticmethod
     def _clean_text(text: str) -> str:
         """
@@ -172,20 +137,4 @@ class TextExtractor:
         Returns:
             Cleaned text
         """
-        if not text:
-            return ""
-        
-        # Remove excessive whitespace and normalize line breaks
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
-        
-        # Join lines with proper spacing
-        cleaned_text = '\n'.join(lines)
-        
-        # Remove excessive spaces between words
-        import re
-        cleaned_text = re.sub(r'\s+', ' ', cleaned_text)
-        
-        # Remove special characters that might be artifacts from PDF extraction
-        cleaned_text = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]', '', cleaned_text)
-        
-        return cleaned_text.strip()
+        return normalize_text(text)
@@ -0,0 +1,38 @@
+"""
+Streaming normalization for extracted text.
+
+Extractors hand over text piece by piece (a page, a paragraph, a table row) and each
+piece is cleaned as it arrives: control characters left behind by PDF extraction are
+dropped with one precompiled pattern and whitespace runs (including line breaks) collapse
+to single spaces. Only the cleaned pieces are kept, so a document is never held as raw
+text, line list and cleaned text at the same time.
+"""
+from typing import Iterable, Iterator
+import re
+
+
+# C0/C1 control characters that str.split() doesn't treat as whitespace. The rest
+# (\x1c-\x1f, \x85) become spaces, as they did when cleaning collapsed \s+ first.
+# A regex beats str.translate here: deletions via a translate table take CPython's
+# slow per-character path.
+_CONTROL_CHARS = re.compile(r"[\x00-\x08\x0e-\x1b\x7f-\x84\x86-\x9f]")
+
+
+def normalize_pages(pages: Iterable[str]) -> Iterator[str]:
+    """Clean whole pages (or paragraphs); every piece is treated as ending on a word boundary."""
+    for page in pages:
+        cleaned = normalize_text(page)
+        if cleaned:
+            yield cleaned
+
+
+def normalize_text(text: str) -> str:
+    """Clean a single string: drop control characters and collapse whitespace."""
+    if not text:
+        return ""
+    return " ".join(_CONTROL_CHARS.sub("", text).split())
+
+
+def join_normalized(fragments: Iterable[str]) -> str:
+    """Join the output of normalize_pages into the final document text."""
+    return " ".join(fragments)
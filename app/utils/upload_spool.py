@@ -0,0 +1,156 @@
+"""
+Size-capped upload handling.
+
+Request bodies for upload endpoints are counted as they stream in and rejected as soon
+as they pass the limit (or up front from Content-Length), and accepted files are copied
+in fixed-size chunks (hashing them on the way) to a named temp file so extraction
+workers can open them by path instead of receiving the whole file as bytes.
+"""
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, Optional
+import hashlib
+import os
+import tempfile
+
+from fastapi import HTTPException, UploadFile
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(10 * 1024 * 1024)))
+UPLOAD_CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", str(1024 * 1024)))
+UPLOAD_SPOOL_DIR = os.getenv("UPLOAD_SPOOL_DIR") or None
+
+# Allowance for multipart boundaries and part headers on top of the file itself
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+@dataclass
+class SpooledUpload:
+    """An accepted upload copied to a temp file"""
+
+    path: str
+    file_name: str
+    size: int
+    # Hex SHA-256 of the file bytes, computed while copying
+    sha256: str
+
+
+class UploadSizeLimitMiddleware:
+    """Reject request bodies over a per-path byte limit without buffering them.
+
+    Bodies announcing a larger Content-Length get a 413 before anything is read;
+    otherwise bytes are counted as the multipart parser pulls them and parsing is
+    aborted with a 413 the moment the limit is crossed.
+    """
+
+    def __init__(self, app: ASGIApp, limits: Dict[str, int]) -> None:
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        limit = self.limits.get(scope.get("path", "")) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        max_body = limit + MULTIPART_OVERHEAD_BYTES
+        headers = dict(scope.get("headers") or [])
+        content_length = headers.get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > max_body:
+            response = JSONResponse({"detail": _too_large_detail(limit)}, status_code=413)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_body:
+                    # Raised inside the route's body parsing, so FastAPI turns it into a response
+                    raise HTTPException(status_code=413, detail=_too_large_detail(limit))
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+@asynccontextmanager
+async def spool_upload(
+    upload: UploadFile,
+    max_bytes: int = MAX_UPLOAD_BYTES,
+    too_large_detail: Optional[str] = None,
+) -> AsyncIterator[SpooledUpload]:
+    """Copy ``upload`` to a temp file in chunks, enforcing ``max_bytes``; deleted on exit."""
+    spooled = await spool_to_temp(upload, max_bytes, too_large_detail)
+    try:
+        yield spooled
+    finally:
+        discard(spooled)
+
+
+async def spool_to_temp(
+    upload: UploadFile,
+    max_bytes: int = MAX_UPLOAD_BYTES,
+    too_large_detail: Optional[str] = None,
+) -> SpooledUpload:
+    """Like spool_upload, but the caller owns the temp file and must discard() it."""
+    detail = too_large_detail or _too_large_detail(max_bytes)
+
+    # The multipart parser already spooled the part; its size is known without reading it
+    size = _known_size(upload)
+    if size is not None and size > max_bytes:
+        raise HTTPException(status_code=400, detail=detail)
+
+    suffix = os.path.splitext(upload.filename or "")[1].lower()
+    fd, path = tempfile.mkstemp(prefix="upload-", suffix=suffix, dir=UPLOAD_SPOOL_DIR)
+    try:
+        written = 0
+        digest = hashlib.sha256()
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = await upload.read(UPLOAD_CHUNK_BYTES)
+                if not chunk:
+                    break
+                written += len(chunk)
+                if written > max_bytes:
+                    raise HTTPException(status_code=400, detail=detail)
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        _unlink(path)
+        raise
+    return SpooledUpload(path=path, file_name=upload.filename or "", size=written, sha256=digest.hexdigest())
+
+
+def discard(spooled: SpooledUpload) -> None:
+    """Delete a spooled upload's temp file (missing files are fine)."""
+    _unlink(spooled.path)
+
+
+def _unlink(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _known_size(upload: UploadFile) -> Optional[int]:
+    size = getattr(upload, "size", None)
+    if size is not None:
+        return size
+    try:
+        position = upload.file.tell()
+        upload.file.seek(0, os.SEEK_END)
+        end = upload.file.tell()
+        upload.file.seek(position)
+        return end - position
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def _too_large_detail(limit: int) -> str:
+    return f"File size too large. Please upload a file smaller than {limit // (1024 * 1024)}MB."
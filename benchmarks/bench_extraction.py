@@ -0,0 +1,267 @@
+"""
+Extraction regression benchmark.
+
+Runs every corpus document (see benchmarks/extraction_corpus.py) through the public
+TextExtractor entry point, the pooled ExtractionEngine and each engine tier forced
+over every page. It reports wall time, throughput, per-page latency and peak RSS.
+Each (document, method) pair runs in a fresh process, so RSS numbers don't bleed into
+each other.
+
+Results can be saved as a baseline and compared against later runs; the comparison
+exits non-zero when a case gets slower or heavier than the tolerance allows.
+
+    python -m benchmarks.bench_extraction
+    python -m benchmarks.bench_extraction --save-baseline benchmarks/baselines/extraction.json
+    python -m benchmarks.bench_extraction --compare benchmarks/baselines/extraction.json --tolerance 0.25
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+
+from benchmarks.bench_llm import percentile
+from benchmarks.extraction_corpus import write_corpus
+
+TIER_METHODS = ("tier:pypdf2", "tier:pdfminer", "tier:pdfminer_layout", "tier:ocr")
+PDF_METHODS = ("extract_text", "engine") + TIER_METHODS
+DOCX_METHODS = ("extract_text", "engine")
+
+# Differences below these are noise, whatever the ratio
+MIN_SECONDS_DELTA = 0.005
+MIN_RSS_DELTA_MB = 5.0
+
+
+def _peak_rss_mb(who: int) -> float:
+    import resource
+
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return resource.getrusage(who).ru_maxrss / scale
+
+
+def _run_tier(tier: str, path: str) -> List[float]:
+    """Force one tier over every page; returns per-page seconds"""
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfinterp import PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdfparser import PDFParser
+    from app.utils import extraction_engine as engine
+
+    if tier == engine.TIER_PYPDF2 and engine.PdfReader is None:
+        raise RuntimeError("skipped: PyPDF2 is not installed")
+    if tier == engine.TIER_OCR and not engine.ocr_available():
+        raise RuntimeError("skipped: OCR dependencies are not installed")
+
+    per_page: List[float] = []
+    with open(path, "rb") as source, open(path, "rb") as pypdf_source:
+        reader = engine.PdfReader(pypdf_source) if engine.PdfReader is not None else None
+        resources = PDFResourceManager(caching=True)
+        for index, page in enumerate(PDFPage.create_pages(PDFDocument(PDFParser(source)))):
+            started = time.perf_counter()
+            if tier == engine.TIER_OCR:
+                _, image_size = engine._probe_page(page)
+                engine.ocr_pdf_pages(path, [(index, engine._ocr_dpi(page, image_size))])
+            else:
+                engine._page_text(tier, resources, reader, index, page)
+            per_page.append(time.perf_counter() - started)
+    return per_page
+
+
+def _run_once(method: str, path: str, extension: str, pool: Any) -> Dict[str, Any]:
+    from app.utils.text_extractor import TextExtractor
+
+    if method == "extract_text":
+        TextExtractor.extract_text(path, extension)
+        return {}
+    if method == "engine":
+        import asyncio
+        from app.utils.extraction_engine import ExtractionEngine
+
+        _, report = asyncio.run(ExtractionEngine.from_env(pool).extract(path, extension))
+        return {"tier_pages": report.to_dict()["tier_pages"]}
+    return {"per_page": _run_tier(method.split(":", 1)[1], path)}
+
+
+def measure(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Runs in a fresh process: repeat one method on one document and collect its numbers"""
+    import resource
+
+    from fastapi import HTTPException
+
+    # Import everything up front so RSS growth reflects the extraction, not module loading
+    import app.utils.extraction_engine  # noqa: F401
+    from app.utils.extraction_pool import ExtractionPool
+
+    rss_before = _peak_rss_mb(resource.RUSAGE_SELF)
+    result: Dict[str, Any] = {
+        "case": job["case"], "kind": job["kind"], "method": job["method"],
+        "pages": job["pages"], "size_mb": round(os.path.getsize(job["path"]) / 1e6, 3),
+    }
+    timings: List[float] = []
+    per_page: List[float] = []
+    extra: Dict[str, Any] = {}
+    status = "ok"
+    pool = ExtractionPool(max_workers=job["workers"]) if job["method"] == "engine" else None
+    try:
+        if pool is not None:
+            # Untimed first run: starting worker processes is not part of steady-state cost
+            _run_once(job["method"], job["path"], job["extension"], pool)
+        deadline = time.perf_counter() + job["max_seconds"]
+        for _ in range(job["repeat"]):
+            started = time.perf_counter()
+            extra = _run_once(job["method"], job["path"], job["extension"], pool)
+            timings.append(time.perf_counter() - started)
+            per_page = extra.pop("per_page", per_page)
+            if time.perf_counter() > deadline:
+                break
+    except HTTPException as exc:
+        status = f"http {exc.status_code}: {exc.detail}"
+    except Exception as exc:
+        # Pathological documents are expected to fail in the raw tiers; record how
+        status = str(exc) if str(exc).startswith("skipped") else f"error {type(exc).__name__}: {exc}"
+    finally:
+        if pool is not None:
+            # Wait for the workers so their peak RSS is visible through RUSAGE_CHILDREN
+            pool.shutdown(wait=True)
+
+    result["status"] = status
+    result.update(extra)
+    if timings:
+        best = min(timings)
+        pages = job["pages"] or 0
+        if not per_page and pages:
+            per_page = [best / pages]
+        per_page.sort()
+        result.update({
+            "runs": len(timings),
+            "best_seconds": round(best, 4),
+            "throughput_mb_s": round(result["size_mb"] / best, 2) if best else 0.0,
+            "pages_per_second": round(pages / best, 1) if best and pages else None,
+            "page_p50_ms": round(percentile(per_page, 50) * 1000, 2) if per_page else None,
+            "page_p95_ms": round(percentile(per_page, 95) * 1000, 2) if per_page else None,
+        })
+    peak = _peak_rss_mb(resource.RUSAGE_SELF)
+    result["peak_rss_mb"] = round(peak, 1)
+    result["rss_growth_mb"] = round(peak - rss_before, 1)
+    # Pool workers (engine method) are separate processes
+    result["worker_peak_rss_mb"] = round(_peak_rss_mb(resource.RUSAGE_CHILDREN), 1)
+    return result
+
+
+def compare(results: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> List[Dict[str, Any]]:
+    """Rows for cases present in both runs, flagging time/RSS regressions beyond ``tolerance``"""
+    previous = {(r["case"], r["method"]): r for r in baseline.get("results", [])}
+    rows = []
+    for current in results:
+        before = previous.get((current["case"], current["method"]))
+        if not before or "best_seconds" not in current or "best_seconds" not in before:
+            continue
+        seconds_ratio = current["best_seconds"] / before["best_seconds"] if before["best_seconds"] else 1.0
+        rss_delta = current["rss_growth_mb"] - before["rss_growth_mb"]
+        slower = (seconds_ratio > 1 + tolerance
+                  and current["best_seconds"] - before["best_seconds"] > MIN_SECONDS_DELTA)
+        heavier = (rss_delta > MIN_RSS_DELTA_MB
+                   and current["rss_growth_mb"] > before["rss_growth_mb"] * (1 + tolerance))
+        rows.append({
+            "case": current["case"], "method": current["method"],
+            "seconds_before": before["best_seconds"], "seconds_after": current["best_seconds"],
+            "seconds_ratio": round(seconds_ratio, 3),
+            "rss_growth_before_mb": before["rss_growth_mb"], "rss_growth_after_mb": current["rss_growth_mb"],
+            "regression": slower or heavier,
+        })
+    return rows
+
+
+def print_results(results: List[Dict[str, Any]]) -> None:
+    header = (f"{'case':<18}{'method':<22}{'pages':>6}{'seconds':>10}{'MB/s':>8}{'pg/s':>8}"
+              f"{'p50 ms':>9}{'p95 ms':>9}{'RSS MB':>8}{'+RSS':>7}  status")
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['case']:<18}{r['method']:<22}{r['pages'] or '-':>6}{r.get('best_seconds', '-'):>10}"
+            f"{r.get('throughput_mb_s', '-'):>8}{r.get('pages_per_second') or '-':>8}"
+            f"{r.get('page_p50_ms') or '-':>9}{r.get('page_p95_ms') or '-':>9}"
+            f"{r['peak_rss_mb']:>8}{r['rss_growth_mb']:>7}  {r['status']}"
+        )
+
+
+def print_comparison(rows: List[Dict[str, Any]]) -> None:
+    header = f"{'case':<18}{'method':<22}{'before s':>10}{'after s':>10}{'ratio':>8}{'+RSS before':>13}{'+RSS after':>12}"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        flag = "  REGRESSION" if r["regression"] else ""
+        print(f"{r['case']:<18}{r['method']:<22}{r['seconds_before']:>10}{r['seconds_after']:>10}"
+              f"{r['seconds_ratio']:>8}{r['rss_growth_before_mb']:>13}{r['rss_growth_after_mb']:>12}{flag}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark document extraction over the generated corpus")
+    parser.add_argument("--corpus-dir", default=os.path.join(os.path.dirname(__file__), ".corpus"))
+    parser.add_argument("--cases", nargs="*", help="Only these corpus cases")
+    parser.add_argument("--methods", nargs="*", choices=PDF_METHODS, help="Only these methods")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the best one is reported")
+    parser.add_argument("--max-seconds", type=float, default=5.0, help="Stop repeating a case after this long")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Pool size for the engine method")
+    parser.add_argument("--json", dest="json_path", help="Also write results to this file")
+    parser.add_argument("--save-baseline", help="Write results as a baseline file")
+    parser.add_argument("--compare", help="Compare against a baseline file; exits 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown/RSS growth ratio")
+    args = parser.parse_args()
+
+    jobs = []
+    for case, path in write_corpus(args.corpus_dir, args.cases):
+        methods = PDF_METHODS if case.extension == ".pdf" else DOCX_METHODS
+        for method in methods:
+            if args.methods and method not in args.methods:
+                continue
+            jobs.append({
+                "case": case.name, "kind": case.kind, "method": method, "path": path,
+                "extension": case.extension, "pages": case.pages, "repeat": args.repeat,
+                "max_seconds": args.max_seconds, "workers": args.workers,
+            })
+
+    # A new process per job: ru_maxrss only ever grows within a process
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context, max_tasks_per_child=1) as executor:
+        results = list(executor.map(measure, jobs))
+
+    print_results(results)
+    report: Dict[str, Any] = {
+        "meta": {
+            "created": datetime.datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "workers": args.workers,
+        },
+        "results": results,
+    }
+
+    exit_code = 0
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            rows = compare(results, json.load(fh), args.tolerance)
+        print()
+        print_comparison(rows)
+        report["comparison"] = rows
+        if any(row["regression"] for row in rows):
+            exit_code = 1
+
+    for target in (args.json_path, args.save_baseline):
+        if target:
+            os.makedirs(os.path.dirname(os.path.abspath(target)), exist_ok=True)
+            with open(target, "w", encoding="utf-8") as fh:
+                json.dump(report, fh, indent=2)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
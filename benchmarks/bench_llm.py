@@ -0,0 +1,275 @@
+"""
+Latency/throughput benchmark for the LLM-backed service paths.
+
+Drives ResumeService, ChatService and JobService in-process against the fake LLM
+server (started on a free local port unless --base-url points at a running one) and
+reports throughput and p50/p95/p99 latency per scenario.
+
+    python -m benchmarks.bench_llm --requests 200 --concurrency 32 --latency-ms 400
+    python -m benchmarks.bench_llm --provider openai --error-rate 0.1 --json results.json
+"""
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import argparse
+import asyncio
+import importlib
+import json
+import math
+import os
+import socket
+import statistics
+import threading
+import time
+
+from benchmarks.fake_llm_server import add_config_arguments, config_from_args, create_app
+
+
+RESUME_TEXT = """
+John Doe - Backend Engineer
+SUMMARY
+Engineer with 6 years building Python services and data pipelines.
+EXPERIENCE
+Senior Engineer, Acme Corp (2020-2024): led migration of billing APIs to FastAPI and PostgreSQL,
+cut p95 latency by 40%, mentored four engineers.
+Engineer, Initech (2018-2020): built ETL jobs on AWS with Airflow, Docker and Redis.
+SKILLS
+Python, SQL, AWS, Docker, Kubernetes, Redis, CI/CD
+EDUCATION
+B.Sc. Computer Science
+"""
+
+JOB_DESCRIPTION = (
+    "We are hiring a backend engineer to design Python APIs, own PostgreSQL schemas, "
+    "deploy on AWS with Docker and Kubernetes, and improve observability."
+)
+
+SCENARIOS = ("resume.analyze", "resume.tailor", "chat.reply", "chat.stream", "chat.counseling", "chat.ats", "jobs.match")
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class FakeServerThread:
+    """Runs the fake LLM server under uvicorn in a background thread"""
+
+    def __init__(self, app, host: str = "127.0.0.1") -> None:
+        import uvicorn
+
+        self.host = host
+        self.port = _free_port(host)
+        self.server = uvicorn.Server(uvicorn.Config(app, host=host, port=self.port, log_level="critical"))
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def __enter__(self) -> "FakeServerThread":
+        self.thread.start()
+        deadline = time.monotonic() + 10
+        while not self.server.started:
+            if time.monotonic() > deadline or not self.thread.is_alive():
+                raise RuntimeError("Fake LLM server failed to start")
+            time.sleep(0.02)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.server.should_exit = True
+        self.thread.join(timeout=5)
+
+
+def _free_port(host: str) -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+def configure_environment(base_url: str, provider: str, use_cache: bool) -> None:
+    """Point the AI client at the target server; must run before app modules are imported."""
+    os.environ["OLLAMA_BASE_URL"] = base_url
+    if provider == "openai":
+        os.environ["OPENAI_API_KEY"] = os.environ.get("OPENAI_API_KEY") or "benchmark"
+        os.environ["OPENAI_BASE_URL"] = f"{base_url}/v1"
+    else:
+        os.environ.pop("OPENAI_API_KEY", None)
+    os.environ["LLM_CACHE_ENABLED"] = "true" if use_cache else "false"
+    os.environ.setdefault("LLM_CACHE_PATH", "")
+
+
+def build_scenarios(vary_prompts: bool) -> Dict[str, Callable[[int], Awaitable[Dict[str, Any]]]]:
+    resume_service = importlib.import_module("app.services.resume_service").ResumeService()
+    chat_service = importlib.import_module("app.services.chat_service").ChatService()
+    job_service = importlib.import_module("app.services.job_service").JobService()
+
+    def tag(i: int) -> str:
+        # Distinct prompts defeat request coalescing and caching unless asked otherwise
+        return f"\nRequest #{i}" if vary_prompts else ""
+
+    async def resume_analyze(i: int) -> Dict[str, Any]:
+        await resume_service.analyze_resume(RESUME_TEXT + tag(i), job_title="Backend Engineer")
+        return {}
+
+    async def resume_tailor(i: int) -> Dict[str, Any]:
+        await resume_service.tailor_resume(RESUME_TEXT + tag(i), JOB_DESCRIPTION, "Backend Engineer", "Acme")
+        return {}
+
+    async def chat_reply(i: int) -> Dict[str, Any]:
+        await chat_service.chat_response("How should I prepare for a system design interview?" + tag(i))
+        return {}
+
+    async def chat_stream(i: int) -> Dict[str, Any]:
+        started = time.perf_counter()
+        first_token: Optional[float] = None
+        async for event, _ in chat_service.stream_chat_response("How do I negotiate a raise?" + tag(i)):
+            if event == "token" and first_token is None:
+                first_token = time.perf_counter() - started
+        return {"ttft": first_token}
+
+    async def chat_counseling(i: int) -> Dict[str, Any]:
+        await chat_service.career_counseling(
+            current_role="Backend Engineer", experience_years=6, skills=["Python", "AWS"],
+            career_goals="Move into engineering management" + tag(i), challenges=["Limited leadership experience"],
+            industry="Technology",
+        )
+        return {}
+
+    async def chat_ats(i: int) -> Dict[str, Any]:
+        await chat_service.ats_analysis(RESUME_TEXT + tag(i), JOB_DESCRIPTION, "Greenhouse")
+        return {}
+
+    async def jobs_match(i: int) -> Dict[str, Any]:
+        # CPU-only path; measured alongside the LLM paths for reference
+        job_service.match_jobs(skills=["python", "aws", "docker", "sql"], experience_level="senior")
+        return {}
+
+    return {
+        "resume.analyze": resume_analyze,
+        "resume.tailor": resume_tailor,
+        "chat.reply": chat_reply,
+        "chat.stream": chat_stream,
+        "chat.counseling": chat_counseling,
+        "chat.ats": chat_ats,
+        "jobs.match": jobs_match,
+    }
+
+
+async def run_scenario(
+    name: str, fn: Callable[[int], Awaitable[Dict[str, Any]]], requests: int, concurrency: int, warmup: int
+) -> Dict[str, Any]:
+    for i in range(warmup):
+        await fn(-1 - i)
+
+    latencies: List[float] = []
+    ttfts: List[float] = []
+    errors: Dict[str, int] = {}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                extra = await fn(i)
+            except Exception as exc:
+                errors[type(exc).__name__] = errors.get(type(exc).__name__, 0) + 1
+                return
+            latencies.append(time.perf_counter() - started)
+            if extra.get("ttft") is not None:
+                ttfts.append(extra["ttft"])
+
+    wall_started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    wall = time.perf_counter() - wall_started
+
+    latencies.sort()
+    ttfts.sort()
+    result: Dict[str, Any] = {
+        "scenario": name,
+        "requests": requests,
+        "concurrency": concurrency,
+        "ok": len(latencies),
+        "errors": errors,
+        "wall_seconds": round(wall, 4),
+        "throughput_rps": round(len(latencies) / wall, 2) if wall else 0.0,
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    }
+    if ttfts:
+        result["ttft_p50_ms"] = round(percentile(ttfts, 50) * 1000, 2)
+        result["ttft_p95_ms"] = round(percentile(ttfts, 95) * 1000, 2)
+    return result
+
+
+def print_table(results: List[Dict[str, Any]]) -> None:
+    header = f"{'scenario':<18}{'ok':>6}{'err':>6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"{r['scenario']:<18}{r['ok']:>6}{sum(r['errors'].values()):>6}{r['throughput_rps']:>10}"
+            f"{r['p50_ms']:>10}{r['p95_ms']:>10}{r['p99_ms']:>10}"
+        )
+        if "ttft_p50_ms" in r:
+            print(f"{'  first token':<18}{'':>6}{'':>6}{'':>10}{r['ttft_p50_ms']:>10}{r['ttft_p95_ms']:>10}")
+
+
+async def run(args: argparse.Namespace, base_url: str) -> Dict[str, Any]:
+    configure_environment(base_url, args.provider, args.cache)
+    scenarios = build_scenarios(vary_prompts=not args.repeat_prompts)
+    ai_client = importlib.import_module("app.utils.ai_client").ai_client
+
+    selected = args.scenarios or list(SCENARIOS)
+    results = []
+    try:
+        for name in selected:
+            result = await run_scenario(name, scenarios[name], args.requests, args.concurrency, args.warmup)
+            results.append(result)
+        providers = ai_client.provider_status()
+        coalescing = ai_client.coalescing_stats()
+    finally:
+        await ai_client.aclose()
+    return {"base_url": base_url, "provider": args.provider, "results": results,
+            "providers": providers, "coalescing": coalescing}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the LLM-backed service paths")
+    parser.add_argument("--base-url", help="Use an already running server instead of starting the fake one")
+    parser.add_argument("--provider", choices=("ollama", "openai"), default="ollama")
+    parser.add_argument("--scenarios", nargs="*", choices=SCENARIOS)
+    parser.add_argument("--requests", type=int, default=100, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--cache", action="store_true", help="Leave the LLM response cache enabled")
+    parser.add_argument("--repeat-prompts", action="store_true",
+                        help="Send identical prompts so request coalescing/caching can kick in")
+    parser.add_argument("--json", dest="json_path", help="Also write results to this file")
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    if args.base_url:
+        report = asyncio.run(run(args, args.base_url.rstrip("/")))
+    else:
+        fake_app = create_app(config_from_args(args))
+        with FakeServerThread(fake_app) as server:
+            report = asyncio.run(run(args, server.url))
+            report["fake_server"] = dict(fake_app.state.fake.stats)
+
+    print_table(report["results"])
+    for provider in report["providers"]:
+        print(f"breaker {provider['name']}: {provider['state']} "
+              f"(calls={provider['calls']}, failures={provider['failures']}, opened={provider['times_opened']})")
+    if "fake_server" in report:
+        print("fake server:", json.dumps(report["fake_server"]))
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
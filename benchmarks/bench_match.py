@@ -0,0 +1,116 @@
+"""
+Job matching benchmark: vectorized match engine vs the previous per-job scoring loop.
+
+Builds a job corpus from the synthetic feed in bench_search (skills extracted at ingest,
+as the service does) and times top-20 matching for a few skill profiles, with and
+without a filter. The per-job loop match_jobs used before (score every job in Python,
+then sort them all) is timed on the same corpus for sizes up to --legacy-max.
+
+Each size runs in a fresh process.
+
+    python -m benchmarks.bench_match
+    python -m benchmarks.bench_match --sizes 10000 100000 --queries 100 --json match.json
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List
+import argparse
+import json
+import multiprocessing
+import time
+
+from benchmarks.bench_search import generate_jobs, _summary
+
+# (label, user skills, filters) cycled through during timing
+PROFILE_MIX = (
+    ("backend", ["python", "sql", "docker"], {}),
+    ("frontend", ["javascript", "react", "typescript"], {}),
+    ("one rare skill", ["scala"], {}),
+    ("filtered", ["python", "aws", "kubernetes"], {"location": "remote", "job_type": "contract"}),
+)
+
+
+def legacy_match(corpus, user_skills: List[str], filters: Dict[str, str]) -> List[Any]:
+    """The per-job scoring loop match_jobs used before the engine (minus the models)."""
+    matches = []
+    for record in corpus.filter(**filters):
+        job_skills = record.skills
+        matched = [s for s in job_skills if s in user_skills or any(u in s or s in u for u in user_skills)]
+        score = 50 if not job_skills else len(matched) / len(job_skills) * 100
+        if round(score, 1) > 30:
+            matches.append((record, round(score, 1)))
+    matches.sort(key=lambda m: m[1], reverse=True)
+    return matches[:20]
+
+
+def measure(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Runs in a fresh process: build the corpus for one feed size and time the profile mix"""
+    from app.services.job_corpus import JobCorpus, skill_coverage
+
+    size = job["size"]
+    started = time.perf_counter()
+    corpus = JobCorpus.from_jobs(generate_jobs(size))
+    build_seconds = time.perf_counter() - started
+
+    def engine(profile):
+        _, skills, filters = profile
+        return corpus.match(skill_coverage(skills), limit=20, min_score=30, **filters)
+
+    # Untimed warm-up: the engine's arrays are materialized on first use
+    for profile in PROFILE_MIX:
+        engine(profile)
+
+    def timed(run, runs: int) -> Dict[str, Dict[str, float]]:
+        timings: Dict[str, List[float]] = {}
+        for i in range(runs):
+            profile = PROFILE_MIX[i % len(PROFILE_MIX)]
+            started = time.perf_counter()
+            run(profile)
+            timings.setdefault(profile[0], []).append(time.perf_counter() - started)
+        return {label: _summary(t) for label, t in timings.items()}
+
+    result: Dict[str, Any] = {
+        "size": size,
+        "build_seconds": round(build_seconds, 2),
+        "matches": {label: engine((label, skills, filters))[1] for label, skills, filters in PROFILE_MIX},
+        "engine": timed(engine, job["queries"]),
+    }
+    if size <= job["legacy_max"]:
+        result["legacy"] = timed(lambda p: legacy_match(corpus, p[1], p[2]), max(len(PROFILE_MIX), job["queries"] // 10))
+    return result
+
+
+def print_results(results: List[Dict[str, Any]]) -> None:
+    header = f"{'size':>9}  {'profile':<16}{'matches':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'legacy p50':>12}{'speedup':>9}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        for label, _, _ in PROFILE_MIX:
+            stats = r["engine"][label]
+            legacy = r.get("legacy", {}).get(label)
+            speedup = f"{legacy['p50_ms'] / stats['p50_ms']:.0f}x" if legacy and stats["p50_ms"] else "-"
+            print(f"{r['size']:>9}  {label:<16}{r['matches'][label]:>9}{stats['p50_ms']:>10}{stats['p95_ms']:>10}"
+                  f"{stats['p99_ms']:>10}{legacy['p50_ms'] if legacy else '-':>12}{speedup:>9}")
+        print(f"{'':>9}  build {r['build_seconds']}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark job matching over a synthetic feed")
+    parser.add_argument("--sizes", type=int, nargs="*", default=[10_000, 100_000])
+    parser.add_argument("--queries", type=int, default=200, help="Timed engine queries per size")
+    parser.add_argument("--legacy-max", type=int, default=100_000, help="Largest size to also time the per-job loop on")
+    parser.add_argument("--json", dest="json_path", help="Also write results to this file")
+    args = parser.parse_args()
+
+    jobs = [{"size": size, "queries": args.queries, "legacy_max": args.legacy_max} for size in args.sizes]
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context, max_tasks_per_child=1) as executor:
+        results = list(executor.map(measure, jobs))
+
+    print_results(results)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as fh:
+            json.dump({"results": results}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Throughput and peak-memory benchmark for extracted-text normalization.
+
+Compares the previous whole-document cleaner (join every page, split into lines,
+re-join, two regex passes) with the streaming normalizer that cleans page by page.
+Pages are generated lazily, the way extraction produces them, so peak memory reflects
+what each approach holds on top of its output.
+
+    python -m benchmarks.bench_normalize --pages 500 --page-kb 8
+    python -m benchmarks.bench_normalize --pages 2000 --json normalize.json
+"""
+from typing import Any, Callable, Dict, Iterator, List
+import argparse
+import json
+import random
+import re
+import time
+import tracemalloc
+
+from app.utils.text_normalizer import join_normalized, normalize_pages
+
+WORDS = (
+    "python", "engineer", "aws", "docker", "kubernetes", "led", "migration", "of", "billing",
+    "apis", "to", "fastapi", "and", "postgresql", "cut", "latency", "by", "40%", "mentored",
+)
+# Whitespace and extraction artifacts typical of pdfminer/OCR output
+NOISE = ("  ", "\n", "\n\n", "\t", " \x0c", "\x00", "\x1b", " ", "\r\n", "   \n  ")
+
+
+def generate_pages(pages: int, page_kb: int, seed: int) -> Iterator[str]:
+    rng = random.Random(seed)
+    target = page_kb * 1024
+    for _ in range(pages):
+        parts: List[str] = []
+        size = 0
+        while size < target:
+            word = rng.choice(WORDS)
+            sep = rng.choice(NOISE) if rng.random() < 0.3 else " "
+            parts.append(word)
+            parts.append(sep)
+            size += len(word) + len(sep)
+        yield "".join(parts)
+
+
+def legacy_clean_text(text: str) -> str:
+    """The cleaner this benchmark replaces, kept verbatim as the baseline."""
+    if not text:
+        return ""
+    lines = [line.strip() for line in text.split('\n') if line.strip()]
+    cleaned_text = '\n'.join(lines)
+    cleaned_text = re.sub(r'\s+', ' ', cleaned_text)
+    cleaned_text = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]', '', cleaned_text)
+    return cleaned_text.strip()
+
+
+def run_legacy(pages: Iterator[str]) -> str:
+    return legacy_clean_text("\n".join(pages))
+
+
+def run_streaming(pages: Iterator[str]) -> str:
+    return join_normalized(normalize_pages(pages))
+
+
+APPROACHES: Dict[str, Callable[[Iterator[str]], str]] = {
+    "legacy": run_legacy,
+    "streaming": run_streaming,
+}
+
+
+def measure(name: str, fn: Callable[[Iterator[str]], str], args: argparse.Namespace) -> Dict[str, Any]:
+    input_bytes = args.pages * args.page_kb * 1024
+    timings: List[float] = []
+    output = ""
+    # Timed runs read pre-generated pages so generation cost isn't measured
+    pages = list(generate_pages(args.pages, args.page_kb, args.seed))
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        output = fn(iter(pages))
+        timings.append(time.perf_counter() - started)
+    del pages
+
+    # Separate pass for memory, with pages generated lazily as extraction would produce them
+    tracemalloc.start()
+    output = fn(generate_pages(args.pages, args.page_kb, args.seed))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = min(timings)
+    return {
+        "approach": name,
+        "input_mb": round(input_bytes / 1e6, 2),
+        "output_mb": round(len(output) / 1e6, 2),
+        "best_seconds": round(best, 4),
+        "throughput_mb_s": round(input_bytes / 1e6 / best, 1) if best else 0.0,
+        # Includes generating the input pages and the output string itself
+        "peak_mb": round(peak / 1e6, 2),
+        "output": output,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark extracted-text normalization")
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--page-kb", type=int, default=8, help="Approximate raw text per page")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", dest="json_path", help="Also write results to this file")
+    args = parser.parse_args()
+
+    results = [measure(name, fn, args) for name, fn in APPROACHES.items()]
+    # The legacy cleaner can leave a double space where it deleted a control character
+    baseline = " ".join(results[0]["output"].split())
+    for result in results:
+        result["matches_legacy"] = result.pop("output") == baseline
+
+    header = f"{'approach':<12}{'input MB':>10}{'seconds':>10}{'MB/s':>10}{'peak MB':>10}{'same':>7}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['approach']:<12}{r['input_mb']:>10}{r['best_seconds']:>10}{r['throughput_mb_s']:>10}"
+              f"{r['peak_mb']:>10}{str(r['matches_legacy']):>7}")
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as fh:
+            json.dump({"pages": args.pages, "page_kb": args.page_kb, "results": results}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+Job search benchmark: BM25 inverted index vs the previous substring scan.
+
+Generates a deterministic synthetic job feed (titles, companies, descriptions and
+requirements drawn from skewed vocabularies, so some terms are common and most are
+rare), indexes it the way the job corpus does and times a mix of queries: common and rare
+terms, multi-term, phrase and prefix. The substring scan that search_jobs used before
+is timed on the same feed for sizes up to --legacy-max.
+
+Each size runs in a fresh process so build time and RSS growth are not mixed up.
+
+    python -m benchmarks.bench_search
+    python -m benchmarks.bench_search --sizes 10000 100000 --queries 200 --json search.json
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List
+import argparse
+import json
+import multiprocessing
+import random
+import time
+
+from benchmarks.bench_extraction import _peak_rss_mb
+from benchmarks.bench_llm import percentile
+
+SENIORITY = ("junior", "senior", "staff", "lead", "principal", "associate", "")
+ROLES = (
+    "python developer", "backend engineer", "frontend developer", "data scientist",
+    "devops engineer", "site reliability engineer", "machine learning engineer",
+    "product manager", "data engineer", "mobile developer", "qa engineer", "security analyst",
+)
+SKILLS = (
+    "python", "java", "javascript", "typescript", "react", "node.js", "sql", "aws", "docker",
+    "kubernetes", "terraform", "postgresql", "redis", "kafka", "spark", "airflow", "django",
+    "fastapi", "graphql", "tensorflow", "pytorch", "pandas", "c++", "c#", "go", "rust", "scala",
+)
+FILLER = (
+    "we", "are", "looking", "for", "a", "to", "join", "our", "team", "you", "will", "work", "on",
+    "building", "scalable", "services", "and", "apis", "with", "the", "in", "of", "experience",
+    "years", "strong", "skills", "design", "systems", "platform", "customers", "growth", "data",
+    "pipelines", "cloud", "infrastructure", "collaborate", "across", "product", "teams",
+)
+
+# (label, query) pairs cycled through during timing
+QUERY_MIX = (
+    ("common term", "engineer"),
+    ("rare term", "rust"),
+    ("two terms", "python developer"),
+    ("three terms", "senior kubernetes terraform"),
+    ("phrase", '"machine learning"'),
+    ("prefix", "kube*"),
+    ("company prefix", "zor*"),
+    ("no match", "cobol"),
+)
+
+
+def _zipf_choice(rng: random.Random, items: tuple) -> str:
+    # Earlier items are much more common, like real skill/term frequencies
+    return items[min(int(rng.paretovariate(1.2)) - 1, len(items) - 1)]
+
+
+def _company(rng: random.Random) -> str:
+    syllables = ("zor", "tek", "quan", "vex", "lumi", "nova", "cor", "byte", "sys", "gen", "ax", "io")
+    return "".join(rng.choice(syllables) for _ in range(rng.randint(2, 3))).capitalize() + rng.choice(
+        (" Inc.", " Labs", " Corp", " Systems", "")
+    )
+
+
+def generate_jobs(count: int, seed: int = 11) -> Iterator[Dict[str, Any]]:
+    rng = random.Random(seed)
+    for _ in range(count):
+        role = _zipf_choice(rng, ROLES)
+        title = f"{rng.choice(SENIORITY)} {role}".strip().title()
+        skills = {_zipf_choice(rng, SKILLS) for _ in range(rng.randint(2, 6))}
+        words = [rng.choice(FILLER) for _ in range(rng.randint(15, 35))]
+        for skill in skills:
+            words.insert(rng.randrange(len(words) + 1), skill)
+        yield {
+            "title": title,
+            "company": _company(rng),
+            "location": rng.choice(("Remote", "New York, NY", "Austin, TX", "Seattle, WA", "Berlin")),
+            "description": " ".join(words).capitalize() + ".",
+            "requirements": [f"{rng.randint(1, 8)}+ years {skill}" for skill in sorted(skills)],
+            "job_type": rng.choice(("full-time", "contract", "part-time")),
+            "experience_level": rng.choice(("entry", "mid", "senior")),
+        }
+
+
+def legacy_search(jobs: List[Dict[str, Any]], query: str, limit: int = 10) -> List[Dict[str, Any]]:
+    """The scan search_jobs used before the index, kept verbatim as the baseline."""
+    matching_jobs = []
+    query_lower = query.lower()
+    for job in jobs:
+        if (query_lower in job["title"].lower() or
+                query_lower in job["company"].lower() or
+                query_lower in job["description"].lower()):
+            matching_jobs.append(job)
+    return matching_jobs[:limit]
+
+
+def _latencies(run, queries: List[str]) -> Dict[str, List[float]]:
+    timings: Dict[str, List[float]] = {}
+    for label, query in queries:
+        started = time.perf_counter()
+        run(query)
+        timings.setdefault(label, []).append(time.perf_counter() - started)
+    return timings
+
+
+def _summary(seconds: List[float]) -> Dict[str, float]:
+    seconds = sorted(seconds)
+    return {
+        "p50_ms": round(percentile(seconds, 50) * 1000, 3),
+        "p95_ms": round(percentile(seconds, 95) * 1000, 3),
+        "p99_ms": round(percentile(seconds, 99) * 1000, 3),
+    }
+
+
+def measure(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Runs in a fresh process: build the index for one feed size and time the query mix"""
+    import resource
+
+    from app.services.job_corpus import SEARCH_FIELD_WEIGHTS, search_fields
+    from app.utils.search_index import SearchIndex
+
+    size = job["size"]
+    queries = [QUERY_MIX[i % len(QUERY_MIX)] for i in range(job["queries"])]
+    keep_jobs = size <= job["legacy_max"]
+
+    rss_before = _peak_rss_mb(resource.RUSAGE_SELF)
+    started = time.perf_counter()
+    index = SearchIndex(SEARCH_FIELD_WEIGHTS)
+    jobs: List[Dict[str, Any]] = []
+    for position, posting in enumerate(generate_jobs(size)):
+        index.add(position, search_fields(posting))
+        if keep_jobs:
+            jobs.append(posting)
+    build_seconds = time.perf_counter() - started
+    # Index memory only; the kept job dicts (for the legacy scan) would inflate it
+    rss_growth = _peak_rss_mb(resource.RUSAGE_SELF) - rss_before
+
+    # Untimed warm-up: length norms and the sorted vocabulary are built on first use
+    for _, query in QUERY_MIX:
+        index.search(query)
+
+    result: Dict[str, Any] = {
+        "size": size,
+        "build_seconds": round(build_seconds, 2),
+        "index_rss_mb": round(rss_growth, 1) if not keep_jobs else None,
+        "hits": {label: len(index.search(query, limit=size)) for label, query in QUERY_MIX},
+        "index": {label: _summary(t) for label, t in _latencies(lambda q: index.search(q, limit=10), queries).items()},
+    }
+    if keep_jobs:
+        legacy_queries = queries[: max(len(QUERY_MIX), job["queries"] // 10)]
+        result["legacy"] = {
+            label: _summary(t) for label, t in _latencies(lambda q: legacy_search(jobs, q), legacy_queries).items()
+        }
+    return result
+
+
+def print_results(results: List[Dict[str, Any]]) -> None:
+    header = f"{'size':>9}  {'query':<16}{'hits':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'legacy p50':>12}{'speedup':>9}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        for label, _ in QUERY_MIX:
+            stats = r["index"][label]
+            legacy = r.get("legacy", {}).get(label)
+            speedup = f"{legacy['p50_ms'] / stats['p50_ms']:.0f}x" if legacy and stats["p50_ms"] else "-"
+            print(f"{r['size']:>9}  {label:<16}{r['hits'][label]:>9}{stats['p50_ms']:>10}{stats['p95_ms']:>10}"
+                  f"{stats['p99_ms']:>10}{legacy['p50_ms'] if legacy else '-':>12}{speedup:>9}")
+        rss = f", index RSS {r['index_rss_mb']} MB" if r["index_rss_mb"] is not None else ""
+        print(f"{'':>9}  build {r['build_seconds']}s{rss}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark job search over a synthetic feed")
+    parser.add_argument("--sizes", type=int, nargs="*", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=400, help="Timed index queries per size")
+    parser.add_argument("--legacy-max", type=int, default=100_000, help="Largest size to also time the substring scan on")
+    parser.add_argument("--json", dest="json_path", help="Also write results to this file")
+    args = parser.parse_args()
+
+    jobs = [{"size": size, "queries": args.queries, "legacy_max": args.legacy_max} for size in args.sizes]
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context, max_tasks_per_child=1) as executor:
+        results = list(executor.map(measure, jobs))
+
+    print_results(results)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as fh:
+            json.dump({"results": results}, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
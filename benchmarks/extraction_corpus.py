@@ -0,0 +1,268 @@
+"""
+Deterministic document corpus for extraction benchmarks.
+
+Everything is generated locally (no fixtures checked in): text PDFs from 1 to 50
+pages, scanned-image PDFs, a mixed text/scan PDF, DOCX files with large and merged
+tables, and pathological PDFs (positioned glyphs without spaces, hundreds of empty
+pages, one huge page, a truncated file).
+
+    python -m benchmarks.extraction_corpus --out benchmarks/.corpus
+"""
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+import argparse
+import io
+import os
+import random
+import zlib
+
+
+WORDS = (
+    "python", "engineer", "aws", "docker", "kubernetes", "led", "migration", "of", "billing",
+    "apis", "to", "fastapi", "and", "postgresql", "cut", "p95", "latency", "by", "40%",
+    "mentored", "four", "engineers", "built", "etl", "jobs", "with", "airflow", "redis",
+)
+
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792
+
+
+@dataclass
+class CorpusCase:
+    name: str
+    # "text_pdf", "scanned_pdf", "mixed_pdf", "docx", "pathological_pdf"
+    kind: str
+    extension: str
+    pages: Optional[int]
+    build: Callable[[], bytes]
+
+
+class PDFBuilder:
+    """Minimal PDF writer: numbered objects, optional Flate streams, one page tree"""
+
+    def __init__(self) -> None:
+        self.objects: List[Optional[bytes]] = [None, None]  # 1 catalog, 2 page tree
+        self.page_ids: List[int] = []
+
+    def add(self, body: bytes) -> int:
+        self.objects.append(body)
+        return len(self.objects)
+
+    def stream(self, data: bytes, attrs: str = "", compress: bool = True) -> int:
+        if compress:
+            data = zlib.compress(data)
+            attrs += " /Filter /FlateDecode"
+        return self.add(b"<< /Length %d%s >>\nstream\n" % (len(data), attrs.encode()) + data + b"\nendstream")
+
+    def page(self, content: bytes, resources: str) -> int:
+        contents = self.stream(content)
+        page_id = self.add(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources {resources} /Contents {contents} 0 R >>".encode()
+        )
+        self.page_ids.append(page_id)
+        return page_id
+
+    def build(self) -> bytes:
+        kids = " ".join(f"{page_id} 0 R" for page_id in self.page_ids)
+        self.objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+        self.objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(self.page_ids)} >>".encode()
+        out = io.BytesIO()
+        out.write(b"%PDF-1.4\n")
+        offsets = []
+        for number, body in enumerate(self.objects, start=1):
+            offsets.append(out.tell())
+            out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+        xref = out.tell()
+        out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(self.objects) + 1))
+        for offset in offsets:
+            out.write(b"%010d 00000 n \n" % offset)
+        out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(self.objects) + 1, xref))
+        return out.getvalue()
+
+    def font(self) -> int:
+        return self.add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _lines(rng: random.Random, count: int, words: Tuple[int, int] = (8, 14)) -> List[str]:
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(*words))) for _ in range(count)]
+
+
+def _text_content(lines: List[str], size: int = 10, leading: int = 14) -> bytes:
+    body = " ".join(f"({_escape(line)}) Tj T*" for line in lines)
+    return f"BT /F1 {size} Tf {leading} TL 54 {PAGE_HEIGHT - 54} Td {body} ET".encode()
+
+
+def _scan_image(rng: random.Random, width: int, height: int) -> bytes:
+    """8-bit grayscale page: white background with dark bars laid out like lines of words"""
+    white = b"\xff" * width
+    rows = []
+    y = 0
+    while y < height:
+        if y % 28 < 12 and 60 < y < height - 60:
+            row = bytearray(white)
+            x = 60
+            while x < width - 60:
+                word = rng.randint(20, 90)
+                row[x:min(x + word, width - 60)] = b"\x20" * (min(x + word, width - 60) - x)
+                x += word + rng.randint(8, 16)
+            rows.append(bytes(row))
+        else:
+            rows.append(white)
+        y += 1
+    return b"".join(rows)
+
+
+def text_pdf(pages: int, seed: int = 1) -> bytes:
+    rng = random.Random(seed)
+    pdf = PDFBuilder()
+    font = pdf.font()
+    for _ in range(pages):
+        pdf.page(_text_content(_lines(rng, 48)), f"<< /Font << /F1 {font} 0 R >> >>")
+    return pdf.build()
+
+
+def scanned_pdf(pages: int, dpi: int = 150, seed: int = 2) -> bytes:
+    rng = random.Random(seed)
+    pdf = PDFBuilder()
+    width, height = PAGE_WIDTH * dpi // 72, PAGE_HEIGHT * dpi // 72
+    for _ in range(pages):
+        image = pdf.stream(
+            _scan_image(rng, width, height),
+            f" /Type /XObject /Subtype /Image /Width {width} /Height {height}"
+            " /ColorSpace /DeviceGray /BitsPerComponent 8",
+        )
+        pdf.page(f"q {PAGE_WIDTH} 0 0 {PAGE_HEIGHT} 0 0 cm /Im1 Do Q".encode(), f"<< /XObject << /Im1 {image} 0 R >> >>")
+    return pdf.build()
+
+
+def mixed_pdf(pages: int, seed: int = 3) -> bytes:
+    """Text pages with every third page scanned, the case selective OCR targets"""
+    rng = random.Random(seed)
+    pdf = PDFBuilder()
+    font = pdf.font()
+    width, height = PAGE_WIDTH * 150 // 72, PAGE_HEIGHT * 150 // 72
+    for index in range(pages):
+        if index % 3 == 2:
+            image = pdf.stream(
+                _scan_image(rng, width, height),
+                f" /Type /XObject /Subtype /Image /Width {width} /Height {height}"
+                " /ColorSpace /DeviceGray /BitsPerComponent 8",
+            )
+            pdf.page(f"q {PAGE_WIDTH} 0 0 {PAGE_HEIGHT} 0 0 cm /Im1 Do Q".encode(), f"<< /XObject << /Im1 {image} 0 R >> >>")
+        else:
+            pdf.page(_text_content(_lines(rng, 48)), f"<< /Font << /F1 {font} 0 R >> >>")
+    return pdf.build()
+
+
+def glyph_soup_pdf(pages: int, seed: int = 4) -> bytes:
+    """Every glyph positioned on its own with no space characters (forces the layout tier)"""
+    rng = random.Random(seed)
+    pdf = PDFBuilder()
+    font = pdf.font()
+    for _ in range(pages):
+        ops = ["BT /F1 10 Tf"]
+        for row, line in enumerate(_lines(rng, 40)):
+            x, y = 54.0, PAGE_HEIGHT - 54 - row * 14
+            for word in line.split():
+                for char in word:
+                    ops.append(f"1 0 0 1 {x:.1f} {y} Tm ({_escape(char)}) Tj")
+                    x += 6.0
+                x += 5.0
+        ops.append("ET")
+        pdf.page(" ".join(ops).encode(), f"<< /Font << /F1 {font} 0 R >> >>")
+    return pdf.build()
+
+
+def empty_pages_pdf(pages: int) -> bytes:
+    pdf = PDFBuilder()
+    font = pdf.font()
+    for index in range(pages):
+        # One line of text at the end so the document is not rejected outright
+        content = _text_content(["end of document " * 3]) if index == pages - 1 else b""
+        pdf.page(content, f"<< /Font << /F1 {font} 0 R >> >>" if content else "<< >>")
+    return pdf.build()
+
+
+def huge_page_pdf(lines: int, seed: int = 5) -> bytes:
+    rng = random.Random(seed)
+    pdf = PDFBuilder()
+    font = pdf.font()
+    pdf.page(_text_content(_lines(rng, lines), size=2, leading=2), f"<< /Font << /F1 {font} 0 R >> >>")
+    return pdf.build()
+
+
+def truncated_pdf() -> bytes:
+    data = text_pdf(5, seed=6)
+    return data[: len(data) // 2]
+
+
+def docx_tables(rows: int, cols: int = 6, merged: bool = False, seed: int = 7) -> bytes:
+    from docx import Document
+    from docx.table import _Cell
+
+    rng = random.Random(seed)
+    doc = Document()
+    for line in _lines(rng, 20):
+        doc.add_paragraph(line)
+    table = doc.add_table(rows=rows, cols=cols)
+    # table.cell()/row.cells rebuild the whole cell grid on every call; go through the XML rows
+    for r, tr in enumerate(table._tbl.tr_lst):
+        cells = [_Cell(tc, table) for tc in tr.tc_lst]
+        for cell in cells:
+            cell.text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4)))
+        if merged and r % 2 == 0:
+            # Merged cells make python-docx repeat the same cell in row.cells
+            cells[0].merge(cells[cols // 2])
+    for line in _lines(rng, 20):
+        doc.add_paragraph(line)
+    out = io.BytesIO()
+    doc.save(out)
+    return out.getvalue()
+
+
+def corpus_cases() -> List[CorpusCase]:
+    cases = [CorpusCase(f"text-{n}p", "text_pdf", ".pdf", n, lambda n=n: text_pdf(n)) for n in (1, 5, 20, 50)]
+    cases += [CorpusCase(f"scanned-{n}p", "scanned_pdf", ".pdf", n, lambda n=n: scanned_pdf(n)) for n in (1, 3)]
+    cases += [
+        CorpusCase("mixed-9p", "mixed_pdf", ".pdf", 9, lambda: mixed_pdf(9)),
+        CorpusCase("docx-table-500", "docx", ".docx", None, lambda: docx_tables(500)),
+        CorpusCase("docx-merged-500", "docx", ".docx", None, lambda: docx_tables(500, merged=True)),
+        CorpusCase("glyph-soup-5p", "pathological_pdf", ".pdf", 5, lambda: glyph_soup_pdf(5)),
+        CorpusCase("empty-300p", "pathological_pdf", ".pdf", 300, lambda: empty_pages_pdf(300)),
+        CorpusCase("huge-page", "pathological_pdf", ".pdf", 1, lambda: huge_page_pdf(4000)),
+        CorpusCase("truncated", "pathological_pdf", ".pdf", None, truncated_pdf),
+    ]
+    return cases
+
+
+def write_corpus(out_dir: str, names: Optional[List[str]] = None, force: bool = False) -> List[Tuple[CorpusCase, str]]:
+    """Write the corpus files (skipping ones already generated) and return (case, path) pairs."""
+    os.makedirs(out_dir, exist_ok=True)
+    written = []
+    for case in corpus_cases():
+        if names and case.name not in names:
+            continue
+        path = os.path.join(out_dir, case.name + case.extension)
+        if force or not os.path.exists(path):
+            data = case.build()
+            with open(path, "wb") as fh:
+                fh.write(data)
+        written.append((case, path))
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate the extraction benchmark corpus")
+    parser.add_argument("--out", default=os.path.join(os.path.dirname(__file__), ".corpus"))
+    parser.add_argument("--force", action="store_true", help="Regenerate files that already exist")
+    args = parser.parse_args()
+    for case, path in write_corpus(args.out, force=args.force):
+        print(f"{case.name:<18}{case.kind:<18}{os.path.getsize(path):>10} bytes  {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""
+Local stand-in for Ollama and OpenAI-compatible chat servers.
+
+Speaks Ollama's /api/chat (JSON or NDJSON streaming) and OpenAI's /v1/chat/completions
+(JSON or SSE streaming), plus the model-list endpoints the health probes use. Latency,
+token rate and failures are configurable so the AI paths can be benchmarked without a
+live provider.
+
+Run standalone:
+    python -m benchmarks.fake_llm_server --port 11500 --latency lognormal --latency-ms 400
+
+then point the API at it:
+    OLLAMA_BASE_URL=http://127.0.0.1:11500
+    OPENAI_BASE_URL=http://127.0.0.1:11500/v1  (with any OPENAI_API_KEY)
+"""
+from dataclasses import asdict, dataclass, fields
+from typing import Any, AsyncIterator, Dict, List, Optional
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal", "exponential")
+
+
+@dataclass
+class FakeLLMConfig:
+    """Behaviour knobs; all can be changed at runtime through POST /_config"""
+
+    # Time to first token, in milliseconds
+    latency: str = "lognormal"
+    latency_ms: float = 300.0
+    latency_jitter_ms: float = 150.0
+    # Generation speed after the first token (0 = instant)
+    tokens_per_second: float = 80.0
+    reply_tokens: int = 120
+    # Fraction of requests answered with ``error_status``
+    error_rate: float = 0.0
+    error_status: int = 500
+    # Fraction of streams that break off after emitting part of the reply
+    stream_abort_rate: float = 0.0
+    # Fraction of requests that hang for ``hang_seconds`` before answering
+    hang_rate: float = 0.0
+    hang_seconds: float = 30.0
+    seed: Optional[int] = None
+
+    def update(self, values: Dict[str, Any]) -> None:
+        known = {f.name for f in fields(self)}
+        for key, value in values.items():
+            if key not in known:
+                raise ValueError(f"Unknown setting: {key}")
+            setattr(self, key, value)
+        if self.latency not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(f"latency must be one of {', '.join(LATENCY_DISTRIBUTIONS)}")
+
+
+class FakeLLM:
+    """Produces replies and timing according to a FakeLLMConfig"""
+
+    def __init__(self, config: Optional[FakeLLMConfig] = None) -> None:
+        self.config = config or FakeLLMConfig()
+        self.random = random.Random(self.config.seed)
+        self.stats: Dict[str, int] = {
+            "requests": 0,
+            "streamed": 0,
+            "errors_injected": 0,
+            "streams_aborted": 0,
+            "hangs_injected": 0,
+            "tokens_sent": 0,
+        }
+
+    def first_token_delay(self) -> float:
+        c = self.config
+        mean = c.latency_ms / 1000.0
+        jitter = c.latency_jitter_ms / 1000.0
+        if c.latency == "fixed":
+            delay = mean
+        elif c.latency == "uniform":
+            delay = self.random.uniform(mean - jitter, mean + jitter)
+        elif c.latency == "normal":
+            delay = self.random.gauss(mean, jitter)
+        elif c.latency == "exponential":
+            delay = self.random.expovariate(1.0 / mean) if mean > 0 else 0.0
+        else:
+            # Parameterised so the median is ``latency_ms`` and the spread grows with the jitter
+            sigma = math.log1p(jitter / mean) if mean > 0 else 0.0
+            delay = self.random.lognormvariate(math.log(mean), sigma) if mean > 0 else 0.0
+        return max(0.0, delay)
+
+    def token_delay(self) -> float:
+        rate = self.config.tokens_per_second
+        return 1.0 / rate if rate > 0 else 0.0
+
+    def roll(self, rate: float) -> bool:
+        return rate > 0 and self.random.random() < rate
+
+    async def before_reply(self) -> Optional[JSONResponse]:
+        """Apply hang/error injection and the time-to-first-token delay."""
+        self.stats["requests"] += 1
+        if self.roll(self.config.hang_rate):
+            self.stats["hangs_injected"] += 1
+            await asyncio.sleep(self.config.hang_seconds)
+        await asyncio.sleep(self.first_token_delay())
+        if self.roll(self.config.error_rate):
+            self.stats["errors_injected"] += 1
+            return JSONResponse({"error": "injected failure"}, status_code=self.config.error_status)
+        return None
+
+    def reply(self, messages: List[Dict[str, str]], json_mode: bool) -> str:
+        """A reply shaped like what the app's prompts ask for."""
+        system = " ".join(m.get("content", "") for m in messages if m.get("role") == "system")
+        if "tailored_resume" in system:
+            return json.dumps({
+                "tailored_resume": self._filler(self.config.reply_tokens),
+                "changes_made": ["Reordered experience to lead with relevant work", "Added job keywords to summary"],
+                "keyword_matches": ["python", "sql", "aws"],
+            })
+        if "ats_score" in system:
+            return json.dumps({
+                "ats_score": self.random.randint(55, 90),
+                "keyword_matches": ["python", "sql"],
+                "missing_keywords": ["kubernetes"],
+                "formatting_issues": [],
+                "recommendations": ["Add a skills section near the top"],
+            })
+        if "overall_score" in system or json_mode:
+            return json.dumps({
+                "overall_score": self.random.randint(50, 95),
+                "strengths": [{"category": "Experience", "description": "Relevant projects", "impact": "high"}],
+                "weaknesses": [{"category": "Metrics", "description": "Few quantified results", "impact": "medium"}],
+                "recommendations": ["Quantify achievements", "Tighten the summary"],
+                "summary": self._filler(max(10, self.config.reply_tokens // 4)),
+            })
+        return self._filler(self.config.reply_tokens)
+
+    def tokenize(self, text: str) -> List[str]:
+        # Roughly four characters per streamed delta, like a real tokenizer's output
+        return [text[i:i + 4] for i in range(0, len(text), 4)] or [""]
+
+    def _filler(self, n_tokens: int) -> str:
+        words = ("focus", "on", "measurable", "impact", "and", "tailor", "each", "section", "to", "the", "role")
+        return " ".join(self.random.choice(words) for _ in range(max(1, n_tokens)))
+
+
+def create_app(config: Optional[FakeLLMConfig] = None) -> FastAPI:
+    fake = FakeLLM(config)
+    app = FastAPI(title="Fake LLM server")
+    app.state.fake = fake
+
+    async def stream_tokens(text: str) -> AsyncIterator[str]:
+        tokens = fake.tokenize(text)
+        abort_at = fake.random.randint(1, len(tokens)) if fake.roll(fake.config.stream_abort_rate) else None
+        delay = fake.token_delay()
+        for index, token in enumerate(tokens):
+            if abort_at is not None and index >= abort_at:
+                fake.stats["streams_aborted"] += 1
+                raise RuntimeError("injected stream abort")
+            if index and delay:
+                await asyncio.sleep(delay)
+            fake.stats["tokens_sent"] += 1
+            yield token
+
+    async def finish_unstreamed(text: str) -> None:
+        # Non-streaming replies still take as long as generating every token would
+        tokens = len(fake.tokenize(text))
+        fake.stats["tokens_sent"] += tokens
+        if fake.token_delay():
+            await asyncio.sleep(fake.token_delay() * max(0, tokens - 1))
+
+    @app.post("/api/chat")
+    async def ollama_chat(request: Request):
+        body = await request.json()
+        model = body.get("model", "fake")
+        failure = await fake.before_reply()
+        if failure is not None:
+            return failure
+        text = fake.reply(body.get("messages", []), body.get("format") == "json")
+
+        if body.get("stream", True):
+            fake.stats["streamed"] += 1
+
+            async def ndjson() -> AsyncIterator[str]:
+                async for token in stream_tokens(text):
+                    yield json.dumps({"model": model, "message": {"role": "assistant", "content": token}, "done": False}) + "\n"
+                yield json.dumps({"model": model, "message": {"role": "assistant", "content": ""}, "done": True}) + "\n"
+
+            return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+        await finish_unstreamed(text)
+        return {"model": model, "message": {"role": "assistant", "content": text}, "done": True}
+
+    @app.get("/api/tags")
+    async def ollama_tags():
+        return {"models": [{"name": "fake"}]}
+
+    @app.post("/v1/chat/completions")
+    async def openai_chat(request: Request):
+        body = await request.json()
+        model = body.get("model", "fake")
+        failure = await fake.before_reply()
+        if failure is not None:
+            return failure
+        json_mode = (body.get("response_format") or {}).get("type") == "json_object"
+        text = fake.reply(body.get("messages", []), json_mode)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+
+        if body.get("stream"):
+            fake.stats["streamed"] += 1
+
+            def chunk(delta: Dict[str, Any], finish_reason: Optional[str] = None) -> str:
+                payload = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+                }
+                return f"data: {json.dumps(payload)}\n\n"
+
+            async def sse() -> AsyncIterator[str]:
+                yield chunk({"role": "assistant", "content": ""})
+                async for token in stream_tokens(text):
+                    yield chunk({"content": token})
+                yield chunk({}, "stop")
+                yield "data: [DONE]\n\n"
+
+            return StreamingResponse(sse(), media_type="text/event-stream")
+
+        await finish_unstreamed(text)
+        completion_tokens = len(fake.tokenize(text))
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [
+                {"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}
+            ],
+            "usage": {"prompt_tokens": 0, "completion_tokens": completion_tokens, "total_tokens": completion_tokens},
+        }
+
+    @app.get("/v1/models")
+    async def openai_models():
+        return {"object": "list", "data": [{"id": "fake", "object": "model", "owned_by": "benchmarks"}]}
+
+    @app.get("/_stats")
+    async def stats():
+        return {"config": asdict(fake.config), **fake.stats}
+
+    @app.post("/_config")
+    async def configure(request: Request):
+        try:
+            fake.config.update(await request.json())
+        except ValueError as exc:
+            return JSONResponse({"error": str(exc)}, status_code=400)
+        return asdict(fake.config)
+
+    return app
+
+
+def add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = FakeLLMConfig()
+    parser.add_argument("--latency", choices=LATENCY_DISTRIBUTIONS, default=defaults.latency,
+                        help="Time-to-first-token distribution")
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms,
+                        help="Mean (median for lognormal) time to first token")
+    parser.add_argument("--latency-jitter-ms", type=float, default=defaults.latency_jitter_ms,
+                        help="Spread of the latency distribution")
+    parser.add_argument("--tokens-per-second", type=float, default=defaults.tokens_per_second)
+    parser.add_argument("--reply-tokens", type=int, default=defaults.reply_tokens)
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate)
+    parser.add_argument("--error-status", type=int, default=defaults.error_status)
+    parser.add_argument("--stream-abort-rate", type=float, default=defaults.stream_abort_rate)
+    parser.add_argument("--hang-rate", type=float, default=defaults.hang_rate)
+    parser.add_argument("--hang-seconds", type=float, default=defaults.hang_seconds)
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def config_from_args(args: argparse.Namespace) -> FakeLLMConfig:
+    return FakeLLMConfig(**{f.name: getattr(args, f.name) for f in fields(FakeLLMConfig)})
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Fake Ollama/OpenAI server for benchmarking")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11500)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+    uvicorn.run(create_app(config_from_args(args)), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
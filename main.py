@@ -1,33 +1,11 @@
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, UploadFile, File, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from dotenv import load_dotenv
+import asyncio
 import os
-import io
-from typing import List
 from contextlib import asynccontextmanager
 
-# Optional heavy deps used for PDF extraction/OCR
-try:
-    import pdfplumber
-except Exception:
-    pdfplumber = None
-
-try:
-    from PyPDF2 import PdfReader
-except Exception:
-    PdfReader = None
-
-try:
-    from pdf2image import convert_from_bytes
-except Exception:
-    convert_from_bytes = None
-
-try:
-    import pytesseract
-except Exception:
-    pytesseract = None
-
 # Load environment variables
 load_dotenv()
 SECRET_KEY = os.getenv("AUTH_SECRET_KEY")
@@ -38,11 +16,57 @@ if os.getenv("AUTH_SECRET_KEY", os.getenv("SECRET_KEY", "change-me")) == "change
     raise RuntimeError("AUTH_SECRET_KEY is not configured. Set a strong value in environment.")
 
 # Import routers & database
-from app.routes import resume, jobs, chat
+from app.routes import resume, jobs, chat, llm
 from app.routes import auth as auth_routes
-from app.db.session import Base, engine
-from sqlalchemy import inspect, text
+from app.db.session import Base, engine, get_db
+from app.services.extraction_service import ExtractionService
+from app.utils.ai_client import ai_client
+from app.utils.extraction_pool import extraction_pool
+from app.utils.upload_spool import MAX_UPLOAD_BYTES, UploadSizeLimitMiddleware, spool_upload
+from app.utils.bulk_upload import BULK_UPLOAD_MAX_BYTES
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+from sqlalchemy import Column, DateTime, Integer, String, Text, inspect, text
 from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+# Columns the add_job_catalogue_columns migration adds to jobs
+JOB_CATALOGUE_COLUMNS = (
+    ("external_id", String(255)),
+    ("requirements_json", Text()),
+    ("benefits_json", Text()),
+    ("salary_range", String(255)),
+    ("job_type", String(50)),
+    ("experience_level", String(50)),
+    ("updated_at", DateTime()),
+)
+
+
+def _ensure_job_catalogue_schema(inspector) -> None:
+    """Bring a jobs table created before the job catalogue up to the add_job_catalogue_columns schema
+
+    Adds the missing columns and the unique external_id index, and makes user_id nullable
+    (catalogue postings have no owner). SQLite can't alter a column in place, so there
+    the table is rebuilt, the same way the migration does it.
+    """
+    columns = {c['name']: c for c in inspector.get_columns('jobs')}
+    indexes = {i['name'] for i in inspector.get_indexes('jobs')}
+    missing = [(name, type_) for name, type_ in JOB_CATALOGUE_COLUMNS if name not in columns]
+    if not missing and columns['user_id']['nullable'] and 'ix_jobs_external_id' in indexes:
+        return
+    with engine.begin() as conn:
+        operations = Operations(MigrationContext.configure(conn))
+        with operations.batch_alter_table('jobs') as batch_op:
+            for name, type_ in missing:
+                batch_op.add_column(Column(name, type_, nullable=True))
+            if not columns['user_id']['nullable']:
+                batch_op.alter_column('user_id', existing_type=Integer(), nullable=True)
+            if 'ix_jobs_external_id' not in indexes:
+                batch_op.create_index('ix_jobs_external_id', ['external_id'], unique=True)
+            for name in ('job_type', 'experience_level', 'updated_at'):
+                if f'ix_jobs_{name}' not in indexes:
+                    batch_op.create_index(f'ix_jobs_{name}', [name])
+
 
 # Lifespan context for startup/shutdown events
 @asynccontextmanager
@@ -57,6 +81,8 @@ async def lifespan(app: FastAPI):
             with engine.connect() as conn:
                 conn.execute(text("ALTER TABLE resumes ADD COLUMN analysis_json TEXT"))
                 conn.commit()
+        if dialect_name in ("sqlite", "postgresql", "mysql"):
+            _ensure_job_catalogue_schema(inspector)
         user_columns = [c['name'] for c in inspector.get_columns('users')]
         if 'password_hash' not in user_columns and dialect_name in ("sqlite", "postgresql", "mysql"):
             with engine.connect() as conn:
@@ -65,9 +91,15 @@ async def lifespan(app: FastAPI):
     except OperationalError:
         pass
 
+    # Load the job catalogue in the background; job requests that arrive first wait for
+    # it in the threadpool, not on the event loop
+    asyncio.get_running_loop().run_in_executor(None, jobs.job_service.store.warm)
+
     yield  # App runs here
 
-    # Optional shutdown code can go here
+    # Shutdown: release pooled LLM connections and extraction workers
+    await ai_client.aclose()
+    extraction_pool.shutdown()
 
 # Create FastAPI app with lifespan
 app = FastAPI(
@@ -81,6 +113,17 @@ app = FastAPI(
 cors_origins_env = os.getenv("CORS_ORIGINS", "http://localhost:3000,http://127.0.0.1:3000")
 allow_origins = [origin.strip() for origin in cors_origins_env.split(",") if origin.strip()]
 
+# Cap upload bodies while they stream in, before multipart parsing buffers them.
+# Added before CORS so CORSMiddleware wraps it and its 413s carry the CORS headers.
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    limits={
+        "/api/v1/upload-resume": MAX_UPLOAD_BYTES,
+        "/upload_resume": MAX_UPLOAD_BYTES,
+        "/api/v1/upload-resumes/bulk": BULK_UPLOAD_MAX_BYTES,
+    },
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=allow_origins,
@@ -94,6 +137,9 @@ app.include_router(auth_routes.router, tags=["auth"])
 app.include_router(resume.router, prefix="/api/v1", tags=["resume"])
 app.include_router(jobs.router, prefix="/api/v1", tags=["jobs"])
 app.include_router(chat.router, prefix="/api/v1", tags=["chat"])
+app.include_router(llm.router, prefix="/api/v1", tags=["llm"])
+
+extraction_service = ExtractionService()
 
 # Root & health check
 @app.get("/")
@@ -104,69 +150,19 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
-# Helper functions for text extraction
-def _clean_text(text: str) -> str:
-    if not text:
-        return ""
-    lines = [line.strip() for line in text.split("\n") if line.strip()]
-    import re
-    cleaned = "\n".join(lines)
-    cleaned = re.sub(r"\s+", " ", cleaned)
-    cleaned = re.sub(r"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]", "", cleaned)
-    return cleaned.strip()
-
-def _has_meaningful_text(text: str) -> bool:
-    return bool(text and len(text.strip()) >= 10)
-
 # Upload resume endpoint
 @app.post("/upload_resume")
-async def upload_resume(file: UploadFile = File(...)):
+async def upload_resume(file: UploadFile = File(...), db: Session = Depends(get_db)):
     filename = file.filename or ""
     if not filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Only PDF files are supported at this endpoint.")
 
-    content = await file.read()
-    max_bytes = 10 * 1024 * 1024
-    if len(content) > max_bytes:
-        raise HTTPException(status_code=400, detail="File size too large. Max allowed is 10MB.")
-
-    # Attempt 1: pdfplumber
-    extracted_text = ""
-    if pdfplumber is not None:
-        try:
-            with pdfplumber.open(io.BytesIO(content)) as pdf:
-                texts: List[str] = [page.extract_text() or "" for page in pdf.pages]
-                extracted_text = _clean_text("\n".join(texts))
-        except Exception:
-            extracted_text = ""
-
-    # Attempt 2: PyPDF2
-    if not _has_meaningful_text(extracted_text) and PdfReader is not None:
-        try:
-            reader = PdfReader(io.BytesIO(content))
-            texts: List[str] = [page.extract_text() or "" for page in reader.pages]
-            extracted_text = _clean_text("\n".join(texts))
-        except Exception:
-            extracted_text = ""
-
-    # Attempt 3: OCR fallback
-    if not _has_meaningful_text(extracted_text):
-        if convert_from_bytes is None or pytesseract is None:
-            raise HTTPException(
-                status_code=400,
-                detail="Could not extract meaningful text from PDF. OCR dependencies are missing. Install 'pdf2image', 'pytesseract', and Poppler.",
-            )
-        try:
-            images = convert_from_bytes(content)
-            ocr_texts: List[str] = [pytesseract.image_to_string(img) for img in images]
-            extracted_text = _clean_text("\n".join(ocr_texts))
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"OCR processing failed: {str(e)}")
-
-    if not _has_meaningful_text(extracted_text):
-        raise HTTPException(status_code=400, detail="Could not extract meaningful text from the uploaded PDF.")
-
-    return JSONResponse({"extracted_text": extracted_text})
+    # Spool to disk in chunks, rejecting as soon as the 10MB cap is passed
+    async with spool_upload(file, MAX_UPLOAD_BYTES, "File size too large. Max allowed is 10MB.") as spooled:
+        # Same tiered engine as /api/v1/upload-resume (text layer first, OCR only where needed)
+        extracted_text, cache_hit, report = await extraction_service.extract_upload(db, spooled, ".pdf")
+
+    return JSONResponse({"extracted_text": extracted_text, "cache_hit": cache_hit, "extraction_report": report})
 
 # Run server
 if __name__ == "_main_":
@@ -0,0 +1,36 @@
+import math
+import random
+
+from app.utils.chunking import chunk_text, estimate_tokens
+
+
+def _collapsed_text(words: int, sentence_words: int) -> str:
+    # Extracted text after normalization: one line, so packing falls through to sentences/words
+    rng = random.Random(7)
+    vocabulary = ["python", "developer", "built", "scalable", "services", "team", "led", "data", "and", "the"]
+    sentences = []
+    for _ in range(words // sentence_words):
+        sentences.append(" ".join(rng.choice(vocabulary) for _ in range(sentence_words)).capitalize() + ".")
+    return " ".join(sentences)
+
+
+def test_sentence_level_chunks_fill_the_budget():
+    text = _collapsed_text(20000, 3)
+    max_tokens = 2500
+    chunks = chunk_text(text, max_tokens)
+    assert all(estimate_tokens(chunk) <= max_tokens for chunk in chunks)
+    assert len(chunks) <= math.ceil(estimate_tokens(text) / max_tokens) + 1
+    assert all(estimate_tokens(chunk) > max_tokens * 0.9 for chunk in chunks[:-1])
+
+
+def test_word_level_chunks_fill_the_budget():
+    text = _collapsed_text(20000, 20000).rstrip(".")
+    max_tokens = 2500
+    chunks = chunk_text(text, max_tokens)
+    assert all(estimate_tokens(chunk) <= max_tokens for chunk in chunks)
+    assert len(chunks) <= math.ceil(estimate_tokens(text) / max_tokens) + 1
+    assert " ".join(chunks) == text
+
+
+def test_short_text_is_one_chunk():
+    assert chunk_text("Skills: Python", 100) == ["Skills: Python"]
@@ -0,0 +1,51 @@
+import io
+import tracemalloc
+import zipfile
+
+from app.utils.docx_stream import W_NS, iter_docx_fragments
+
+
+def _docx(body: str) -> io.BytesIO:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("word/document.xml", f'<w:document xmlns:w="{W_NS}"><w:body>{body}</w:body></w:document>')
+    buffer.seek(0)
+    return buffer
+
+
+def _cell(text: str) -> str:
+    return f"<w:tc><w:p><w:r><w:t>{text}</w:t></w:r></w:p></w:tc>"
+
+
+def _table(rows: int) -> str:
+    return "<w:tbl>" + "".join(
+        f"<w:tr>{_cell(f'name {i}')}{_cell(f'value {i}')}{_cell('x' * 40)}</w:tr>" for i in range(rows)
+    ) + "</w:tbl>"
+
+
+def _peak_bytes(source: io.BytesIO) -> int:
+    tracemalloc.start()
+    try:
+        for _ in iter_docx_fragments(source):
+            pass
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_table_rows_in_document_order():
+    body = "<w:p><w:r><w:t>Before</w:t></w:r></w:p>" + _table(2) + "<w:p><w:r><w:t>After</w:t></w:r></w:p>"
+    assert list(iter_docx_fragments(_docx(body))) == [
+        "Before",
+        "name 0 | value 0 | " + "x" * 40,
+        "name 1 | value 1 | " + "x" * 40,
+        "After",
+    ]
+
+
+def test_large_table_memory_is_bounded():
+    small = _peak_bytes(_docx(_table(1_000)))
+    large = _peak_bytes(_docx(_table(40_000)))
+    # Rows are dropped as they finish, so 40x the rows must not cost 40x the memory
+    assert large < small * 3
+    assert large < 2 * 1024 * 1024
@@ -0,0 +1,31 @@
+from app.services.job_corpus import JobCorpus
+
+
+JOBS = [
+    {"id": 1, "title": "Senior Python Developer", "company": "Acme", "description": "Build APIs", "location": "Remote"},
+    {"id": 2, "title": "Frontend Engineer", "company": "Globex", "description": "JavaScript and React", "location": "Berlin"},
+    {"id": 3, "title": "Java Engineer", "company": "Initech", "description": "Spring services", "location": "Remote"},
+]
+
+corpus = JobCorpus.from_jobs(JOBS)
+
+
+def _ids(query, **filters):
+    return [record.job["id"] for record in corpus.search(query, **filters)]
+
+
+def test_last_word_matches_as_prefix():
+    assert _ids("Senior Py") == [1]
+    assert set(_ids("Java")) == {2, 3}
+    assert _ids("Java")[0] == 3
+
+
+def test_substring_fallback_when_nothing_ranks():
+    assert _ids("ython Dev") == [1]
+    assert _ids("glob") == [2]
+    assert _ids("nothing like this") == []
+
+
+def test_empty_query_lists_catalogue_with_filters():
+    assert _ids("") == [1, 2, 3]
+    assert _ids("", location="remote") == [1, 3]
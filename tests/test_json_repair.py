@@ -0,0 +1,46 @@
+from app.utils.json_repair import IncrementalJSONParser, parse_json_tolerant
+
+
+def _value(text):
+    parser = IncrementalJSONParser()
+    parser.feed(text)
+    return parser.value()
+
+
+def test_truncated_number_is_dropped():
+    assert _value('{"summary": "ok", "overall_score": 8') == {"summary": "ok"}
+    assert _value('{"overall_score": 8') == {}
+    assert _value('{"scores": [1, 2, 3') == {"scores": [1, 2]}
+    assert _value('{"overall_score": 85 ') == {"overall_score": 85}
+
+
+def test_truncated_literal_is_dropped():
+    assert _value('{"a": 1, "ok": tr') == {"a": 1}
+    assert _value('{"a": 1, "ok": true') == {"a": 1, "ok": True}
+
+
+def test_value_fed_in_chunks():
+    parser = IncrementalJSONParser()
+    for chunk in ('{"overall_', 'score": 8', '5, "tips": ["a"', "]}"):
+        parser.feed(chunk)
+        value = parser.value()
+        assert value is None or value.get("overall_score") in (None, 85)
+    assert parser.complete and parser.value() == {"overall_score": 85, "tips": ["a"]}
+
+
+def test_trailing_commas_only_stripped_outside_strings():
+    assert parse_json_tolerant('{"a": ",}", "b": [",]",],}') == {"a": ",}", "b": [",]"]}
+    assert parse_json_tolerant('```json\n{"a": "x, ]", "b": "\\",}",}\n```') == {"a": "x, ]", "b": '",}'}
+
+
+def test_completed_fields_are_not_reparsed():
+    doc = '{"a": "x,}", "b": [1, 2], "c": {"d": true}, "e": 12}'
+    parser = IncrementalJSONParser()
+    for i in range(0, len(doc), 3):
+        parser.feed(doc[i:i + 3])
+        assert parser.value() == _value(doc[:i + 3])
+    assert parser._fields == {"a": "x,}", "b": [1, 2], "c": {"d": True}}
+
+
+def test_field_that_does_not_parse_alone_falls_back():
+    assert _value('{"a": 1,, "b": 2, "c": 3') is None
@@ -0,0 +1,18 @@
+from app.utils.skill_matcher import DEFAULT_SKILLS, SkillMatcher
+
+
+matcher = SkillMatcher(DEFAULT_SKILLS)
+
+
+def test_overlapping_aliases_keep_longest_match():
+    assert matcher.find("Node JS") == ["node.js"]
+    assert matcher.find("Built REST APIs in Python") == ["rest", "python"]
+
+
+def test_separate_mentions_still_match():
+    assert matcher.find("JS and Node JS, plus APIs") == ["javascript", "node.js", "api"]
+    assert matcher.matches("rest apis") == [("rest", 0, 9)]
+
+
+def test_word_boundaries():
+    assert matcher.find("javascript, maintain") == ["javascript"]
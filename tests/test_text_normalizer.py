@@ -0,0 +1,16 @@
+from app.utils.text_normalizer import join_normalized, normalize_pages, normalize_text
+
+
+def test_control_characters_dropped_and_whitespace_collapsed():
+    assert normalize_text("a\x00b\x07c") == "abc"
+    assert normalize_text("  line one \n\n line\ttwo\r\n") == "line one line two"
+    assert normalize_text("a \x00 b") == "a b"
+
+
+def test_separator_controls_become_spaces():
+    # \s+ matched these before control characters were stripped, so they were never deleted
+    assert normalize_text("a\x1cb\x1fc\x85d") == "a b c d"
+
+
+def test_pages_join_with_single_spaces():
+    assert join_normalized(normalize_pages(["Page one\n", "\x0c", " page\ttwo "])) == "Page one page two"